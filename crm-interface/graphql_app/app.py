@@ -1,40 +1,99 @@
 from flask import Flask, jsonify, request, render_template_string, abort
-from ariadne import QueryType, graphql_sync, make_executable_schema
+from flask.logging import default_handler
+from ariadne import ObjectType, QueryType, graphql, graphql_sync, make_executable_schema
 from graphql_app.resolvers import Resolvers  
 from flask_cors import CORS
 from graphql_app.schema import type_defs
 from .db_logic import get_connection, fetch_data, format_dates, get_project_service_attributes, get_project_milestone_dates, get_current_phase_attributes
+from .pool import connection, release_request_connection, pool_stats
+from .fanout import fetch_concurrently, iter_concurrently, offloaded, FanoutTimeout, SerialRootExecutionContext
+from .mentions import MentionMatcher, MENTION_INDEX
+from .phase_transitions import phase_transitions_source
+from .phase_stats import PHASE_DURATIONS, parse_percentiles, DEFAULT_HISTOGRAM_BINS, MAX_HISTOGRAM_BINS
+from .dimensions import DIMENSIONS
+from .persisted_queries import PersistedQueries, PersistedQueryNotFound, skip_validation
+from .query_cost import CostAnalyzer, QueryTooExpensive
+from .project_services import PROJECT_SERVICES
+from .occupancy import phase_occupancy, bucket_edges, DEFAULT_BUCKET, DEFAULT_START_DATE
 import pandas as pd
-from .queries import QUERIES
+from .queries import QUERIES, QUERY_TTLS
+from .rollups import PROJECT_ROLLUP, ACTIVITY_ROLLUP
+from .metrics import TREND_QUERIES, SERIES_METRICS, DAILY_AGGREGATES, parse_series_args, series_rows
+from .singleflight import SINGLE_FLIGHT
+from .pivot import PIVOT_VIEWS, build_view, view_tables
+from .result_cache import RESULT_CACHE, RESULT_CACHE_DEFAULT_TTL, tables_in
 from werkzeug.exceptions import HTTPException
+from graphql import GraphQLError
 from collections import Counter
 from src.app.data.static_data import fossil_fuel_mpg_mapping, TOU_DATA
+import asyncio
 import json
+import logging
 import calendar
 import math
 import datetime
 from datetime import date, timedelta
+import os
 
+# Per-request deadline for the /api/stats query fan-out
+STATS_TIMEOUT = float(os.getenv('STATS_TIMEOUT', 15))
+
+# Limits for /api/data/batch
+BATCH_TIMEOUT = float(os.getenv('BATCH_TIMEOUT', 30))
+BATCH_MAX_QUERIES = int(os.getenv('BATCH_MAX_QUERIES', 30))
+
+# Tracebacks in GraphQL errors and ?debug=1 extensions; off when APP_ENV=production
+GRAPHQL_DEBUG = os.getenv('GRAPHQL_DEBUG', '0' if os.getenv('APP_ENV') == 'production' else '1') == '1'
+
+# Resolve independent root fields concurrently; GRAPHQL_ASYNC=0 runs them one by one
+GRAPHQL_ASYNC = os.getenv('GRAPHQL_ASYNC', '1') == '1'
 
 
 # Set up resolvers
+ROOT_RESOLVERS = {
+    "projectOverview": Resolvers.resolve_project_overview,
+    "programList": Resolvers.resolve_program_list,
+    "projectsWithFollowUpDates": Resolvers.resolve_projects_with_follow_up_dates,
+    "servicesStarted": Resolvers.resolve_services_started,
+    "projectsNotStarted": Resolvers.resolve_projects_not_started,
+    "completedProjects": Resolvers.resolve_completed_projects,
+    "projectTimeline": Resolvers.resolve_project_timeline,
+    "projectServices": Resolvers.resolve_all_project_services,
+    "projectStatusList": Resolvers.resolve_project_status,
+}
 query = QueryType()
-query.set_field("projectOverview", Resolvers.resolve_project_overview)
-query.set_field("programList", Resolvers.resolve_program_list)
-query.set_field("projectsWithFollowUpDates", Resolvers.resolve_projects_with_follow_up_dates)
-query.set_field("servicesStarted", Resolvers.resolve_services_started)
-query.set_field("projectsNotStarted", Resolvers.resolve_projects_not_started)
-query.set_field("completedProjects", Resolvers.resolve_completed_projects)
-query.set_field("projectTimeline", Resolvers.resolve_project_timeline)
-query.set_field("projectServices", Resolvers.resolve_all_project_services)
-query.set_field("projectStatusList", Resolvers.resolve_project_status)
-
-# Create the executable schema
-schema = make_executable_schema(type_defs, query)
+async_query = QueryType()
+for field_name, resolver in ROOT_RESOLVERS.items():
+    query.set_field(field_name, resolver)
+    # The async schema runs each root field on the fanout pool so siblings overlap
+    async_query.set_field(field_name, offloaded(resolver))
+
+# Nested ProjectOverview fields batch through per-request DataLoaders
+project_overview = ObjectType("ProjectOverview")
+project_overview.set_field("services", Resolvers.resolve_overview_services)
+project_overview.set_field("timeline", Resolvers.resolve_overview_timeline)
+
+# Create the executable schemas
+schema = make_executable_schema(type_defs, query, project_overview)
+async_schema = make_executable_schema(type_defs, async_query, project_overview)
+
+# Parsed and validated documents, keyed by query hash
+PERSISTED_QUERIES = PersistedQueries(schema)
+
+# Estimated cost of each operation, checked before it runs
+COST_ANALYZER = CostAnalyzer(schema)
 
 # Set up Flask app
 app = Flask(__name__)
 
+# Modules log to logging.getLogger(__name__); the package logger gets Flask's handler,
+# so their records come out with app.logger's (which then doesn't add its own)
+logging.getLogger(__package__).addHandler(default_handler)
+logging.getLogger(__package__).setLevel(logging.INFO)
+
+# Hand each request's pooled DB connection back once the request is done
+app.teardown_appcontext(release_request_connection)
+
 # HTML for GraphQL Playground
 PLAYGROUND_HTML = """
 <!DOCTYPE html>
@@ -83,7 +142,43 @@ def graphql_playground():
 def graphql_server():
     try:
         data = request.get_json()
-        success, result = graphql_sync(schema, data, context_value=request, debug=True)
+        try:
+            data, document = PERSISTED_QUERIES.prepare(data)
+        except PersistedQueryNotFound:
+            # Apollo's persisted query link retries with the full query on this error
+            return jsonify({"errors": [{"message": "PersistedQueryNotFound", "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"}}]}), 200
+        except GraphQLError as e:
+            return jsonify({"errors": [e.formatted]}), 400
+        cost, downgrade = None, False
+        if document is not None:
+            try:
+                cost, downgrade = COST_ANALYZER.admit(document, data.get('variables'), data.get('operationName'))
+            except QueryTooExpensive as e:
+                return jsonify({"errors": [e.formatted]}), 400
+        # POST /graphql?debug=1 returns resolver notes (e.g. projectOverview's skippedJoins) in "extensions"
+        extensions = {} if GRAPHQL_DEBUG and request.args.get('debug') in ('1', 'true') else None
+        # The request object itself, not the proxy, since resolvers may run on worker threads
+        context = {'request': request._get_current_object(), 'extensions': extensions}
+        options = {'context_value': context, 'debug': GRAPHQL_DEBUG}
+        if document is not None:
+            options.update(query_document=document, query_validator=skip_validation)
+        # Operations over the soft cost limit resolve their root fields one at a time
+        # so they hold one connection; nested loaders still batch
+        if downgrade:
+            options['execution_context_class'] = SerialRootExecutionContext
+        if GRAPHQL_ASYNC:
+            success, result = asyncio.run(graphql(async_schema, data, **options))
+        else:
+            success, result = graphql_sync(schema, data, **options)
+        if extensions:
+            result.setdefault('extensions', {}).update(extensions)
+        if cost is not None:
+            result.setdefault('extensions', {})['cost'] = {
+                'estimated': round(cost, 1),
+                'softLimit': COST_ANALYZER.soft_limit,
+                'hardLimit': COST_ANALYZER.hard_limit,
+                'downgraded': downgrade,
+            }
         status_code = 200 if success else 400
         return jsonify(result), status_code
     except Exception as e:
@@ -94,17 +189,39 @@ def graphql_server():
 def favicon():
     return app.send_static_file('favicon.ico')
 
-@app.route("/api/data/<query_name>", methods=["GET"])
-def get_specific_data(query_name: str):
-    if query_name not in QUERIES:
-        abort(404, description=f"Query '{query_name}' not found")
-        
+def load_data_payload(query_name, args=()):
+    """Return (JSON payload bytes, cache hit) for a QUERIES entry and its request args.
+
+    Served from the result cache when possible; concurrent misses for the same key
+    share one build unless a write to its tables came in between.
+    """
+    if is_series_query(query_name):
+        # Sliced from the in-memory daily aggregates, which are the cache for these
+        return app.json.dumps(series_rows(query_name, args)).encode('utf-8'), False
+    # Plain QUERIES entries take no parameters
+    key = (query_name, ())
+    payload = RESULT_CACHE.get(key)
+    if payload is not None:
+        return payload, True
+    tables = tables_in(QUERIES[query_name]) | view_tables(query_name)
+    generation = RESULT_CACHE.generation(tables)
+    return SINGLE_FLIGHT.do(('data',) + key + (generation,),
+                            lambda: _build_data_payload(query_name, key, tables, generation)), False
+
+def is_data_query(query_name):
+    return query_name in QUERIES or query_name in TREND_QUERIES
+
+def is_series_query(query_name):
+    return query_name in SERIES_METRICS or query_name in TREND_QUERIES
+
+def _build_data_payload(query_name, key, tables, generation):
+    connection = get_connection()
+    if connection is None:
+        raise RuntimeError("Database connection failed")
     try:
-        connection = get_connection()
-        if connection is None:
-            abort(500, description="Database connection failed")
-            
         df = fetch_data(QUERIES[query_name], connection)
+        if query_name in PIVOT_VIEWS:
+            df = build_view(query_name, df, lambda sql, params: fetch_data(sql, connection, params=params))
         if query_name in ['summary', 'duration', 'project-service-attributes', 'project-service']:
             date_columns = []
             if query_name == 'duration':
@@ -118,14 +235,106 @@ def get_specific_data(query_name: str):
             if date_columns:
                 print(f"Formatting dates for query: {query_name}, date columns: {date_columns}")
                 df = format_dates(df, date_columns)
-        return jsonify(df.to_dict(orient='records'))
-        
+        payload = app.json.dumps(df.to_dict(orient='records')).encode('utf-8')
+        if not df.empty:
+            # fetch_data returns an empty frame on errors, so don't pin those
+            ttl = QUERY_TTLS.get(query_name, RESULT_CACHE_DEFAULT_TTL)
+            RESULT_CACHE.put(key, payload, ttl, tables, generation)
+        return payload
+    finally:
+        connection.close()
+
+@app.route("/api/data/<query_name>", methods=["GET"])
+def get_specific_data(query_name: str):
+    if not is_data_query(query_name):
+        abort(404, description=f"Query '{query_name}' not found")
+    if is_series_query(query_name):
+        try:
+            parse_series_args(request.args.items())
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+    try:
+        payload, hit = load_data_payload(query_name, request.args.items(multi=True))
+        return app.response_class(payload, mimetype='application/json', headers={'X-Cache': 'HIT' if hit else 'MISS'})
+
     except Exception as e:
         print("Error:", e)  # Log any exceptions
         abort(500, description=str(e))
-    finally:
-        if connection:
-            connection.close()
+
+def parse_batch_request():
+    """Return ({key: (query_name, params)}, stream) from a GET or POST batch request.
+
+    GET: /api/data/batch?names=projects,projects-trend[&stream=1]
+    POST: {"queries": ["projects", {"name": "summary", "params": {...}, "key": "..."}], "stream": false}
+    Raises ValueError for malformed input or unknown names.
+    """
+    if request.method == 'POST':
+        body = request.get_json(silent=True) or {}
+        entries = body.get('queries')
+        stream = bool(body.get('stream', False))
+    else:
+        entries = [name for name in request.args.get('names', '').split(',') if name]
+        stream = request.args.get('stream', '').lower() in ('1', 'true')
+    if not entries or not isinstance(entries, list):
+        raise ValueError("Provide at least one query name")
+    if len(entries) > BATCH_MAX_QUERIES:
+        raise ValueError(f"At most {BATCH_MAX_QUERIES} queries per batch")
+
+    batch = {}
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {'name': entry}
+        if not isinstance(entry, dict):
+            raise ValueError(f"Invalid batch entry: {entry!r}")
+        name = entry.get('name')
+        if not is_data_query(name):
+            raise ValueError(f"Query '{name}' not found")
+        params = entry.get('params') or {}
+        if not isinstance(params, dict):
+            raise ValueError(f"params for '{name}' must be an object")
+        if is_series_query(name):
+            parse_series_args((k, str(v)) for k, v in params.items())
+        key = entry.get('key', name)
+        if key in batch:
+            raise ValueError(f"Duplicate batch key '{key}'")
+        batch[key] = (name, [(k, str(v)) for k, v in params.items()])
+    return batch, stream
+
+@app.route("/api/data/batch", methods=["GET", "POST"])
+def get_batch_data():
+    try:
+        batch, stream = parse_batch_request()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Each entry runs on a worker with its own pooled connection
+    calls = {key: (lambda n=name, a=args: load_data_payload(n, a)[0]) for key, (name, args) in batch.items()}
+
+    def entry(key, future):
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Error in batch query {key}:", e)
+            return json.dumps({'error': str(e)}).encode('utf-8')
+
+    if stream:
+        # One NDJSON line per entry, in completion order
+        def generate():
+            try:
+                for key, future in iter_concurrently(calls, timeout=BATCH_TIMEOUT):
+                    yield b'{"key": ' + json.dumps(key).encode('utf-8') + b', "data": ' + entry(key, future) + b'}\n'
+            except FanoutTimeout as e:
+                yield json.dumps({'error': str(e)}).encode('utf-8') + b'\n'
+        return app.response_class(generate(), mimetype='application/x-ndjson')
+
+    try:
+        results = dict(iter_concurrently(calls, timeout=BATCH_TIMEOUT))
+    except FanoutTimeout as e:
+        return jsonify({'error': str(e)}), 504
+    # Payloads are already JSON; splice them into one object without re-encoding
+    body = b'{' + b', '.join(json.dumps(key).encode('utf-8') + b': ' + entry(key, results[key]) for key in batch) + b'}'
+    return app.response_class(body, mimetype='application/json')
 
 @app.route('/api/active-users', methods=['GET'])
 def get_active_users():
@@ -179,34 +388,37 @@ def get_active_users():
         """
         project_table_values_count = fetch_data(project_table_values_count_query, conn, params=(time_range,)).to_dict(orient='records')
 
-        cursor = conn.cursor()
-        cursor.execute("SELECT ProperName FROM cleantranscrm.`User`")
-        proper_names = cursor.fetchall()
-        user_mentions_count = []
-
-        for proper_name in proper_names:
-            like_pattern = f"%@{proper_name[0]}%"
+        if MENTION_INDEX.refresh_if_stale():
             user_mentions_count_query = """
-                SELECT u.UserId, COUNT(*) AS user_mention_count
+                SELECT mi.UserId, COUNT(*) AS user_mention_count
+                FROM cleantranscrm.MentionIndex mi
+                WHERE mi.CreatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
+                GROUP BY mi.UserId;
+            """
+            user_mentions_count = fetch_data(user_mentions_count_query, conn, params=(time_range,)).to_dict(orient='records')
+            user_mentions_count_dict = {item['UserId']: item['user_mention_count'] for item in user_mentions_count}
+        else:
+            # Mention index unavailable: one scan of the windowed Activity rows,
+            # matching every user handle at once
+            users_query = """
+                SELECT UserId, ProperName FROM cleantranscrm.`User`;
+            """
+            users = fetch_data(users_query, conn)
+            mentions_query = """
+                SELECT a.ActivityId, a.`Text`
                 FROM cleantranscrm.Activity a
-                LEFT JOIN cleantranscrm.ActivityType at2 ON at2.ActivityTypeId = a.ActivityTypeId
-                LEFT JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId
-                LEFT JOIN cleantranscrm.Organization o ON o.OrganizationId = p.OrganizationId
-                LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = a.PhaseId AND pp.ProgramId = a.ProgramId
-                LEFT JOIN cleantranscrm.`User` u ON u.UserId = a.UserId 
-                WHERE a.`Text` LIKE %s
-                AND a.CreatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
-                GROUP BY u.UserId;
+                WHERE a.CreatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
+                AND a.`Text` LIKE '%%@%%';
             """
-            mention_count = fetch_data(user_mentions_count_query, conn, params=(like_pattern, time_range)).to_dict(orient='records')
-            user_mentions_count.extend(mention_count)
+            mention_texts = fetch_data(mentions_query, conn, params=(time_range,))
+            matcher = MentionMatcher(zip(users['UserId'], users['ProperName'])) if not users.empty else MentionMatcher([])
+            user_mentions_count_dict = matcher.count(mention_texts['Text']) if not mention_texts.empty else {}
 
         # Convert all counts to dictionaries for easy lookup
         activity_count_dict = {item['UserId']: item['activity_count'] for item in activity_count}
         uploaded_files_count_dict = {item['UserId']: item['uploaded_files_count'] for item in uploaded_files_count}
         attributes_filled_count_dict = {item['UserId']: item['attributes_filled_count'] for item in attributes_filled_count}
         project_table_values_count_dict = {item['UserId']: item['project_table_values_count'] for item in project_table_values_count}
-        user_mentions_count_dict = {item['UserId']: item['user_mention_count'] for item in user_mentions_count}
 
         # Merge all counts into active users
         for user in active_users:
@@ -229,27 +441,36 @@ def get_active_users():
 def get_projects():
     try:
         conn = get_connection()
-        active_projects_query = """
+        transitions = phase_transitions_source()
+        # Narrow fact rows; labels come from the in-memory dimension cache
+        active_projects_query = f"""
             select
-            	DISTINCT(p.ProjectId), p.ProjectNumber , p.Name as 'ProjectName', ps.LongName as 'ProjectStatus', p2.Name as 'ProgramName', o.Name as 'OrgName', u.ProperName as 'ProjectLead', pp.Name as 'PhaseName', COALESCE(TIMESTAMPDIFF(DAY, A.CreatedAt, NOW()),0) as 'DaysInPhase'
+            	p.ProjectId, p.ProjectNumber, p.Name as 'ProjectName', p.Status, p.ProgramId, p.CurrentPhaseId, p.OrganizationId,
+                pr.UserId, COALESCE(TIMESTAMPDIFF(DAY, A.CreatedAt, NOW()),0) as 'DaysInPhase'
             from cleantranscrm.Project p 
-            left join cleantranscrm.ProjectStatus ps on ps.ProjectStatusId = p.Status 
-            left join cleantranscrm.Program p2 on p2.ProgramId = p.ProgramId 
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = p.CurrentPhaseId and pp.ProgramId = p.ProgramId 
-            left JOIN cleantranscrm.Organization o on o.OrganizationId = p.OrganizationId 
-            left join cleantranscrm.ProjectRole pr on pr.ProjectId = p.ProjectId 
-            left join cleantranscrm.`Role` r on r.RoleId = pr.RoleId 
-            left join cleantranscrm.`User` u on u.UserId = pr.UserId 
+            join cleantranscrm.ProjectRole pr on pr.ProjectId = p.ProjectId and pr.RoleId = 1
             LEFT JOIN (
-                SELECT a.*
-                FROM cleantranscrm.Activity a
-                WHERE (a.Text LIKE '%%promoted this project%%' OR a.Text LIKE '%%demoted this project%%')
-                AND a.PhaseId = (SELECT MAX(a2.PhaseId) FROM cleantranscrm.Activity a2 WHERE a2.ProjectId = a.ProjectId)
+                -- Latest transition into the highest phase each project has reached
+                SELECT pt.ProjectId, MAX(pt.TransitionAt) AS CreatedAt
+                FROM {transitions} pt
+                JOIN (
+                    SELECT ProjectId, MAX(PhaseId) AS PhaseId
+                    FROM {transitions} t
+                    GROUP BY ProjectId
+                ) mp ON mp.ProjectId = pt.ProjectId AND mp.PhaseId = pt.PhaseId
+                GROUP BY pt.ProjectId
             ) A ON A.ProjectId = p.ProjectId
-            where p.Deleted = 0 and pr.RoleId = 1 AND p.ProjectId not in (3467,3197)
-            GROUP BY p.ProjectId, p.ProjectNumber, p.Name, ps.LongName, p2.Name, o.Name, u.ProperName, pp.Name, A.PhaseId;
+            where p.Deleted = 0 AND p.ProjectId not in (3467,3197)
+            GROUP BY p.ProjectId, pr.UserId;
         """
-        active_projects = fetch_data(active_projects_query, conn).to_dict(orient='records')
+        df = fetch_data(active_projects_query, conn)
+        df = DIMENSIONS.decorate(df, 'ProjectStatus', 'Status', {'LongName': 'ProjectStatus'})
+        df = DIMENSIONS.decorate(df, 'Program', 'ProgramId', {'Name': 'ProgramName'})
+        df = DIMENSIONS.decorate(df, 'Organization', 'OrganizationId', {'Name': 'OrgName'})
+        df = DIMENSIONS.decorate(df, 'User', 'UserId', {'ProperName': 'ProjectLead'})
+        df = DIMENSIONS.decorate(df, 'ProgramPhase', ['ProgramId', 'CurrentPhaseId'], {'Name': 'PhaseName'})
+        columns = ['ProjectId', 'ProjectNumber', 'ProjectName', 'ProjectStatus', 'ProgramName', 'OrgName', 'ProjectLead', 'PhaseName', 'DaysInPhase']
+        active_projects = df.reindex(columns=columns).drop_duplicates().to_dict(orient='records')
 
         return jsonify({"projects": active_projects})
     except Exception as e:
@@ -307,6 +528,15 @@ def current_phase_attributes():
     finally:
         connection.close()
 
+def decorate_activities(df, activity_type_default=None):
+    """Add ActivityType, PhaseId, PhaseName and OrgName to narrow activity rows from the dimension cache."""
+    df = DIMENSIONS.decorate(df, 'ActivityType', 'ActivityTypeId', {'Name': 'ActivityType'})
+    if activity_type_default is not None:
+        df['ActivityType'] = df['ActivityType'].map(lambda name: activity_type_default if name is None else name)
+    df = DIMENSIONS.decorate(df, 'ProgramPhase', ['ActivityProgramId', 'ActivityPhaseId'], {'PhaseId': 'PhaseId', 'Name': 'PhaseName'})
+    df = DIMENSIONS.decorate(df, 'Organization', 'OrganizationId', {'Name': 'OrgName'})
+    return df.drop(columns=['ActivityTypeId', 'ActivityProgramId', 'ActivityPhaseId', 'OrganizationId'], errors='ignore')
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     time_range = request.args.get('time_range', default=30, type=int)
@@ -315,36 +545,14 @@ def get_stats():
         return jsonify({'error': 'Missing time_range or user_id parameter'}), 400
 
     try:
-        conn = get_connection()
-
-        # Activity count
-        activity_count_query = """
-            SELECT COUNT(*) AS activity_count
-            FROM cleantranscrm.Activity A
-            WHERE ProjectId IS NOT NULL AND UserId = %s AND CreatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY);
-        """
-        activity_count = int(fetch_data(activity_count_query, conn, params=(user_id, time_range)).iloc[0]['activity_count'])
-
         # Activity logs
         activity_logs_query = """
-            SELECT a.UserId, a.`Text`, a.CreatedAt, COALESCE(at2.Name, 'Note') as 'ActivityType', COALESCE(a.Duration, 0) as 'Duration', COALESCE(pp.PhaseId,0) AS 'PhaseId', 
-                   pp.Name as 'PhaseName', p.ProjectId,  p.ProjectNumber, p.Name as 'ProjectName', o.Name as 'OrgName'
+            SELECT a.UserId, a.`Text`, a.CreatedAt, a.ActivityTypeId, COALESCE(a.Duration, 0) as 'Duration', a.ProgramId as 'ActivityProgramId',
+                   a.PhaseId as 'ActivityPhaseId', p.ProjectId, p.ProjectNumber, p.Name as 'ProjectName', p.OrganizationId
             FROM cleantranscrm.Activity a
-            LEFT JOIN cleantranscrm.ActivityType at2 on at2.ActivityTypeId = a.ActivityTypeId 
             LEFT JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId
-            LEFT JOIN cleantranscrm.Organization o ON o.OrganizationId = p.OrganizationId
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = a.PhaseId AND pp.ProgramId = a.ProgramId
             WHERE a.ProjectId IS NOT NULL AND a.UserId = %s AND a.CreatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY);
         """
-        activity_logs = fetch_data(activity_logs_query, conn, params=(user_id, time_range)).to_dict(orient='records')
-
-        # Uploaded files count
-        uploaded_files_count_query = """
-            SELECT COUNT(*) AS uploaded_files_count
-            FROM cleantranscrm.Attachment a 
-            WHERE StoredByUserId = %s AND TimeStored >= DATE_SUB(CURDATE(), INTERVAL %s DAY) AND a.ProjectId is not null;
-        """
-        uploaded_files_count = int(fetch_data(uploaded_files_count_query, conn, params=(user_id, time_range)).iloc[0]['uploaded_files_count'])
 
         # Uploaded files details
         uploaded_files_query = """
@@ -374,16 +582,6 @@ def get_stats():
                 where pa.ControlType = 'doc') B on B.Value = a.AttachmentId 
             WHERE a.StoredByUserId = %s AND a.TimeStored >= DATE_SUB(CURDATE(), INTERVAL %s DAY) AND a.ProjectId is not null;
         """
-        uploaded_files = fetch_data(uploaded_files_query, conn, params=(user_id, time_range)).to_dict(orient='records')
-
-        # Attributes filled count
-        attributes_filled_count_query = """
-            SELECT COUNT(*) AS attributes_filled_count
-            FROM cleantranscrm.ProjectAttributeValue pav
-            LEFT JOIN cleantranscrm.`User` u on u.ProperName = pav.UpdatedBy 
-            WHERE u.UserId = %s AND pav.UpdatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY);
-        """
-        attributes_filled_count = int(fetch_data(attributes_filled_count_query, conn, params=(user_id, time_range)).iloc[0]['attributes_filled_count'])
 
         # Attributes filled details
         attributes_filled_query = """
@@ -401,15 +599,6 @@ def get_stats():
             LEFT JOIN cleantranscrm.SelectOption so on so.SelectControlId = sc.SelectControlId and so.OptionValue = pav.Value 
             WHERE u.UserId = %s AND pav.UpdatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY);
         """
-        attributes_filled = fetch_data(attributes_filled_query, conn, params=(user_id, time_range)).to_dict(orient='records')
-
-        # Project table values count
-        project_table_values_count_query = """
-            SELECT COUNT(*) AS project_table_values_count
-            FROM cleantranscrm.ProjectTableValue ptv
-            WHERE (ptv.UpdatedBy = %s OR ptv.UpdatedBy = (SELECT ProperName FROM cleantranscrm.`User` u WHERE u.UserId = %s)) AND UpdatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY);
-        """
-        project_table_values_count = int(fetch_data(project_table_values_count_query, conn, params=(user_id, user_id, time_range)).iloc[0]['project_table_values_count'])
 
         # Project table values
         project_table_values_query = """
@@ -424,6 +613,7 @@ def get_stats():
                 ,  p.ProjectNumber
                 , p.Name as 'ProjectName'
                 , o.Name as 'OrgName' 
+                , ptv.Id as 'ProjectTableValueId'
             FROM cleantranscrm.ProjectTableValue ptv
             LEFT JOIN cleantranscrm.`Table` t on t.TableId = ptv.TableId 
             LEFT JOIN cleantranscrm.TableColumn tc on tc.TableColumnId = ptv.TableColumnId 
@@ -434,7 +624,6 @@ def get_stats():
             WHERE (ptv.UpdatedBy = %s OR ptv.UpdatedBy = (SELECT ProperName FROM cleantranscrm.`User` u WHERE u.UserId = %s))
             AND ptv.UpdatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY);
         """
-        project_table_values = fetch_data(project_table_values_query, conn, params=(user_id, user_id, time_range)).to_dict(orient='records')
 
         # User saved filters
         user_saved_filters_query = """
@@ -442,7 +631,6 @@ def get_stats():
             FROM cleantranscrm.SavedFilter sf 
             WHERE UserId = %s;
         """
-        user_saved_filters = fetch_data(user_saved_filters_query, conn, params=(user_id)).to_dict(orient='records')
 
         # User favorited projects
         user_favorited_projects_query = """
@@ -451,66 +639,88 @@ def get_stats():
             left join cleantranscrm.Organization o on o.OrganizationId = p.OrganizationId 
             WHERE fp.UserId = %s
         """
-        user_favorited_projects = fetch_data(user_favorited_projects_query, conn, params=(user_id)).to_dict(orient='records')
-
-        cursor = conn.cursor()
-        cursor.execute("SELECT ProperName FROM cleantranscrm.`User` WHERE UserId = %s", (user_id,))
-        proper_name = cursor.fetchone()[0]
-        like_pattern = f"%@{proper_name}%"
 
-         # Activity count
-        user_mentions_count_query = """
-            SELECT COUNT(*) AS user_mention_count
-            FROM cleantranscrm.Activity a
-            LEFT JOIN cleantranscrm.ActivityType at2 ON at2.ActivityTypeId = a.ActivityTypeId
-            LEFT JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId
-            LEFT JOIN cleantranscrm.Organization o ON o.OrganizationId = p.OrganizationId
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = a.PhaseId AND pp.ProgramId = a.ProgramId
-            LEFT JOIN cleantranscrm.`User` u on u.UserId = a.UserId 
-            WHERE a.`Text` LIKE %s
-            AND a.CreatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY);
-        """
-        user_mention_count = int(fetch_data(user_mentions_count_query, conn, params=(like_pattern, time_range)).iloc[0]['user_mention_count'])
-
-        # User mentions query
-        user_mentions_query = """
-            SELECT a.UserId, u.ProperName, a.`Text`, a.CreatedAt, at2.Name as 'ActivityType', a.Duration, pp.Name as 'PhaseName', 
-                   p.ProjectNumber, p.Name as 'ProjectName', o.Name as 'OrgName'
-            FROM cleantranscrm.Activity a
-            LEFT JOIN cleantranscrm.ActivityType at2 ON at2.ActivityTypeId = a.ActivityTypeId
-            LEFT JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId
-            LEFT JOIN cleantranscrm.Organization o ON o.OrganizationId = p.OrganizationId
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = a.PhaseId AND pp.ProgramId = a.ProgramId
-            LEFT JOIN cleantranscrm.`User` u ON u.UserId = a.UserId
-            WHERE a.`Text` LIKE %s
-            AND a.CreatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY);
-        """
-        user_mentions = fetch_data(user_mentions_query, conn, params=(like_pattern, time_range)).to_dict(orient='records')
+        # User mentions, read from the mention index when it is available
+        if MENTION_INDEX.refresh_if_stale():
+            user_mentions_query = """
+                SELECT a.UserId, a.`Text`, a.CreatedAt, a.ActivityTypeId, a.Duration, a.ProgramId as 'ActivityProgramId',
+                       a.PhaseId as 'ActivityPhaseId', p.ProjectNumber, p.Name as 'ProjectName', p.OrganizationId
+                FROM cleantranscrm.MentionIndex mi
+                JOIN cleantranscrm.Activity a ON a.ActivityId = mi.ActivityId
+                LEFT JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId
+                WHERE mi.UserId = %s
+                AND mi.CreatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY);
+            """
+            user_mentions_params = (user_id, time_range)
+        else:
+            with connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT ProperName FROM cleantranscrm.`User` WHERE UserId = %s", (user_id,))
+                proper_name = cursor.fetchone()[0]
+                cursor.close()
+            user_mentions_query = """
+                SELECT a.UserId, a.`Text`, a.CreatedAt, a.ActivityTypeId, a.Duration, a.ProgramId as 'ActivityProgramId',
+                       a.PhaseId as 'ActivityPhaseId', p.ProjectNumber, p.Name as 'ProjectName', p.OrganizationId
+                FROM cleantranscrm.Activity a
+                LEFT JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId
+                WHERE a.`Text` LIKE %s
+                AND a.CreatedAt >= DATE_SUB(CURDATE(), INTERVAL %s DAY);
+            """
+            user_mentions_params = (f"%@{proper_name}%", time_range)
+
+        # The queries are independent, so run them side by side on pooled
+        # connections; the dashboard then waits for the slowest one, not the sum.
+        results = fetch_concurrently({
+            "activity_logs": (activity_logs_query, (user_id, time_range)),
+            "uploaded_files": (uploaded_files_query, (user_id, time_range)),
+            "attributes_filled": (attributes_filled_query, (user_id, time_range)),
+            "project_table_values": (project_table_values_query, (user_id, user_id, time_range)),
+            "user_saved_filters": (user_saved_filters_query, (user_id,)),
+            "user_favorited_projects": (user_favorited_projects_query, (user_id,)),
+            "user_mentions": (user_mentions_query, user_mentions_params),
+        }, timeout=STATS_TIMEOUT)
+
+        # Labels for the activity rows come from the dimension cache instead of SQL joins
+        activity_logs = decorate_activities(results["activity_logs"], activity_type_default='Note')
+        activity_logs['PhaseId'] = activity_logs['PhaseId'].map(lambda phase_id: 0 if phase_id is None else int(phase_id))
+        user_mentions = DIMENSIONS.decorate(decorate_activities(results["user_mentions"]).drop(columns=['PhaseId'], errors='ignore'),
+                                            'User', 'UserId', {'ProperName': 'ProperName'})
+
+        # Counts come from the detail rows rather than separate COUNT(*) scans.
+        # Uploaded files, attributes and table values are counted by id because
+        # their lookup joins can repeat a row.
+        uploaded_files = results["uploaded_files"]
+        attributes_filled = results["attributes_filled"]
+        project_table_values = results["project_table_values"]
+        uploaded_files_count = int(uploaded_files['AttachmentId'].nunique()) if not uploaded_files.empty else 0
+        attributes_filled_count = int(attributes_filled['id'].nunique()) if not attributes_filled.empty else 0
+        project_table_values_count = int(project_table_values['ProjectTableValueId'].nunique()) if not project_table_values.empty else 0
+        # The id is only selected for counting
+        project_table_values = project_table_values.drop(columns=['ProjectTableValueId'], errors='ignore')
 
         stats = {
-            "activity_count": activity_count,
-            "activity_logs": activity_logs,
+            "activity_count": len(activity_logs),
+            "activity_logs": activity_logs.to_dict(orient='records'),
             "uploaded_files_count": uploaded_files_count,
-            "uploaded_files": uploaded_files,
+            "uploaded_files": uploaded_files.to_dict(orient='records'),
             "attributes_filled_count": attributes_filled_count,
-            "attributes_filled": attributes_filled,
+            "attributes_filled": attributes_filled.to_dict(orient='records'),
             "project_table_values_count": project_table_values_count,
-            "project_table_values": project_table_values,
-            "user_saved_filters": user_saved_filters,
-            "user_favorited_projects": user_favorited_projects,
-            "user_mention_count": user_mention_count,
-            "user_mentions": user_mentions
+            "project_table_values": project_table_values.to_dict(orient='records'),
+            "user_saved_filters": results["user_saved_filters"].to_dict(orient='records'),
+            "user_favorited_projects": results["user_favorited_projects"].to_dict(orient='records'),
+            "user_mention_count": len(user_mentions),
+            "user_mentions": user_mentions.to_dict(orient='records')
         }
 
         return jsonify({"stats": stats})
 
+    except FanoutTimeout as e:
+        return jsonify({'error': str(e)}), 504
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-    finally:
-        if conn:
-            conn.close()
-
 @app.route('/api/project-overview', methods=['GET'])
 def get_overview():
     project_id = request.args.get('project_id')
@@ -533,7 +743,9 @@ def get_overview():
         """
         project_info = fetch_data(project_info_query, conn, params=(project_id)).to_dict(orient='records')
 
-        project_overview_query = """
+        transitions = phase_transitions_source()
+
+        project_overview_query = f"""
             SELECT 
                 pn.PhaseId,
                 pn.PhaseName,
@@ -542,11 +754,11 @@ def get_overview():
                 pa.PromotedByUser AS PromotedByUser,
                 CASE 
                     WHEN pa.PhaseId = pi.CurrentPhaseId THEN NULL
-                    ELSE LEAD(pa.PromotionDate) OVER (PARTITION BY pa.ProjectId ORDER BY pa.PromotionDate)
+                    ELSE pa.NextPromotionDate
                 END AS NextPromotionDate,
                 CASE 
                     WHEN pa.PhaseId = pi.CurrentPhaseId THEN DATEDIFF(CURDATE(), pa.PromotionDate)
-                    ELSE DATEDIFF(COALESCE(LEAD(pa.PromotionDate) OVER (PARTITION BY pa.ProjectId ORDER BY pa.PromotionDate), CURDATE()), pa.PromotionDate)
+                    ELSE DATEDIFF(COALESCE(pa.NextPromotionDate, CURDATE()), pa.PromotionDate)
                 END AS DaysInPhase,
                 pa.ActionType,
                     CASE 
@@ -574,17 +786,15 @@ def get_overview():
                     p.CreatedAt
                 FROM cleantranscrm.Project p) pi
                 JOIN (SELECT 
-                    a.ProjectId,
-                    a.PhaseId,
-                    a.CreatedAt AS PromotionDate,
-                    SUBSTRING_INDEX(SUBSTRING_INDEX(a.Text, ' this project', 1), '>', -1) AS PromotedByUser,
-                    CASE 
-                        WHEN a.Text LIKE '%%promoted this project%%' THEN 'Promotion'
-                        WHEN a.Text LIKE '%%demoted this project%%' THEN 'Demotion'
-                    END AS ActionType,
-                    ROW_NUMBER() OVER (PARTITION BY a.ProjectId ORDER BY a.CreatedAt) AS PhaseOrder
-                FROM cleantranscrm.Activity a
-                WHERE a.Text LIKE '%%promoted this project%%' OR a.Text LIKE '%%demoted this project%%') pa ON pi.ProjectId = pa.ProjectId
+                    pt.ProjectId,
+                    pt.PhaseId,
+                    pt.TransitionAt AS PromotionDate,
+                    pt.NextTransitionAt AS NextPromotionDate,
+                    pt.ByUser AS PromotedByUser,
+                    pt.Direction AS ActionType,
+                    ROW_NUMBER() OVER (PARTITION BY pt.ProjectId ORDER BY pt.TransitionAt, pt.ActivityId) AS PhaseOrder
+                FROM {transitions} pt
+                WHERE pt.ProjectId = %s) pa ON pi.ProjectId = pa.ProjectId
                 JOIN (SELECT 
                     pp.ProgramId,
                     pp.PhaseId,
@@ -598,7 +808,7 @@ def get_overview():
             ORDER BY 
                 pi.ProjectId, pa.PromotionDate;
         """
-        project_overview = fetch_data(project_overview_query, conn, params=(project_id,)).to_dict(orient='records')
+        project_overview = fetch_data(project_overview_query, conn, params=(project_id, project_id)).to_dict(orient='records')
         # Handle NaT values in the result
         for record in project_overview:
             if pd.isnull(record['NextPromotionDate']):
@@ -623,189 +833,96 @@ def get_overview():
 def get_project_phase():
     program_id = request.args.get('program_id')
     project_status = request.args.get('project_status')
-    conn = None
-    cursor = None
+    bucket = request.args.get('bucket', DEFAULT_BUCKET)
+    try:
+        start_date = date.fromisoformat(request.args.get('start_date', DEFAULT_START_DATE.isoformat()))
+        end_date = date.fromisoformat(request.args.get('end_date', date.today().isoformat()))
+        bucket_edges(start_date, end_date, bucket)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
+    # One fetch of the transitions that can overlap the range; bucketing happens in Python
     query = """
-    WITH PhaseTransitions AS (
         SELECT 
-            pa.ProjectId,
-            pn.PhaseId,
-            pn.PhaseName,
-            pn.SortOrder,
-            pa.PromotionDate,
+            pt.ProjectId,
+            p.ProgramId,
+            pp.Name AS PhaseName,
+            pp.SortOrder,
+            pt.TransitionAt AS PromotionDate,
             CASE 
-                WHEN pa.PhaseId = pi.CurrentPhaseId THEN NULL
-                ELSE LEAD(pa.PromotionDate) OVER (PARTITION BY pa.ProjectId ORDER BY pa.PromotionDate)
+                WHEN pt.PhaseId = p.CurrentPhaseId THEN NULL
+                ELSE pt.NextTransitionAt
             END AS NextPromotionDate,
-            pi.ProgramId,
-            pi.Status,
-            u.ProperName as 'ProjectLead'
-        FROM 
-            (SELECT 
-                p.ProjectId,
-                p.CurrentPhaseId,
-                p.ProgramId,
-                p.Status,
-                p.Deleted
-            FROM cleantranscrm.Project p) pi
-            JOIN (SELECT 
-                a.ProjectId,
-                a.PhaseId,
-                a.CreatedAt AS PromotionDate
-            FROM cleantranscrm.Activity a
-            WHERE a.Text LIKE '%%promoted this project%%' OR a.Text LIKE '%%demoted this project%%') pa ON pi.ProjectId = pa.ProjectId
-            JOIN (SELECT 
-                pp.PhaseId,
-                pp.Name AS PhaseName,
-                pp.ProgramId,
-                pp.SortOrder
-            FROM cleantranscrm.ProgramPhase pp) pn ON pa.PhaseId = pn.PhaseId and pi.ProgramId = pn.Programid
-        LEFT JOIN cleantranscrm.ProjectRole pr on pr.ProjectId = pa.ProjectId
-        LEFT JOIN cleantranscrm.`User` u on u.UserId = pr.UserId 
-        WHERE pi.Deleted = 0
-    ),
-    TimeIncrements AS (
-        SELECT 
-            DATE_ADD('2020-01-01', INTERVAL (n * 14) DAY) AS StartDate,
-            DATE_ADD('2020-01-01', INTERVAL ((n + 1) * 14) DAY) AS EndDate
-        FROM (
-            SELECT 0 AS n UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9 UNION ALL SELECT 10 UNION ALL SELECT 11 UNION ALL SELECT 12 UNION ALL SELECT 13 UNION ALL SELECT 14 UNION ALL SELECT 15 UNION ALL SELECT 16 UNION ALL SELECT 17 UNION ALL SELECT 18 UNION ALL SELECT 19 UNION ALL SELECT 20 UNION ALL SELECT 21 UNION ALL SELECT 22 UNION ALL SELECT 23 UNION ALL SELECT 24 UNION ALL SELECT 25 UNION ALL SELECT 26 UNION ALL SELECT 27 UNION ALL SELECT 28 UNION ALL SELECT 29 UNION ALL SELECT 30 UNION ALL SELECT 31 UNION ALL SELECT 32 UNION ALL SELECT 33 UNION ALL SELECT 34 UNION ALL SELECT 35 UNION ALL SELECT 36 UNION ALL SELECT 37 UNION ALL SELECT 38 UNION ALL SELECT 39 UNION ALL SELECT 40 UNION ALL SELECT 41 UNION ALL SELECT 42 UNION ALL SELECT 43 UNION ALL SELECT 44 UNION ALL SELECT 45 UNION ALL SELECT 46 UNION ALL SELECT 47 UNION ALL SELECT 48 UNION ALL SELECT 49 UNION ALL SELECT 50 UNION ALL SELECT 51 UNION ALL SELECT 52 UNION ALL SELECT 53 UNION ALL SELECT 54 UNION ALL SELECT 55 UNION ALL SELECT 56 UNION ALL SELECT 57 UNION ALL SELECT 58 UNION ALL SELECT 59 UNION ALL SELECT 60 UNION ALL SELECT 61 UNION ALL SELECT 62 UNION ALL SELECT 63 UNION ALL SELECT 64 UNION ALL SELECT 65 UNION ALL SELECT 66 UNION ALL SELECT 67 UNION ALL SELECT 68 UNION ALL SELECT 69 UNION ALL SELECT 70 UNION ALL SELECT 71 UNION ALL SELECT 72 UNION ALL SELECT 73 UNION ALL SELECT 74 UNION ALL SELECT 75 UNION ALL SELECT 76 UNION ALL SELECT 77 UNION ALL SELECT 78 UNION ALL SELECT 79 UNION ALL SELECT 80 UNION ALL SELECT 81 UNION ALL SELECT 82 UNION ALL SELECT 83 UNION ALL SELECT 84 UNION ALL SELECT 85 UNION ALL SELECT 86 UNION ALL SELECT 87 UNION ALL SELECT 88 UNION ALL SELECT 89 UNION ALL SELECT 90 UNION ALL SELECT 91 UNION ALL SELECT 92 UNION ALL SELECT 93 UNION ALL SELECT 94 UNION ALL SELECT 95 UNION ALL SELECT 96 UNION ALL SELECT 97 UNION ALL SELECT 98 UNION ALL SELECT 99 UNION ALL SELECT 100 UNION ALL SELECT 101 UNION ALL SELECT 102 UNION ALL SELECT 103 UNION ALL SELECT 104 UNION ALL SELECT 105 UNION ALL SELECT 106 UNION ALL SELECT 107 UNION ALL SELECT 108 UNION ALL SELECT 109 UNION ALL SELECT 110 UNION ALL SELECT 111 UNION ALL SELECT 112 UNION ALL SELECT 113 UNION ALL SELECT 114 UNION ALL SELECT 115 UNION ALL SELECT 116 UNION ALL SELECT 117 UNION ALL SELECT 118 UNION ALL SELECT 119 UNION ALL SELECT 120 UNION ALL SELECT 121 UNION ALL SELECT 122 UNION ALL SELECT 123 UNION ALL SELECT 124 UNION ALL SELECT 125 UNION ALL SELECT 126 UNION ALL SELECT 127 UNION ALL SELECT 128 UNION ALL SELECT 129 UNION ALL SELECT 130 UNION ALL SELECT 131 UNION ALL SELECT 132 UNION ALL SELECT 133 UNION ALL SELECT 134 
-        ) numbers
-    )
-    SELECT 
-        ti.StartDate,
-        ti.EndDate,
-        pt.ProgramId,
-        pt.PhaseName,
-        COUNT(DISTINCT pt.ProjectId) AS ProjectCount,
-        pt.ProjectLead
-    FROM 
-        TimeIncrements ti
-        LEFT JOIN PhaseTransitions pt ON pt.PromotionDate < ti.EndDate AND (pt.NextPromotionDate IS NULL OR pt.NextPromotionDate >= ti.StartDate)
-    WHERE 
-        (%s IS NULL OR pt.ProgramId = %s) AND
-        (%s IS NULL OR pt.Status = %s)
-    GROUP BY 
-        ti.StartDate, ti.EndDate, pt.ProgramId, pt.PhaseName
-    ORDER BY 
-        ti.StartDate, pt.ProgramId, pt.SortOrder;
+            lead.ProjectLead
+        FROM {transitions} pt
+        JOIN cleantranscrm.Project p ON p.ProjectId = pt.ProjectId
+        JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = pt.PhaseId AND pp.ProgramId = p.ProgramId
+        LEFT JOIN (
+            SELECT pr.ProjectId, MIN(u.ProperName) AS ProjectLead
+            FROM cleantranscrm.ProjectRole pr
+            JOIN cleantranscrm.`User` u ON u.UserId = pr.UserId
+            WHERE pr.RoleId = 1
+            GROUP BY pr.ProjectId
+        ) lead ON lead.ProjectId = pt.ProjectId
+        WHERE p.Deleted = 0
+        AND pt.TransitionAt < %s
+        AND (pt.NextTransitionAt IS NULL OR pt.PhaseId = p.CurrentPhaseId OR pt.NextTransitionAt >= %s)
+        AND (%s IS NULL OR p.ProgramId = %s)
+        AND (%s IS NULL OR p.Status = %s)
     """
     try:
+        edges = bucket_edges(start_date, end_date, bucket)
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, (program_id, program_id, project_status, project_status))
-        
-        # Fetch column names
-        columns = [desc[0] for desc in cursor.description]
-        
-        # Fetch all rows and convert to list of dictionaries
-        rows = cursor.fetchall()
-        results = []
-        for row in rows:
-            result_dict = {}
-            for i, value in enumerate(row):
-                # Convert datetime objects to string format
-                if isinstance(value, (datetime.date, datetime.datetime)):
-                    value = value.isoformat()
-                result_dict[columns[i]] = value
-            results.append(result_dict)
-        
-        return jsonify(results)
-        
+        transitions = fetch_data(query.format(transitions=phase_transitions_source()), conn, params=(
+            str(edges[-1]), start_date.isoformat(),
+            program_id, program_id, project_status, project_status
+        ))
+        return jsonify(phase_occupancy(transitions, start_date, end_date, bucket))
+
     except Exception as e:
         print("Error:", e)  # Log the error
         return jsonify({'error': str(e)}), 500
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass  # Ignore errors when closing an already-closed connection
 
 @app.route('/api/phase-transitions', methods=['GET'])
 def get_phase_transitions():
     program_id = request.args.get('program_id')
     project_status = request.args.get('project_status')
-    
+    try:
+        percentiles = parse_percentiles(request.args.get('percentile'))
+        bins = int(request.args.get('bins', DEFAULT_HISTOGRAM_BINS))
+        if not 1 <= bins <= MAX_HISTOGRAM_BINS:
+            raise ValueError(f"bins must be between 1 and {MAX_HISTOGRAM_BINS}")
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # One row per transition; the statistics are computed in phase_stats
     query = """
-    WITH PhaseTransitions AS (
         SELECT 
-            p.ProjectId,
-            p.ProjectNumber,
-            a.PhaseId,
+            pt.ProjectId,
+            pt.PhaseId,
             pp.Name as PhaseName,
             pp.SortOrder,
-            a.CreatedAt as TransitionDate,
-            LEAD(a.CreatedAt) OVER (PARTITION BY p.ProjectId ORDER BY a.CreatedAt) as NextTransitionDate,
-            p.ProgramId,
-            p.Status
+            TIMESTAMPDIFF(DAY, pt.TransitionAt, COALESCE(pt.NextTransitionAt, NOW())) as DaysInPhase
         FROM cleantranscrm.Project p
-        JOIN cleantranscrm.Activity a ON a.ProjectId = p.ProjectId
-        JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = a.PhaseId AND pp.ProgramId = p.ProgramId
-        WHERE (a.Text LIKE '%%promoted this project%%' OR a.Text LIKE '%%demoted this project%%')
-        AND p.Deleted = 0
+        JOIN {transitions} pt ON pt.ProjectId = p.ProjectId
+        JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = pt.PhaseId AND pp.ProgramId = p.ProgramId
+        WHERE p.Deleted = 0
         AND (%s IS NULL OR p.ProgramId = %s)
         AND (%s IS NULL OR p.Status = %s)
-    ),
-    PhaseDurations AS (
-        SELECT 
-            PhaseId,
-            TIMESTAMPDIFF(DAY, TransitionDate, COALESCE(NextTransitionDate, NOW())) as DaysInPhase
-        FROM PhaseTransitions
-    ),
-    MedianCalculation AS (
-        SELECT 
-            PhaseId,
-            DaysInPhase,
-            ROW_NUMBER() OVER (PARTITION BY PhaseId ORDER BY DaysInPhase) as RowAsc,
-            ROW_NUMBER() OVER (PARTITION BY PhaseId ORDER BY DaysInPhase DESC) as RowDesc
-        FROM PhaseDurations
-    )
-    SELECT 
-        pt.PhaseId,
-        pt.PhaseName,
-        pt.SortOrder,
-        COUNT(DISTINCT pt.ProjectId) as ProjectCount,
-        AVG(pd.DaysInPhase) as AvgDaysInPhase,
-        MIN(pd.DaysInPhase) as MinDaysInPhase,
-        MAX(pd.DaysInPhase) as MaxDaysInPhase,
-        AVG(mc.DaysInPhase) as MedDaysInPhase
-    FROM PhaseTransitions pt
-    JOIN PhaseDurations pd ON pt.PhaseId = pd.PhaseId
-    JOIN MedianCalculation mc ON mc.PhaseId = pt.PhaseId
-    WHERE mc.RowAsc = mc.RowDesc OR mc.RowAsc + 1 = mc.RowDesc
-    GROUP BY pt.PhaseId, pt.PhaseName, pt.SortOrder
-    ORDER BY pt.SortOrder;
     """
-    
-    try:
+
+    def load_durations():
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, (program_id, program_id, project_status, project_status))
-        
-        columns = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-        results = []
-        for row in rows:
-            result_dict = {}
-            for i, value in enumerate(row):
-                result_dict[columns[i]] = value
-            results.append(result_dict)
-        
-        return jsonify(results)
-        
+        return fetch_data(query.format(transitions=phase_transitions_source()), conn,
+                          params=(program_id, program_id, project_status, project_status))
+
+    try:
+        durations = PHASE_DURATIONS.get((program_id, project_status), load_durations)
+        return jsonify(durations.summary(percentiles=percentiles, bins=bins))
+
     except Exception as e:
+        print("Error:", e)  # Log the error
         return jsonify({'error': str(e)}), 500
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 
 # 1. Get projects filtered by org name and status
@@ -843,6 +960,8 @@ def update_project_status(project_id):
     conn.commit()
     cur.close()
     conn.close()
+    RESULT_CACHE.invalidate({'Project'})
+    PHASE_DURATIONS.clear()
     return jsonify({"success": True})
 
 # 3. Create new project
@@ -863,6 +982,9 @@ def create_project():
     conn.commit()
     cur.close()
     conn.close()
+    PROJECT_ROLLUP.refresh()
+    DAILY_AGGREGATES.invalidate(PROJECT_ROLLUP.metrics)
+    RESULT_CACHE.invalidate({'Project'})
     return jsonify({"project_id": project_id})
 
 # 4. Add comment to project (Activity)
@@ -879,6 +1001,13 @@ def add_comment(project_id):
     conn.commit()
     cur.close()
     conn.close()
+    ACTIVITY_ROLLUP.refresh()
+    DAILY_AGGREGATES.invalidate(ACTIVITY_ROLLUP.metrics)
+    RESULT_CACHE.invalidate({'Activity'})
+    PROJECT_SERVICES.clear()
+    # Index any @mentions in the new comment so readers see them immediately
+    if '@' in (text or ''):
+        MENTION_INDEX.refresh()
     return jsonify({"success": True})
 
 # 5. Get activity for a project
@@ -959,6 +1088,34 @@ def get_user_activity(user_id):
 def health_check():
     return {"status": "healthy"}
 
+@app.route("/health/db-pool", methods=["GET"])
+def db_pool_health():
+    return jsonify(pool_stats())
+
+@app.route("/health/result-cache", methods=["GET"])
+def result_cache_health():
+    return jsonify(RESULT_CACHE.stats())
+
+@app.route("/health/single-flight", methods=["GET"])
+def single_flight_health():
+    return jsonify(SINGLE_FLIGHT.stats())
+
+@app.route("/health/dimensions", methods=["GET"])
+def dimensions_health():
+    return jsonify(DIMENSIONS.stats())
+
+@app.route("/health/persisted-queries", methods=["GET"])
+def persisted_queries_health():
+    return jsonify(PERSISTED_QUERIES.stats())
+
+@app.route("/health/table-stats", methods=["GET"])
+def table_stats_health():
+    return jsonify(COST_ANALYZER.stats.stats())
+
+@app.route("/health/project-services", methods=["GET"])
+def project_services_health():
+    return jsonify(PROJECT_SERVICES.stats())
+
 def determine_season(year: int, month: int, tou_seasons: dict) -> str:
     # Parse season date ranges
     summer_start = date(year, 6, 1)
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import re
+from datetime import datetime, timedelta
+
+from .derived import DerivedStore, after_watermark, watermark_params, REFRESH_BATCH_SIZE
+
+# Seconds of UpdatedAt before the watermark re-read on every refresh, for rows whose
+# transaction commits after rows with a later UpdatedAt were already copied
+ATTRIBUTE_DATE_OVERLAP = float(os.getenv('ATTRIBUTE_DATE_OVERLAP', 300))
+
+ATTRIBUTE_DATE_DDL = """
+    CREATE TABLE IF NOT EXISTS cleantranscrm.AttributeDate (
+        Id INT NOT NULL PRIMARY KEY,
+        ProjectId INT NOT NULL,
+        ProgramAttributeId INT NOT NULL,
+        Value VARCHAR(255) NOT NULL,
+        DateValue DATETIME(3) NULL,
+        IsoTimestamp TINYINT(1) NOT NULL,
+        KEY IX_AttributeDate_Attribute_Date (ProgramAttributeId, DateValue),
+        KEY IX_AttributeDate_Project (ProjectId, ProgramAttributeId)
+    )
+"""
+
+# The layout the CRM writes for date attributes, e.g. 2024-05-01T07:00:00.000Z
+# (same as the REGEXP the resolvers used to apply to pav.Value)
+ISO_TIMESTAMP = re.compile(r'^[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}.[0-9]{3}Z$')
+
+
+def parse_date_value(value):
+    """Return (DateValue, IsoTimestamp) for a stored attribute value.
+
+    DateValue is the timestamp as written (no time zone conversion) so that it
+    orders and compares against CURDATE() the way the ISO string did; it is None
+    when the value isn't a date.
+    """
+    iso_timestamp = bool(ISO_TIMESTAMP.match(str(value)))
+    text = str(value).strip()
+    try:
+        parsed = datetime.fromisoformat(text[:-1] if text.endswith('Z') else text)
+    except ValueError:
+        return None, iso_timestamp
+    return parsed.replace(tzinfo=None), iso_timestamp
+
+
+class AttributeDateStore(DerivedStore):
+    """Typed copy of ProjectAttributeValue rows whose attribute is a date control.
+
+    Keeps the raw Value for output alongside DateValue, so views can filter and sort
+    on an index of (ProgramAttributeId, DateValue) instead of comparing strings.
+    Rows are read from an (UpdatedAt, Id) watermark, re-reading the last
+    ATTRIBUTE_DATE_OVERLAP seconds each time; a transaction that commits later than
+    that after a row with a later UpdatedAt is missed until the next rebuild. Rows
+    with no UpdatedAt are copied once, so edits that leave UpdatedAt NULL aren't
+    seen. Values cleared to NULL are removed; deleted ProjectAttributeValue rows are
+    not tracked. Changing which attributes are date controls rebuilds the table.
+    """
+
+    name = 'AttributeDate'
+    ddl = [ATTRIBUTE_DATE_DDL]
+
+    def _date_attributes(self, conn):
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT ProgramAttributeId FROM cleantranscrm.ProgramAttribute
+            WHERE ControlType = 'date'
+            ORDER BY ProgramAttributeId
+        """)
+        attribute_ids = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        return attribute_ids
+
+    def version(self, conn):
+        ids = ','.join(str(i) for i in self._date_attributes(conn))
+        return hashlib.sha1(ids.encode('utf-8')).hexdigest()
+
+    def reset(self, conn):
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM cleantranscrm.AttributeDate")
+        cursor.close()
+
+    def _apply(self, cursor, rows):
+        """Upsert (Id, ProjectId, ProgramAttributeId, Value) rows; NULL values are removed."""
+        upserts = []
+        cleared = []
+        for value_id, project_id, attribute_id, value in rows:
+            if value is None:
+                cleared.append(value_id)
+                continue
+            date_value, iso_timestamp = parse_date_value(value)
+            upserts.append((value_id, project_id, attribute_id, str(value)[:255], date_value, int(iso_timestamp)))
+        if upserts:
+            cursor.executemany("""
+                INSERT INTO cleantranscrm.AttributeDate
+                    (Id, ProjectId, ProgramAttributeId, Value, DateValue, IsoTimestamp)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE ProjectId = VALUES(ProjectId), ProgramAttributeId = VALUES(ProgramAttributeId),
+                    Value = VALUES(Value), DateValue = VALUES(DateValue), IsoTimestamp = VALUES(IsoTimestamp)
+            """, upserts)
+        if cleared:
+            placeholders = ', '.join(['%s'] * len(cleared))
+            cursor.execute(f"DELETE FROM cleantranscrm.AttributeDate WHERE Id IN ({placeholders})", tuple(cleared))
+
+    def sync(self, conn, last_created_at, last_id):
+        watermark = None
+        previous = (last_created_at, last_id or 0)
+        cursor = conn.cursor()
+        if last_created_at is not None:
+            # Re-read the trailing window: applying a row twice is harmless, and rows that
+            # commit up to ATTRIBUTE_DATE_OVERLAP after a later UpdatedAt are still seen
+            last_created_at, last_id = last_created_at - timedelta(seconds=ATTRIBUTE_DATE_OVERLAP), 0
+        while True:
+            cursor.execute(f"""
+                SELECT pav.Id, pav.UpdatedAt, pav.ProjectId, pav.ProgramAttributeId, pav.Value
+                FROM cleantranscrm.ProjectAttributeValue pav
+                JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramAttributeId = pav.ProgramAttributeId
+                WHERE pa.ControlType = 'date' AND {after_watermark('pav.UpdatedAt', 'pav.Id')}
+                ORDER BY pav.UpdatedAt, pav.Id
+                LIMIT %s
+            """, watermark_params(last_created_at, last_id) + (REFRESH_BATCH_SIZE,))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            self._apply(cursor, [(value_id, project_id, attribute_id, value)
+                                 for value_id, updated_at, project_id, attribute_id, value in rows])
+            last_id, last_created_at = rows[-1][0], rows[-1][1]
+            watermark = (last_created_at, last_id)
+            if len(rows) < REFRESH_BATCH_SIZE:
+                break
+
+        # Rows without an UpdatedAt never pass the watermark; add the ones not copied yet
+        while True:
+            cursor.execute("""
+                SELECT pav.Id, pav.ProjectId, pav.ProgramAttributeId, pav.Value
+                FROM cleantranscrm.ProjectAttributeValue pav
+                JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramAttributeId = pav.ProgramAttributeId
+                LEFT JOIN cleantranscrm.AttributeDate ad ON ad.Id = pav.Id
+                WHERE pa.ControlType = 'date' AND pav.UpdatedAt IS NULL AND pav.Value IS NOT NULL
+                AND ad.Id IS NULL
+                LIMIT %s
+            """, (REFRESH_BATCH_SIZE,))
+            rows = cursor.fetchall()
+            self._apply(cursor, rows)
+            if len(rows) < REFRESH_BATCH_SIZE:
+                break
+        cursor.close()
+        if watermark is not None and previous[0] is not None and watermark <= previous:
+            return None  # Only the overlap was re-read; keep the watermark where it was
+        return watermark
+
+ATTRIBUTE_DATES = AttributeDateStore()
+
+# The AttributeDate columns derived straight from ProjectAttributeValue with the
+# REGEXP the resolvers used before the table existed; used while it isn't ready
+ATTRIBUTE_DATE_SCAN = f"""(
+    SELECT pav.Id, pav.ProjectId, pav.ProgramAttributeId, pav.Value,
+        CASE WHEN pav.Value REGEXP '^[0-9]{{4}}-[0-9]{{2}}-[0-9]{{2}}'
+            THEN CAST(LEFT(REPLACE(pav.Value, 'T', ' '), 19) AS DATETIME) END AS DateValue,
+        pav.Value REGEXP '{ISO_TIMESTAMP.pattern}' AS IsoTimestamp
+    FROM cleantranscrm.ProjectAttributeValue pav
+    WHERE pav.Value IS NOT NULL
+)"""
+
+
+def attribute_dates_source():
+    """FROM source for typed date attributes: the AttributeDate table, or the scan when it isn't ready."""
+    if ATTRIBUTE_DATES.refresh_if_stale():
+        return "cleantranscrm.AttributeDate"
+    return ATTRIBUTE_DATE_SCAN
@@ -1,30 +1,14 @@
 import pymysql
 import pandas as pd
-from dotenv import load_dotenv
-import os
-from dateutil.parser import parse as dateutil_parse
 from .queries import QUERIES
-
-# Load environment variables
-load_dotenv()
+from .pool import get_request_connection
+from .dates import format_date_column
+from .pivot import PIVOT_VIEWS, build_view
 
 def get_connection():
-    """Establish a connection to the database."""
-    conn_str = {
-        'host': os.getenv('HOST'),
-        'database': os.getenv('DATABASE'),
-        'user': os.getenv('USER'),
-        'password': os.getenv('PASSWORD')
-    }
-    
+    """Return the pooled connection bound to the current request."""
     try:
-        connection = pymysql.connect(
-            host=conn_str['host'],
-            user=conn_str['user'],
-            password=conn_str['password'],
-            database=conn_str['database']
-        )
-        return connection
+        return get_request_connection()
     except pymysql.MySQLError as e:
         print(f"Error connecting to database: {e}")
         return None
@@ -37,26 +21,10 @@ def fetch_data(query, params=None):
     finally:
         connection.close()
 
-def is_iso_format_date(string):
-    """Check if string is in ISO date format"""
-    if string is None or isinstance(string, pd.Timestamp):
-        return False
-    try:
-        if isinstance(string, str) and string.endswith('Z') and 'T' in string:
-            dateutil_parse(string)
-            return True
-        elif isinstance(string, str) and len(string) >= 26 and string[10] == ' ' and string[19] == '.':
-            dateutil_parse(string)
-            return True
-        else:
-            return False
-    except (ValueError, TypeError):
-        return False
-
 def format_dates(df, date_columns):
     """Format date columns in DataFrame"""
     for col in date_columns:
-        df[col] = df[col].apply(lambda x: pd.to_datetime(x).strftime('%Y-%m-%d') if is_iso_format_date(x) else x)
+        df[col] = format_date_column(df[col])
         df[col] = df[col].fillna('None')
     return df
 
@@ -72,6 +40,8 @@ def fetch_and_process_data():
         # Fetch data for each query
         for query_name, query in QUERIES.items():
             df = fetch_data(query, connection)
+            if query_name in PIVOT_VIEWS:
+                df = build_view(query_name, df, fetch_data)
             
             # Apply date formatting if needed
             if query_name in ['summary', 'duration']:  # Add conditions for date formatting
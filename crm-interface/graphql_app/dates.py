@@ -0,0 +1,79 @@
+import pandas as pd
+from dateutil.parser import parse
+from pandas.api.types import is_object_dtype, is_string_dtype
+
+# Layouts the database and API actually return, tried in order before falling back to dateutil
+ZULU_FORMATS = ('%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ')
+MICROSECOND_FORMATS = ('%Y-%m-%d %H:%M:%S.%f',)
+
+
+def is_iso_format_date(string):
+    """Check if string is in ISO date format"""
+    if string is None or isinstance(string, pd.Timestamp):
+        return False
+    try:
+        if isinstance(string, str) and string.endswith('Z') and 'T' in string:
+            parse(string)
+            return True
+        elif isinstance(string, str) and len(string) >= 26 and string[10] == ' ' and string[19] == '.':
+            parse(string)
+            return True
+        else:
+            return False
+    except (ValueError, TypeError):
+        return False
+
+
+def _format_one(value):
+    return pd.to_datetime(value).strftime('%Y-%m-%d') if is_iso_format_date(value) else value
+
+
+def _parse_known(values, formats):
+    """'YYYY-MM-DD' for values matching one of formats (tried in order); None where none match."""
+    days = pd.Series(None, index=values.index, dtype=object)
+    for fmt in formats:
+        missing = days.isna()
+        if not missing.any():
+            break
+        parsed = pd.to_datetime(values[missing], format=fmt, errors='coerce')
+        days[missing] = parsed.dt.strftime('%Y-%m-%d').astype(object).where(parsed.notna(), None)
+    return days
+
+
+def format_date_column(column):
+    """Vectorized format_dates for one column.
+
+    ISO strings ending in 'Z' or with microseconds ('YYYY-MM-DD HH:MM:SS.ffffff...')
+    become 'YYYY-MM-DD'; everything else is left as is, like is_iso_format_date.
+    Candidates are picked with string ops and parsed with fixed formats; only the
+    ones those formats reject go through dateutil one by one.
+    """
+    if not (is_object_dtype(column) or is_string_dtype(column)):
+        return column
+    index = column.index
+    column = column.reset_index(drop=True)
+    try:
+        text = column.str
+    except AttributeError:
+        # No strings at all (e.g. only datetimes or NULLs), so nothing to format
+        return column.set_axis(index)
+    zulu = text.endswith('Z', na=False) & text.contains('T', regex=False, na=False)
+    microseconds = (text.len() >= 26) & text.slice(10, 11).eq(' ') & text.slice(19, 20).eq('.')
+    zulu = zulu.fillna(False).astype(bool)
+    microseconds = microseconds.fillna(False).astype(bool) & ~zulu
+    if not (zulu.any() or microseconds.any()):
+        return column.set_axis(index)
+
+    result = column.astype(object)
+    days = pd.concat([
+        _parse_known(column[zulu], ZULU_FORMATS),
+        _parse_known(column[microseconds], MICROSECOND_FORMATS),
+    ])
+    matched = days.notna()
+    result.loc[matched[matched].index] = days[matched]
+    unmatched = matched[~matched].index
+    if len(unmatched):
+        result.loc[unmatched] = column[unmatched].map(_format_one)
+    if is_string_dtype(column) and not is_object_dtype(column):
+        result = result.astype(column.dtype)
+    return result.set_axis(index)
@@ -1,32 +1,13 @@
 from .queries import QUERIES
 import pandas as pd
 import pymysql
-import os
-from dotenv import load_dotenv
-from dateutil.parser import parse
-
-# Load environment variables from .env file
-load_dotenv(verbose=True, override=True)
+from .pool import get_request_connection
+from .dates import format_date_column
 
 def get_connection():
-    """Establish database connection using environment variables"""
-    conn_str = {
-        'host': os.getenv('HOST'),
-        'database': os.getenv('DATABASE'),
-        'user': os.getenv('USER'),
-        'password': os.getenv('PASSWORD')
-    }
-    
+    """Return the pooled connection bound to the current request."""
     try:
-        print(f"Connecting to database with parameters: {conn_str}")
-        print(f"Host: {os.getenv('HOST')}, Database: {os.getenv('DATABASE')}, User: {os.getenv('USER')}")
-        connection = pymysql.connect(
-            host=conn_str['host'],
-            user=conn_str['user'],
-            password=conn_str['password'],
-            database=conn_str['database']
-        )
-        return connection
+        return get_request_connection()
     except pymysql.MySQLError as e:
         print(f"Error connecting to database: {e}")
         return None
@@ -46,26 +27,10 @@ def fetch_data(query, connection, params=None):
         return pd.DataFrame()
     
 
-def is_iso_format_date(string):
-    """Check if string is in ISO date format"""
-    if string is None or isinstance(string, pd.Timestamp):
-        return False
-    try:
-        if isinstance(string, str) and string.endswith('Z') and 'T' in string:
-            parse(string)
-            return True
-        elif isinstance(string, str) and len(string) >= 26 and string[10] == ' ' and string[19] == '.':
-            parse(string)
-            return True
-        else:
-            return False
-    except (ValueError, TypeError):
-        return False
-
 def format_dates(df, date_columns):
     """Format date columns in DataFrame"""
     for col in date_columns:
-        df[col] = df[col].apply(lambda x: pd.to_datetime(x).strftime('%Y-%m-%d') if is_iso_format_date(x) else x)
+        df[col] = format_date_column(df[col])
         df[col] = df[col].fillna('None')
     return df
 
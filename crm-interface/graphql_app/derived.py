@@ -0,0 +1,160 @@
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+
+import pymysql
+
+from .pool import connection
+
+logger = logging.getLogger(__name__)
+
+# Derived tables are rebuilt from the CRM tables and can always be dropped and back-filled.
+WATERMARK_DDL = """
+    CREATE TABLE IF NOT EXISTS cleantranscrm.DerivedWatermark (
+        Name VARCHAR(64) NOT NULL PRIMARY KEY,
+        LastCreatedAt DATETIME(6) NULL,
+        LastId BIGINT NULL,
+        Version VARCHAR(64) NULL,
+        RefreshedAt DATETIME NOT NULL
+    )
+"""
+
+REFRESH_BATCH_SIZE = int(os.getenv('DERIVED_REFRESH_BATCH_SIZE', 5000))
+REFRESH_MAX_AGE = float(os.getenv('DERIVED_REFRESH_MAX_AGE', 30))
+
+EPOCH = '1970-01-01 00:00:00'
+
+# MySQL error for a FOR UPDATE NOWAIT read of a row locked by another transaction
+ER_LOCK_NOWAIT = 3572
+
+
+class DerivedStore(ABC):
+    """Base class for a table derived from CRM rows and maintained from a watermark.
+
+    Subclasses provide `name`, `ddl` (a list of CREATE TABLE IF NOT EXISTS statements),
+    `reset(conn)` to empty the table, and `sync(conn, last_created_at, last_id)`, which
+    applies every source row after the watermark and returns the new watermark (or
+    None when nothing changed). `version(conn)` may return a fingerprint of the inputs
+    the derivation depends on; when it changes the table is rebuilt from scratch.
+    """
+
+    name = None
+    ddl = []
+
+    def __init__(self, max_age=REFRESH_MAX_AGE):
+        self.max_age = max_age
+        self.ready = False
+        self._lock = threading.Lock()
+        self._last_refresh = None
+
+    def version(self, conn):
+        return None
+
+    @abstractmethod
+    def reset(self, conn):
+        """Empty the derived table before a rebuild."""
+
+    @abstractmethod
+    def sync(self, conn, last_created_at, last_id):
+        """Apply source rows after the watermark; return the new watermark or None."""
+
+    def _ensure_schema(self, conn):
+        cursor = conn.cursor()
+        for statement in [WATERMARK_DDL] + list(self.ddl):
+            cursor.execute(statement)
+        cursor.close()
+
+    def _lock_watermark(self, conn, wait=True):
+        """Read the watermark with FOR UPDATE, so a refresh in another process waits for this one to commit.
+
+        With wait=False a watermark locked elsewhere raises instead (MySQL's NOWAIT).
+        """
+        select = "SELECT LastCreatedAt, LastId, Version FROM cleantranscrm.DerivedWatermark WHERE Name = %s FOR UPDATE"
+        if not wait:
+            select += " NOWAIT"
+        cursor = conn.cursor()
+        cursor.execute(select, (self.name,))
+        row = cursor.fetchone()
+        if row is None:
+            # The row must exist to be locked; a first run locks an empty watermark
+            cursor.execute(
+                "INSERT IGNORE INTO cleantranscrm.DerivedWatermark (Name, RefreshedAt) VALUES (%s, NOW())",
+                (self.name,)
+            )
+            cursor.execute(select, (self.name,))
+            row = cursor.fetchone()
+        cursor.close()
+        return row if row else (None, None, None)
+
+    def _write_watermark(self, conn, last_created_at, last_id, version):
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO cleantranscrm.DerivedWatermark (Name, LastCreatedAt, LastId, Version, RefreshedAt)
+            VALUES (%s, %s, %s, %s, NOW())
+            ON DUPLICATE KEY UPDATE LastCreatedAt = VALUES(LastCreatedAt), LastId = VALUES(LastId),
+                Version = VALUES(Version), RefreshedAt = VALUES(RefreshedAt)
+        """, (self.name, last_created_at, last_id, version))
+        cursor.close()
+
+    def refresh(self, blocking=True):
+        """Apply source rows added since the watermark; back-fills on first run.
+
+        The in-process lock keeps threads apart; the watermark row lock keeps other
+        processes and app instances from syncing from the same watermark.
+        """
+        if not self._lock.acquire(blocking=blocking):
+            return False  # Another thread is already refreshing
+        try:
+            with connection() as conn:
+                if not self.ready:
+                    self._ensure_schema(conn)
+                # Held until commit: sync's increments must not be applied twice from one watermark
+                try:
+                    last_created_at, last_id, stored_version = self._lock_watermark(conn, wait=blocking)
+                except pymysql.err.OperationalError as e:
+                    if e.args[0] != ER_LOCK_NOWAIT:
+                        raise
+                    return False  # Another process is refreshing
+                version = self.version(conn)
+                if version != stored_version:
+                    logger.info("Rebuilding derived table %s", self.name)
+                    self.reset(conn)
+                    last_created_at, last_id = None, None
+                watermark = self.sync(conn, last_created_at, last_id)
+                if watermark is not None:
+                    last_created_at, last_id = watermark
+                self._write_watermark(conn, last_created_at, last_id, version)
+                conn.commit()
+            self.ready = True
+            return True
+        except Exception as e:
+            logger.exception("Error refreshing derived table %s: %s", self.name, e)
+            return False
+        finally:
+            # Failures also wait out max_age so a broken refresh isn't retried per request
+            self._last_refresh = time.monotonic()
+            self._lock.release()
+
+    def refresh_if_stale(self):
+        """Refresh when the last refresh is older than max_age; returns whether the table is usable."""
+        if self._last_refresh is None or time.monotonic() - self._last_refresh > self.max_age:
+            # Only the first refresh makes readers wait; later ones run in whichever
+            # request gets the lock while the others read the slightly older table.
+            self.refresh(blocking=not self.ready)
+        return self.ready
+
+
+def after_watermark(created_col, id_col):
+    """SQL predicate selecting rows strictly after a (CreatedAt, Id) watermark.
+
+    Takes params (last_created_at, last_created_at, last_id).
+    """
+    return f"({created_col} > %s OR ({created_col} = %s AND {id_col} > %s))"
+
+
+def watermark_params(last_created_at, last_id):
+    last_created_at = last_created_at or EPOCH
+    last_id = last_id or 0
+    return (last_created_at, last_created_at, last_id)
@@ -0,0 +1,157 @@
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from .pool import connection
+
+logger = logging.getLogger(__name__)
+
+DIMENSION_CHECK_INTERVAL = float(os.getenv('DIMENSION_CHECK_INTERVAL', 60))
+
+# Small reference tables: name -> (SELECT statement, key columns)
+DIMENSION_TABLES = {
+    'Program': ("SELECT * FROM cleantranscrm.Program", ('ProgramId',)),
+    'ProjectStatus': ("SELECT * FROM cleantranscrm.ProjectStatus", ('ProjectStatusId',)),
+    'ProgramPhase': ("SELECT * FROM cleantranscrm.ProgramPhase", ('ProgramId', 'PhaseId')),
+    'ProgramAttribute': ("SELECT * FROM cleantranscrm.ProgramAttribute", ('ProgramAttributeId',)),
+    'SelectControl': ("SELECT * FROM cleantranscrm.SelectControl", ('SelectControlId',)),
+    'SelectOption': ("SELECT * FROM cleantranscrm.SelectOption", ('SelectControlId', 'OptionValue')),
+    'ActivityType': ("SELECT * FROM cleantranscrm.ActivityType", ('ActivityTypeId',)),
+    'Role': ("SELECT * FROM cleantranscrm.`Role`", ('RoleId',)),
+    'User': ("SELECT UserId, ProperName, DisplayName, Initials FROM cleantranscrm.`User`", ('UserId',)),
+    'Organization': ("SELECT * FROM cleantranscrm.Organization", ('OrganizationId',)),
+}
+
+
+class Dimension:
+    """One loaded reference table: a DataFrame plus a dict index on its key."""
+
+    def __init__(self, frame, key):
+        self.frame = frame
+        self.key = key
+        records = frame.to_dict(orient='records')
+        if len(key) == 1:
+            self.rows = {record[key[0]]: record for record in records}
+        else:
+            self.rows = {tuple(record[k] for k in key): record for record in records}
+
+
+class DimensionCache:
+    """Process-wide copy of the reference tables with O(1) lookups.
+
+    Every DIMENSION_CHECK_INTERVAL seconds one CHECKSUM TABLE statement covering all
+    the tables is run, and only tables whose checksum changed are reloaded. Readers
+    keep using the previous copy while a reload runs.
+    """
+
+    def __init__(self, tables=DIMENSION_TABLES, check_interval=DIMENSION_CHECK_INTERVAL):
+        self.tables = tables
+        self.check_interval = check_interval
+        self._dimensions = {}
+        self._checksums = {}
+        self._last_check = None
+        self._lock = threading.Lock()
+
+    def _checksum_all(self, conn):
+        cursor = conn.cursor()
+        try:
+            names = ', '.join(f"cleantranscrm.`{name}`" for name in self.tables)
+            cursor.execute(f"CHECKSUM TABLE {names}")
+            return {table.rsplit('.', 1)[-1].strip('`'): checksum for table, checksum in cursor.fetchall()}
+        except Exception as e:
+            # Without checksums every table is reloaded on each check
+            logger.exception("Error checksumming dimension tables: %s", e)
+            return {}
+        finally:
+            cursor.close()
+
+    def _load(self, conn, name):
+        sql, key = self.tables[name]
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        columns = [desc[0] for desc in cursor.description]
+        frame = pd.DataFrame(list(cursor.fetchall()), columns=columns)
+        cursor.close()
+        return Dimension(frame, key)
+
+    def refresh_if_stale(self):
+        """Reload changed tables when the last check is older than check_interval."""
+        if self._last_check is not None and time.monotonic() - self._last_check <= self.check_interval:
+            return
+        # The first load makes callers wait; later checks are skipped while one runs
+        if not self._lock.acquire(blocking=not self._dimensions):
+            return
+        try:
+            if self._last_check is not None and time.monotonic() - self._last_check <= self.check_interval:
+                return
+            with connection() as conn:
+                checksums = self._checksum_all(conn)
+                for name in self.tables:
+                    checksum = checksums.get(name)
+                    if name in self._dimensions and checksum is not None and checksum == self._checksums.get(name):
+                        continue
+                    self._dimensions[name] = self._load(conn, name)
+                    self._checksums[name] = checksum
+        except Exception as e:
+            logger.exception("Error refreshing dimension cache: %s", e)
+        finally:
+            self._last_check = time.monotonic()
+            self._lock.release()
+
+    def dimension(self, name):
+        self.refresh_if_stale()
+        if name not in self._dimensions:
+            raise LookupError(f"Dimension {name} is not loaded")
+        return self._dimensions[name]
+
+    def get(self, name, *key):
+        """Row dict for a key (several values for composite keys), or None."""
+        rows = self.dimension(name).rows
+        return rows.get(key[0] if len(key) == 1 else tuple(key))
+
+    def label(self, name, key, column, default=None):
+        row = self.get(name, *(key if isinstance(key, tuple) else (key,)))
+        return default if row is None or row.get(column) is None else row[column]
+
+    def stats(self):
+        return {
+            name: {'rows': len(dimension.frame), 'checksum': self._checksums.get(name)}
+            for name, dimension in self._dimensions.items()
+        }
+
+    def decorate(self, df, name, on, columns):
+        """Left-join dimension columns onto df in one vectorized merge.
+
+        on: df columns matching the dimension key, in key order.
+        columns: {dimension column: output column}.
+        """
+        dimension = self.dimension(name)
+        on = [on] if isinstance(on, str) else list(on)
+        if df.empty:
+            for target in columns.values():
+                df[target] = pd.Series(dtype=object)
+            return df
+        right_keys = [f"__{name}_{k}" for k in dimension.key]
+        right = dimension.frame[list(dimension.key) + list(columns)].copy()
+        right.columns = right_keys + [f"__{name}_value_{column}" for column in columns]
+        # Join on copies of the df keys so all-NULL (object) key columns still match numeric ids
+        left_keys = [f"__{name}_on_{k}" for k in dimension.key]
+        left = df.copy()
+        for left_key, column, right_key in zip(left_keys, on, right_keys):
+            values = df[column]
+            if is_numeric_dtype(right[right_key]) and not is_numeric_dtype(values):
+                values = pd.to_numeric(values, errors='coerce')
+            left[left_key] = values
+        merged = left.merge(right, how='left', left_on=left_keys, right_on=right_keys)
+        for column, target in columns.items():
+            values = merged.pop(f"__{name}_value_{column}")
+            # Misses come back as NaN; keep them JSON null like the SQL joins did
+            merged[target] = values.astype(object).where(values.notna(), None)
+        return merged.drop(columns=left_keys + right_keys)
+
+
+DIMENSIONS = DimensionCache()
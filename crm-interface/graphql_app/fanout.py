@@ -0,0 +1,99 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from graphql.execution import ExecutionContext
+
+from .db_logic import fetch_data
+from .pool import connection
+
+FANOUT_WORKERS = int(os.getenv('DB_FANOUT_WORKERS', 8))
+FANOUT_TIMEOUT = float(os.getenv('DB_FANOUT_TIMEOUT', 20))
+
+# Shared, bounded worker pool for independent queries; keep it smaller than the
+# connection pool so request-scoped connections can still be checked out.
+_executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix='db-fanout')
+
+
+class FanoutTimeout(Exception):
+    """Raised when concurrent work misses its per-request deadline."""
+
+
+def run_concurrently(calls, timeout=FANOUT_TIMEOUT):
+    """Run {name: zero-arg callable} on the worker pool and return {name: result}.
+
+    Raises FanoutTimeout if anything is still running when the deadline passes.
+    """
+    futures = {name: _executor.submit(call) for name, call in calls.items()}
+    _, pending = wait(futures.values(), timeout=timeout)
+    if pending:
+        for future in pending:
+            future.cancel()
+        late = [name for name, future in futures.items() if future in pending]
+        raise FanoutTimeout(f"Timed out after {timeout}s waiting for: {', '.join(late)}")
+    return {name: future.result() for name, future in futures.items()}
+
+
+def iter_concurrently(calls, timeout=FANOUT_TIMEOUT):
+    """Run {name: zero-arg callable} on the worker pool, yielding (name, future) as each finishes.
+
+    Raises FanoutTimeout, after cancelling what is left, once the deadline passes.
+    """
+    deadline = time.monotonic() + timeout
+    names = {_executor.submit(call): name for name, call in calls.items()}
+    pending = set(names)
+    while pending:
+        done, pending = wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        if not done:
+            for future in pending:
+                future.cancel()
+            late = [names[future] for future in pending]
+            raise FanoutTimeout(f"Timed out after {timeout}s waiting for: {', '.join(late)}")
+        for future in done:
+            yield names[future], future
+
+
+async def run_in_pool(call, timeout=FANOUT_TIMEOUT, what='pooled call'):
+    """Await a zero-arg callable run on the worker pool; raises FanoutTimeout past the deadline."""
+    future = _executor.submit(call)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except asyncio.TimeoutError:
+        future.cancel()
+        raise FanoutTimeout(f"Timed out after {timeout}s waiting for {what}")
+
+
+def offloaded(resolver, timeout=FANOUT_TIMEOUT):
+    """Async wrapper that runs a blocking GraphQL resolver on the worker pool.
+
+    Under ariadne's async executor, sibling root fields wrapped this way resolve
+    at the same time, each on its own pooled connection.
+    """
+    async def resolve(root, info, **kwargs):
+        return await run_in_pool(lambda: resolver(root, info, **kwargs), timeout, f"resolving {info.field_name}")
+    return resolve
+
+
+class SerialRootExecutionContext(ExecutionContext):
+    """Async execution that resolves the root fields one after another.
+
+    Nested fields still run on the event loop, so DataLoader keys keep batching
+    per level while the operation uses one pooled worker at a time.
+    """
+
+    def execute_fields(self, parent_type, source_value, path, fields):
+        if path is None:
+            return self.execute_fields_serially(parent_type, source_value, path, fields)
+        return super().execute_fields(parent_type, source_value, path, fields)
+
+
+def _fetch_pooled(query, params):
+    with connection() as conn:
+        return fetch_data(query, conn, params=params)
+
+
+def fetch_concurrently(queries, timeout=FANOUT_TIMEOUT):
+    """Run {name: (query, params)} concurrently, each on its own pooled connection."""
+    calls = {name: (lambda q=query, p=params: _fetch_pooled(q, p)) for name, (query, params) in queries.items()}
+    return run_concurrently(calls, timeout=timeout)
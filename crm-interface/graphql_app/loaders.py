@@ -0,0 +1,83 @@
+import asyncio
+
+from .fanout import run_in_pool
+
+
+class DataLoader:
+    """Per-request batcher for nested GraphQL fields.
+
+    load(key) returns a future. Keys requested while the executor resolves one
+    level of the result (e.g. every ProjectOverview in a list) are collected and
+    answered by a single batch_load(keys) call on the fanout pool; batch_load
+    returns one value per key, in order. Each key is loaded once per request.
+    """
+
+    def __init__(self, batch_load):
+        self.batch_load = batch_load
+        self._futures = {}
+        self._queue = []
+        self._values = {}
+
+    def prime(self, keys):
+        """Load keys now with one batch_load call; later loads of them return the value directly."""
+        keys = [key for key in dict.fromkeys(keys) if key not in self._values]
+        if keys:
+            self._values.update(zip(keys, self.batch_load(keys)))
+
+    def load(self, key):
+        if key in self._values:
+            return self._values[key]
+        future = self._futures.get(key)
+        if future is not None:
+            return future
+        loop = asyncio.get_running_loop()
+        future = self._futures[key] = loop.create_future()
+        self._queue.append(key)
+        if len(self._queue) == 1:
+            # Runs once the executor has called the resolvers for the whole level
+            loop.call_soon(lambda: asyncio.ensure_future(self._dispatch()))
+        return future
+
+    async def _dispatch(self):
+        keys, self._queue = self._queue, []
+        try:
+            values = await run_in_pool(lambda: self.batch_load(keys), what=self.batch_load.__name__)
+        except Exception as e:
+            for key in keys:
+                self._futures[key].set_exception(e)
+            return
+        for key, value in zip(keys, values):
+            self._futures[key].set_result(value)
+
+
+def _loader(info, batch_load):
+    loaders = info.context.setdefault('loaders', {})
+    loader = loaders.get(batch_load)
+    if loader is None:
+        loader = loaders[batch_load] = DataLoader(batch_load)
+    return loader
+
+
+def prefetch(info, batch_load, keys):
+    """Batch-load keys for the nested resolvers of the field being resolved.
+
+    Without this the graphql_sync path has no event loop to collect keys on and
+    loads each one separately.
+    """
+    _loader(info, batch_load).prime(keys)
+
+
+def load(info, batch_load, key):
+    """Load key through this request's DataLoader for batch_load.
+
+    Without a running event loop (the graphql_sync path) a key that wasn't
+    prefetched is loaded on its own.
+    """
+    loader = _loader(info, batch_load)
+    if key in loader._values:
+        return loader._values[key]
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return batch_load([key])[0]
+    return loader.load(key)
@@ -0,0 +1,129 @@
+import hashlib
+from collections import Counter
+
+from .derived import DerivedStore, after_watermark, watermark_params, REFRESH_BATCH_SIZE
+
+
+class MentionMatcher:
+    """Finds every user @mentioned in a piece of text in a single pass.
+
+    Handles are stored in a character trie keyed on the casefolded ProperName, so
+    each '@' in the text is resolved by one walk of the trie instead of one LIKE
+    scan per user. Matching keeps the old `Text LIKE '%@name%'` semantics: it is
+    case-insensitive and a handle matches even when more text follows it, so
+    '@Ann Lee' mentions both 'Ann' and 'Ann Lee' if both users exist.
+    """
+
+    def __init__(self, users):
+        """users: iterable of (UserId, ProperName) pairs."""
+        self._root = {}
+        self.names = {}
+        for user_id, name in users:
+            if not name:
+                continue
+            self.names[user_id] = name
+            node = self._root
+            for ch in name.casefold():
+                node = node.setdefault(ch, {})
+            node.setdefault(None, set()).add(user_id)
+
+    def match(self, text):
+        """Return the set of UserIds mentioned in text."""
+        found = set()
+        if not text or '@' not in text:
+            return found
+        folded = text.casefold()
+        start = folded.find('@')
+        while start != -1:
+            node = self._root
+            for ch in folded[start + 1:]:
+                node = node.get(ch)
+                if node is None:
+                    break
+                if None in node:
+                    found |= node[None]
+            start = folded.find('@', start + 1)
+        return found
+
+    def count(self, texts):
+        """Count, per UserId, how many of the texts mention that user."""
+        counts = Counter()
+        for text in texts:
+            counts.update(self.match(text))
+        return counts
+
+
+class MentionIndex(DerivedStore):
+    """MentionIndex table mapping UserId -> (ActivityId, CreatedAt) for every @mention.
+
+    Back-filled once from Activity, then extended from a (CreatedAt, ActivityId)
+    watermark, so mention lookups become range reads on (UserId, CreatedAt) instead
+    of leading-wildcard LIKE scans. Adding, removing or renaming a user changes the
+    handle set and triggers a rebuild. Edits to existing Activity text are not
+    tracked.
+    """
+
+    name = 'MentionIndex'
+    ddl = ["""
+        CREATE TABLE IF NOT EXISTS cleantranscrm.MentionIndex (
+            UserId INT NOT NULL,
+            ActivityId INT NOT NULL,
+            CreatedAt DATETIME NOT NULL,
+            PRIMARY KEY (UserId, CreatedAt, ActivityId),
+            KEY IX_MentionIndex_CreatedAt (CreatedAt)
+        )
+    """]
+
+    def _load_users(self, conn):
+        cursor = conn.cursor()
+        cursor.execute("SELECT UserId, ProperName FROM cleantranscrm.`User` ORDER BY UserId")
+        users = cursor.fetchall()
+        cursor.close()
+        return users
+
+    def version(self, conn):
+        digest = hashlib.sha1()
+        for user_id, name in self._load_users(conn):
+            digest.update(f"{user_id}:{name}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def reset(self, conn):
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM cleantranscrm.MentionIndex")
+        cursor.close()
+
+    def sync(self, conn, last_created_at, last_id):
+        matcher = MentionMatcher(self._load_users(conn))
+        watermark = None
+        cursor = conn.cursor()
+        while True:
+            cursor.execute(f"""
+                SELECT a.ActivityId, a.CreatedAt, a.`Text`
+                FROM cleantranscrm.Activity a
+                WHERE {after_watermark('a.CreatedAt', 'a.ActivityId')}
+                AND a.`Text` LIKE '%%@%%'
+                ORDER BY a.CreatedAt, a.ActivityId
+                LIMIT %s
+            """, watermark_params(last_created_at, last_id) + (REFRESH_BATCH_SIZE,))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            entries = [
+                (user_id, activity_id, created_at)
+                for activity_id, created_at, text in rows
+                for user_id in matcher.match(text)
+            ]
+            if entries:
+                cursor.executemany(
+                    "INSERT IGNORE INTO cleantranscrm.MentionIndex (UserId, ActivityId, CreatedAt) VALUES (%s, %s, %s)",
+                    entries
+                )
+            last_id, last_created_at = rows[-1][0], rows[-1][1]
+            watermark = (last_created_at, last_id)
+            if len(rows) < REFRESH_BATCH_SIZE:
+                break
+        cursor.close()
+        return watermark
+
+
+MENTION_INDEX = MentionIndex()
@@ -0,0 +1,204 @@
+import os
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pandas as pd
+
+from .db_logic import fetch_data
+from .pool import connection
+from .queries import QUERIES
+from .rollups import read_rollup
+from .singleflight import SINGLE_FLIGHT
+
+SERIES_DAYS = 30
+SERIES_MAX_WINDOW = int(os.getenv('SERIES_MAX_WINDOW', 365))
+DAILY_AGGREGATE_TTL = float(os.getenv('DAILY_AGGREGATE_TTL', 60))
+
+# How a trend compares: 'half' splits the window in two (the original dashboard trend),
+# 'previous' compares the window with the equally long window before it
+COMPARE_MODES = ('half', 'previous')
+
+# Daily series: query name -> (date column, value column). Each query is a range-bounded
+# grouped scan taking %(start)s / %(end)s; days without rows are filled in here.
+SERIES_METRICS = {
+    'projects': ('LogDate', 'ProjectCount'),
+    'logged-activities': ('LogDate', 'ActivityCount'),
+    'attributes-filled': ('CompletionDate', 'FilledCount'),
+    'services-completed': ('CompletionDate', 'CompletedCount'),
+    'logged-time': ('LogDate', 'DurationTotal'),
+}
+
+# Series whose values are sums rather than counts
+DECIMAL_METRICS = {'logged-time'}
+
+# "<series>-trend" endpoints are derived from their daily series instead of a second scan:
+# trend name -> (series query name, value column)
+TREND_QUERIES = {
+    'projects-trend': ('projects', 'ProjectCount'),
+    'logged-activities-trend': ('logged-activities', 'ActivityCount'),
+    'attributes-filled-trend': ('attributes-filled', 'FilledCount'),
+    'services-completed-trend': ('services-completed', 'CompletedCount'),
+    'logged-time-trend': ('logged-time', 'DurationTotal'),
+}
+
+
+def parse_series_args(args):
+    """Return (window, compare) from request arg pairs; raises ValueError on bad values."""
+    args = dict(args)
+    try:
+        window = int(args.get('window', SERIES_DAYS))
+    except ValueError:
+        raise ValueError(f"window must be a whole number of days, got {args.get('window')!r}")
+    if not 1 <= window <= SERIES_MAX_WINDOW:
+        raise ValueError(f"window must be between 1 and {SERIES_MAX_WINDOW} days")
+    compare = args.get('compare', 'half')
+    if compare not in COMPARE_MODES:
+        raise ValueError(f"compare must be one of {', '.join(COMPARE_MODES)}")
+    return window, compare
+
+
+def _numbers(values):
+    return [float(v) if isinstance(v, (int, float, Decimal, str)) else 0.0 for v in values]
+
+
+def _trend(before, after):
+    """Compare the daily averages of two periods; an empty period behaves like SQL's NULL AVG."""
+    if not before or not after:
+        return [{'Trend': 'neutral', 'PercentageChange': None}]
+    avg_before = sum(before) / len(before)
+    avg_after = sum(after) / len(after)
+    if avg_after > avg_before:
+        trend = 'up'
+    elif avg_after < avg_before:
+        trend = 'down'
+    else:
+        trend = 'neutral'
+    change = 0 if avg_before == 0 else round((avg_after - avg_before) / avg_before * 100, 2)
+    return [{'Trend': trend, 'PercentageChange': change}]
+
+
+def compute_trend(values):
+    """Half-over-half trend of a daily series ordered oldest first.
+
+    Matches the old SQL: the second half is the last len // 2 + 1 days (today and
+    the 15 days before it for a 30-day series), the first half is everything
+    earlier, and the averages are compared. Returns the single-row response
+    [{'Trend': 'up' | 'down' | 'neutral', 'PercentageChange': float}].
+    """
+    values = _numbers(values)
+    split = len(values) - (len(values) // 2 + 1)
+    return _trend(values[:split], values[split:])
+
+
+def compute_period_trend(previous, current):
+    """Trend of the current window's daily average against the previous window's."""
+    return _trend(_numbers(previous), _numbers(current))
+
+
+def series_bounds(days=SERIES_DAYS, today=None):
+    """Return (start, end) dates of the half-open range covering the last `days` days including today."""
+    today = today or date.today()
+    return today - timedelta(days=days - 1), today + timedelta(days=1)
+
+
+def zero_fill(df, date_column, value_column, start, days, zero=0):
+    """Return one row per day from start for `days` days, using zero where df has no row.
+
+    Pass a zero of the column's own type (Decimal(0) for DECIMAL_METRICS) so filled
+    days serialize like observed ones.
+
+    A frame without the expected columns (fetch_data's error result) is returned as is.
+    """
+    if date_column not in df.columns:
+        return df
+    observed = dict(zip(pd.to_datetime(df[date_column]).dt.date, df[value_column]))
+    dates = [start + timedelta(days=i) for i in range(days)]
+    return pd.DataFrame({
+        date_column: dates,
+        value_column: [observed.get(day, zero) for day in dates],
+    })
+
+
+def fetch_series(query_name, connection, days=SERIES_DAYS):
+    """Daily values of a SERIES_METRICS query over the last `days` days, zero-filled.
+
+    Read from the DailyRollup table; the grouped scan over the source table is only
+    used while the rollup is unavailable.
+    """
+    date_column, value_column = SERIES_METRICS[query_name]
+    start, end = series_bounds(days)
+    rollup = read_rollup(query_name, connection, start, end)
+    if rollup is not None and 'Value' in rollup.columns:
+        df = rollup.rename(columns={'Day': date_column, 'Value': value_column})
+        if query_name not in DECIMAL_METRICS:
+            df[value_column] = df[value_column].astype(int)
+    else:
+        df = fetch_data(QUERIES[query_name], connection, params={'start': start, 'end': end})
+    zero = Decimal(0) if query_name in DECIMAL_METRICS else 0
+    return zero_fill(df, date_column, value_column, start, days, zero)
+
+
+class DailyAggregates:
+    """In-memory daily values of every series metric, so any window is a slice.
+
+    Each metric keeps the last 2 * SERIES_MAX_WINDOW days (a window plus the window
+    before it), loaded with one fetch_series call and reused until it is `ttl`
+    seconds old, the date changes, or a writer invalidates it.
+    """
+
+    def __init__(self, ttl=DAILY_AGGREGATE_TTL, history_days=2 * SERIES_MAX_WINDOW):
+        self.ttl = ttl
+        self.history_days = history_days
+        self._entries = {}  # metric -> (loaded_at, day loaded, DataFrame)
+        self._generations = Counter()  # metric -> invalidations so far
+        self._lock = threading.Lock()
+
+    def _load(self, metric, generation):
+        with connection() as conn:
+            df = fetch_series(metric, conn, days=self.history_days)
+        if SERIES_METRICS[metric][0] not in df.columns:
+            raise RuntimeError(f"Could not load daily values for {metric}")
+        with self._lock:
+            # A load that started before a write is returned but not kept
+            if self._generations[metric] == generation:
+                self._entries[metric] = (time.monotonic(), date.today(), df)
+        return df
+
+    def history(self, metric):
+        with self._lock:
+            entry = self._entries.get(metric)
+            generation = self._generations[metric]
+        if entry and time.monotonic() - entry[0] < self.ttl and entry[1] == date.today():
+            return entry[2]
+        return SINGLE_FLIGHT.do(('aggregate', metric, generation), lambda: self._load(metric, generation))
+
+    def window(self, metric, days, offset=0):
+        """Rows for the `days` days ending `offset` days before today, oldest first."""
+        df = self.history(metric)
+        end = len(df) - offset
+        return df.iloc[max(end - days, 0):end].reset_index(drop=True)
+
+    def invalidate(self, metrics=None):
+        with self._lock:
+            for metric in (list(SERIES_METRICS) if metrics is None else metrics):
+                self._entries.pop(metric, None)
+                self._generations[metric] += 1
+
+
+DAILY_AGGREGATES = DailyAggregates()
+
+
+def series_rows(query_name, args=()):
+    """Response rows for a series or trend name, sliced from the in-memory daily aggregates."""
+    window, compare = parse_series_args(args)
+    if query_name in SERIES_METRICS:
+        return DAILY_AGGREGATES.window(query_name, window).to_dict(orient='records')
+    metric, value_column = TREND_QUERIES[query_name]
+    current = DAILY_AGGREGATES.window(metric, window)[value_column]
+    if compare == 'previous':
+        previous = DAILY_AGGREGATES.window(metric, window, offset=window)[value_column]
+        return compute_period_trend(previous, current)
+    return compute_trend(current)
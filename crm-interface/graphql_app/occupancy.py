@@ -0,0 +1,112 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from .records import plain_value
+
+BUCKETS = ('day', 'week', '14d', 'month')
+BUCKET_DAYS = {'day': 1, 'week': 7, '14d': 14}
+
+DEFAULT_BUCKET = '14d'
+DEFAULT_START_DATE = datetime.date(2020, 1, 1)
+
+
+def bucket_edges(start_date, end_date, bucket):
+    """Return datetime64[D] bucket boundaries covering start_date..end_date.
+
+    Buckets are half-open [edges[i], edges[i + 1]); the last one contains end_date.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket '{bucket}', expected one of {', '.join(BUCKETS)}")
+    if end_date < start_date:
+        raise ValueError("end_date must not be before start_date")
+    start = np.datetime64(start_date, 'D')
+    end = np.datetime64(end_date, 'D')
+    if bucket == 'month':
+        first = start.astype('datetime64[M]')
+        count = int((end.astype('datetime64[M]') - first).astype(int)) + 2
+        return (first + np.arange(count)).astype('datetime64[D]')
+    step = BUCKET_DAYS[bucket]
+    count = int((end - start).astype(int)) // step + 2
+    return start + np.arange(count) * step
+
+
+def phase_occupancy(transitions, start_date, end_date, bucket=DEFAULT_BUCKET):
+    """Count distinct projects in each phase per time bucket with one sweep over the transitions.
+
+    transitions: DataFrame with ProjectId, ProgramId, PhaseName, SortOrder, ProjectLead,
+    PromotionDate and NextPromotionDate (NULL while the project is still in the phase).
+    A project occupies every bucket from the one holding PromotionDate through the
+    one holding NextPromotionDate. Each interval is mapped to a range of bucket
+    indexes, ranges of the same project in the same phase are merged so it is
+    counted once, and a difference array per phase turns the ranges into counts.
+    Work is O(transitions log transitions + phases x buckets).
+    """
+    edges = bucket_edges(start_date, end_date, bucket)
+    starts = edges[:-1].astype('datetime64[s]')
+    n_buckets = len(starts)
+    if transitions.empty:
+        return []
+
+    promoted = pd.to_datetime(transitions['PromotionDate']).to_numpy('datetime64[s]')
+    next_promoted = pd.to_datetime(transitions['NextPromotionDate']).to_numpy('datetime64[s]')
+    # Same overlap test as before: PromotionDate < EndDate AND (Next IS NULL OR Next >= StartDate)
+    lo = np.maximum(np.searchsorted(starts, promoted, side='right') - 1, 0)
+    hi = np.where(np.isnat(next_promoted), n_buckets - 1, np.searchsorted(starts, next_promoted, side='right') - 1)
+    keep = (lo <= hi) & (promoted < edges[-1].astype('datetime64[s]'))
+
+    frame = pd.DataFrame({
+        'ProgramId': transitions['ProgramId'].to_numpy(),
+        'PhaseName': transitions['PhaseName'].to_numpy(),
+        'ProjectId': transitions['ProjectId'].to_numpy(),
+        'lo': lo,
+        'hi': hi,
+    })[keep]
+    if frame.empty:
+        return []
+
+    # Merge overlapping or touching ranges per (phase, project) so revisits count once
+    frame = frame.sort_values(['ProgramId', 'PhaseName', 'ProjectId', 'lo'], kind='mergesort')
+    keys = ['ProgramId', 'PhaseName', 'ProjectId']
+    running_hi = frame.groupby(keys, sort=False, dropna=False)['hi'].cummax()
+    previous_hi = running_hi.groupby([frame[k] for k in keys], sort=False, dropna=False).shift()
+    new_run = previous_hi.isna() | (frame['lo'] > previous_hi + 1)
+    run_id = new_run.cumsum()
+    merged = frame.assign(hi=running_hi, run=run_id).groupby('run', sort=False).agg(
+        ProgramId=('ProgramId', 'first'),
+        PhaseName=('PhaseName', 'first'),
+        lo=('lo', 'min'),
+        hi=('hi', 'max'),
+    )
+
+    phases = merged[['ProgramId', 'PhaseName']].drop_duplicates().reset_index(drop=True)
+    phase_index = pd.MultiIndex.from_frame(phases).get_indexer(pd.MultiIndex.from_frame(merged[['ProgramId', 'PhaseName']]))
+    diff = np.zeros((len(phases), n_buckets + 1), dtype=np.int64)
+    np.add.at(diff, (phase_index, merged['lo'].to_numpy()), 1)
+    np.add.at(diff, (phase_index, merged['hi'].to_numpy() + 1), -1)
+    counts = np.cumsum(diff[:, :n_buckets], axis=1)
+
+    details = transitions.drop_duplicates(['ProgramId', 'PhaseName']).set_index(['ProgramId', 'PhaseName'])
+    phases['SortOrder'] = [details.at[key, 'SortOrder'] for key in zip(phases['ProgramId'], phases['PhaseName'])]
+    phases['ProjectLead'] = [details.at[key, 'ProjectLead'] for key in zip(phases['ProgramId'], phases['PhaseName'])]
+    order = np.lexsort((phases['SortOrder'].to_numpy(), phases['ProgramId'].to_numpy()))
+
+    bucket_starts = [str(d) for d in edges[:-1]]
+    bucket_ends = [str(d) for d in edges[1:]]
+    results = []
+    for b in range(n_buckets):
+        for p in order:
+            count = int(counts[p, b])
+            if count == 0:
+                continue
+            results.append({
+                'StartDate': bucket_starts[b],
+                'EndDate': bucket_ends[b],
+                'ProgramId': plain_value(phases.at[p, 'ProgramId']),
+                'PhaseName': phases.at[p, 'PhaseName'],
+                'SortOrder': plain_value(phases.at[p, 'SortOrder']),
+                'ProjectCount': count,
+                'ProjectLead': plain_value(phases.at[p, 'ProjectLead']),
+            })
+    return results
@@ -0,0 +1,96 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from graphql import parse, validate, GraphQLError
+
+PERSISTED_QUERY_CACHE_SIZE = int(os.getenv('PERSISTED_QUERY_CACHE_SIZE', 500))
+
+
+class PersistedQueryNotFound(Exception):
+    """The client sent only a hash this process hasn't seen; it should resend with the query."""
+
+
+def query_hash(query):
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+
+def skip_validation(schema, document_ast, *args, **kwargs):
+    """query_validator for documents PersistedQueries already validated."""
+    return []
+
+
+class PersistedQueries:
+    """LRU of parsed and validated GraphQL documents keyed by the SHA-256 of the query text.
+
+    Implements Apollo's automatic persisted queries: a request whose
+    extensions.persistedQuery.sha256Hash is known may leave out `query`. Plain
+    requests go through the same cache, so a query string is parsed and validated
+    once however it arrives. Documents that fail validation are not cached.
+    """
+
+    def __init__(self, schema, max_size=PERSISTED_QUERY_CACHE_SIZE):
+        self.schema = schema
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return entry
+
+    def _put(self, key, entry):
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def prepare(self, data):
+        """Return (data, document) for an operation body.
+
+        data gets its `query` filled in from the cache for hash-only requests.
+        document is the cached, already validated DocumentNode, or None when the
+        query doesn't parse or validate (leave those to graphql_sync to report).
+        Raises PersistedQueryNotFound for an unknown hash without a query and
+        GraphQLError when the hash doesn't match the query.
+        """
+        if not isinstance(data, dict):
+            return data, None
+        persisted = (data.get('extensions') or {}).get('persistedQuery') or {}
+        sha256 = persisted.get('sha256Hash') if isinstance(persisted, dict) else None
+        query = data.get('query')
+        if not isinstance(query, str):
+            if not sha256:
+                return data, None
+            entry = self._get(sha256)
+            if entry is None:
+                raise PersistedQueryNotFound(sha256)
+            return {**data, 'query': entry[0]}, entry[1]
+
+        key = query_hash(query)
+        if sha256 and sha256 != key:
+            raise GraphQLError("provided sha does not match query")
+        entry = self._get(key)
+        if entry is not None:
+            return data, entry[1]
+        try:
+            document = parse(query)
+        except GraphQLError:
+            return data, None
+        if validate(self.schema, document):
+            return data, None
+        self._put(key, (query, document))
+        return data, document
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
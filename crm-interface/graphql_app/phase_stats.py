@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from .records import plain_value
+
+PHASE_STATS_TTL = float(os.getenv('PHASE_STATS_TTL', 60))
+DEFAULT_PERCENTILES = (75, 90)
+DEFAULT_HISTOGRAM_BINS = 10
+MAX_HISTOGRAM_BINS = 1000
+
+
+class PhaseDurations:
+    """Per-phase durations sorted once so any statistic is an index lookup.
+
+    rows: DataFrame with PhaseId, PhaseName, SortOrder, ProjectId and DaysInPhase,
+    one row per transition. Durations are ordered by (PhaseId, DaysInPhase) with a
+    single lexsort; each phase is then a contiguous slice described by `starts` and
+    `counts`, and the slices are listed in SortOrder. A PhaseId shared by several
+    programs is one phase, as in the SQL's PARTITION BY PhaseId, shown with its
+    lowest SortOrder.
+    """
+
+    def __init__(self, rows):
+        if rows.empty:
+            self.days = np.array([], dtype=float)
+            self.starts = self.counts = np.array([], dtype=np.int64)
+            self.phases = []
+            self.project_counts = np.array([], dtype=np.int64)
+            return
+        phase_ids = rows['PhaseId'].to_numpy()
+        days = rows['DaysInPhase'].to_numpy(dtype=float)
+        order = np.lexsort((days, phase_ids))
+        phase_ids = phase_ids[order]
+        self.days = days[order]
+        boundaries = np.flatnonzero(np.diff(phase_ids)) + 1
+        starts = np.concatenate(([0], boundaries)).astype(np.int64)
+        counts = np.diff(np.concatenate((starts, [len(phase_ids)])))
+
+        # One row per PhaseId (ascending, like the slices) carrying its lowest SortOrder
+        meta = (rows.assign(_SortOrder=rows['SortOrder'].fillna(0))
+                .sort_values(['PhaseId', '_SortOrder'], kind='stable')
+                .drop_duplicates('PhaseId'))
+        listing = np.argsort(meta['_SortOrder'].to_numpy(), kind='stable')
+        meta = meta.iloc[listing]
+        self.starts = starts[listing]
+        self.counts = counts[listing]
+        self.phases = [
+            {'PhaseId': plain_value(pid), 'PhaseName': name, 'SortOrder': plain_value(sort_order)}
+            for pid, name, sort_order in zip(meta['PhaseId'], meta['PhaseName'], meta['SortOrder'])
+        ]
+        # Distinct projects per phase: count first occurrences of each (PhaseId, ProjectId)
+        pairs = rows[['PhaseId', 'ProjectId']].drop_duplicates()
+        per_phase = pairs.groupby('PhaseId').size()
+        self.project_counts = per_phase.reindex(meta['PhaseId']).to_numpy(dtype=np.int64)
+
+    def percentile(self, q):
+        """q-th percentile of every phase (linear interpolation between the nearest rows)."""
+        position = (self.counts - 1) * (q / 100.0)
+        below = np.floor(position).astype(np.int64)
+        above = np.minimum(below + 1, self.counts - 1)
+        fraction = position - below
+        low = self.days[self.starts + below]
+        high = self.days[self.starts + above]
+        return low + fraction * (high - low)
+
+    def median(self):
+        """Median of every phase as the SQL version computed it: the lower of the two middle rows."""
+        return self.days[self.starts + (self.counts - 1) // 2]
+
+    def summary(self, percentiles=DEFAULT_PERCENTILES, bins=DEFAULT_HISTOGRAM_BINS):
+        """Return one dict per phase in SortOrder with count/min/max/mean/median/percentiles/histogram."""
+        if not self.phases:
+            return []
+        ends = self.starts + self.counts - 1
+        # Slices are listed in SortOrder, not position, so sum through the running total
+        totals = np.concatenate(([0.0], np.cumsum(self.days)))
+        means = (totals[ends + 1] - totals[self.starts]) / self.counts
+        medians = self.median()
+        extra = {q: self.percentile(q) for q in percentiles}
+
+        results = []
+        for i, phase in enumerate(self.phases):
+            values = self.days[self.starts[i]:ends[i] + 1]
+            hist_counts, hist_edges = np.histogram(values, bins=bins)
+            result = dict(phase)
+            result.update({
+                'ProjectCount': int(self.project_counts[i]),
+                'TransitionCount': int(self.counts[i]),
+                'AvgDaysInPhase': float(means[i]),
+                # Whole days, as TIMESTAMPDIFF returned them
+                'MinDaysInPhase': int(self.days[self.starts[i]]),
+                'MaxDaysInPhase': int(self.days[ends[i]]),
+                'MedDaysInPhase': int(medians[i]),
+                'Histogram': {
+                    'Edges': [float(edge) for edge in hist_edges],
+                    'Counts': [int(count) for count in hist_counts],
+                },
+            })
+            for q, values_q in extra.items():
+                result[f"P{_label(q)}DaysInPhase"] = float(values_q[i])
+            results.append(result)
+        return results
+
+
+class PhaseDurationCache:
+    """TTL cache of PhaseDurations keyed by (program_id, project_status)."""
+
+    def __init__(self, ttl=PHASE_STATS_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, load):
+        """Return the cached PhaseDurations for key, calling load() to build it when missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] < self.ttl:
+                return entry[1]
+        durations = PhaseDurations(load())
+        with self._lock:
+            self._entries[key] = (time.monotonic(), durations)
+        return durations
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def parse_percentiles(value):
+    """Parse a comma-separated percentile list such as '75,90,95'; raises ValueError."""
+    if not value:
+        return DEFAULT_PERCENTILES
+    percentiles = []
+    for part in value.split(','):
+        q = float(part)
+        if not 0 <= q <= 100:
+            raise ValueError(f"Percentile {part} is outside 0-100")
+        percentiles.append(q)
+    return tuple(percentiles)
+
+
+def _label(q):
+    return str(int(q)) if float(q).is_integer() else str(q).replace('.', '_')
+
+
+PHASE_DURATIONS = PhaseDurationCache()
@@ -0,0 +1,115 @@
+from .derived import DerivedStore, after_watermark, watermark_params, REFRESH_BATCH_SIZE
+
+
+def parse_transition(text):
+    """Return (Direction, ByUser) for a promote/demote Activity text.
+
+    ByUser mirrors the old SQL parsing:
+    SUBSTRING_INDEX(SUBSTRING_INDEX(Text, ' this project', 1), '>', -1)
+    """
+    lowered = text.lower()
+    direction = 'Promotion' if 'promoted this project' in lowered else 'Demotion'
+    by_user = text.split(' this project', 1)[0].rsplit('>', 1)[-1]
+    return direction, by_user
+
+
+class PhaseTransitionStore(DerivedStore):
+    """PhaseTransition table: one structured row per project promotion or demotion.
+
+    Built once from the "promoted/demoted this project" Activity rows and then
+    extended from a (CreatedAt, ActivityId) watermark. NextTransitionAt is the
+    project's following transition (LEAD over TransitionAt) and is recomputed for
+    every project that receives new rows.
+    """
+
+    name = 'PhaseTransition'
+    ddl = ["""
+        CREATE TABLE IF NOT EXISTS cleantranscrm.PhaseTransition (
+            ActivityId INT NOT NULL PRIMARY KEY,
+            ProjectId INT NOT NULL,
+            PhaseId INT NULL,
+            TransitionAt DATETIME NOT NULL,
+            Direction VARCHAR(16) NOT NULL,
+            ByUser VARCHAR(255) NULL,
+            NextTransitionAt DATETIME NULL,
+            KEY IX_PhaseTransition_Project (ProjectId, TransitionAt),
+            KEY IX_PhaseTransition_Phase (PhaseId, TransitionAt)
+        )
+    """]
+
+    def reset(self, conn):
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM cleantranscrm.PhaseTransition")
+        cursor.close()
+
+    def sync(self, conn, last_created_at, last_id):
+        watermark = None
+        touched_projects = set()
+        cursor = conn.cursor()
+        while True:
+            cursor.execute(f"""
+                SELECT a.ActivityId, a.CreatedAt, a.ProjectId, a.PhaseId, a.`Text`
+                FROM cleantranscrm.Activity a
+                WHERE {after_watermark('a.CreatedAt', 'a.ActivityId')}
+                AND (a.Text LIKE '%%promoted this project%%' OR a.Text LIKE '%%demoted this project%%')
+                ORDER BY a.CreatedAt, a.ActivityId
+                LIMIT %s
+            """, watermark_params(last_created_at, last_id) + (REFRESH_BATCH_SIZE,))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            entries = []
+            for activity_id, created_at, project_id, phase_id, text in rows:
+                if project_id is None:
+                    continue
+                direction, by_user = parse_transition(text)
+                entries.append((activity_id, project_id, phase_id, created_at, direction, by_user))
+                touched_projects.add(project_id)
+            if entries:
+                cursor.executemany("""
+                    INSERT IGNORE INTO cleantranscrm.PhaseTransition
+                        (ActivityId, ProjectId, PhaseId, TransitionAt, Direction, ByUser)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, entries)
+            last_id, last_created_at = rows[-1][0], rows[-1][1]
+            watermark = (last_created_at, last_id)
+            if len(rows) < REFRESH_BATCH_SIZE:
+                break
+        touched_projects = sorted(touched_projects)
+        for start in range(0, len(touched_projects), REFRESH_BATCH_SIZE):
+            batch = touched_projects[start:start + REFRESH_BATCH_SIZE]
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(f"""
+                UPDATE cleantranscrm.PhaseTransition pt
+                JOIN (
+                    SELECT ActivityId,
+                        LEAD(TransitionAt) OVER (PARTITION BY ProjectId ORDER BY TransitionAt, ActivityId) AS NextTransitionAt
+                    FROM cleantranscrm.PhaseTransition
+                    WHERE ProjectId IN ({placeholders})
+                ) n ON n.ActivityId = pt.ActivityId
+                SET pt.NextTransitionAt = n.NextTransitionAt
+            """, batch)
+        cursor.close()
+        return watermark
+
+
+PHASE_TRANSITIONS = PhaseTransitionStore()
+
+# The PhaseTransition columns derived straight from Activity, as the queries did before
+# the table existed; used while the table isn't usable
+PHASE_TRANSITION_SCAN = """(
+    SELECT a.ActivityId, a.ProjectId, a.PhaseId, a.CreatedAt AS TransitionAt,
+        CASE WHEN a.Text LIKE '%%promoted this project%%' THEN 'Promotion' ELSE 'Demotion' END AS Direction,
+        SUBSTRING_INDEX(SUBSTRING_INDEX(a.Text, ' this project', 1), '>', -1) AS ByUser,
+        LEAD(a.CreatedAt) OVER (PARTITION BY a.ProjectId ORDER BY a.CreatedAt, a.ActivityId) AS NextTransitionAt
+    FROM cleantranscrm.Activity a
+    WHERE a.ProjectId IS NOT NULL
+    AND (a.Text LIKE '%%promoted this project%%' OR a.Text LIKE '%%demoted this project%%')
+)"""
+
+
+def phase_transitions_source():
+    """FROM source for phase transitions: the PhaseTransition table, or the Activity scan when it isn't ready."""
+    if PHASE_TRANSITIONS.refresh_if_stale():
+        return "cleantranscrm.PhaseTransition"
+    return PHASE_TRANSITION_SCAN
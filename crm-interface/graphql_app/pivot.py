@@ -0,0 +1,239 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+import pandas as pd
+
+from .result_cache import tables_in
+
+# Above this many projects the scan covers the whole program instead of an IN list
+PIVOT_PROJECT_FILTER_LIMIT = 500
+
+AGGREGATIONS = ('count', 'count_true', 'first')
+
+
+class PivotColumn:
+    """One output column: which attribute values feed it and how they are aggregated.
+
+    agg is 'count' (non-NULL values), 'count_true' (values equal to 'True') or 'first'
+    (first non-NULL value). Labels compare like MySQL's default collation, ignoring
+    case and trailing spaces.
+    """
+
+    def __init__(self, name, agg, label=None, phase_id=None, control_type=None, service_types=True):
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"agg must be one of {', '.join(AGGREGATIONS)}")
+        self.name = name
+        self.agg = agg
+        self.label = label
+        self.phase_id = phase_id
+        self.control_type = control_type
+        self.service_types = service_types
+
+
+def _fold(values):
+    return values.astype(object).where(values.notna(), '').astype(str).str.rstrip().str.lower()
+
+
+class AttributePivot:
+    """Reads (ProjectId, attribute, Value) rows for a program in one scan and pivots them wide.
+
+    Replaces the pattern of LEFT JOINing the same ProgramAttribute / ProjectAttributeValue
+    subquery once per label: the rows every column needs are fetched together and each
+    column is a masked groupby over them. `index` is ('ProjectId',) for one row per
+    project or ('ProjectId', 'PhaseId') for one row per project and phase.
+    """
+
+    def __init__(self, program_id, columns, index=('ProjectId',)):
+        self.program_id = program_id
+        self.columns = list(columns)
+        self.index = list(index)
+
+    def sql(self, project_ids=None):
+        labels = sorted({c.label for c in self.columns if c.label is not None})
+        phases = sorted({c.phase_id for c in self.columns if c.phase_id is not None and c.label is None})
+        params = {'program_id': self.program_id}
+        selectors = []
+        if labels:
+            selectors.append("pa.Label IN ({})".format(', '.join(f"%(label_{i})s" for i in range(len(labels)))))
+            params.update({f"label_{i}": label for i, label in enumerate(labels)})
+        if phases:
+            selectors.append("pa.PhaseId IN ({})".format(', '.join(f"%(phase_{i})s" for i in range(len(phases)))))
+            params.update({f"phase_{i}": phase for i, phase in enumerate(phases)})
+        project_filter = ""
+        if project_ids is not None:
+            project_filter = "AND pav.ProjectId IN ({})".format(', '.join(f"%(project_{i})s" for i in range(len(project_ids))))
+            params.update({f"project_{i}": int(project_id) for i, project_id in enumerate(project_ids)})
+        sql = f"""
+            SELECT pav.ProjectId, pa.PhaseId, pa.Label, pa.ControlType, pav.Value,
+                pa.ProgramAttributeId IN (SELECT ProgramAttributeId FROM cleantranscrm.TeasServiceType) AS IsServiceType
+            FROM cleantranscrm.ProgramAttribute pa
+            JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
+            WHERE pa.ProgramId = %(program_id)s AND ({' OR '.join(selectors) or '1=1'})
+            {project_filter}
+            ORDER BY pav.ProjectId, pa.ProgramAttributeId
+        """
+        return sql, params
+
+    def select(self, names):
+        """Pivot over just the named columns (the scan then only reads their attributes)."""
+        return AttributePivot(self.program_id, [c for c in self.columns if c.name in names], self.index)
+
+    @property
+    def tables(self):
+        return tables_in(self.sql()[0])
+
+    def pivot(self, values):
+        """Wide DataFrame indexed by self.index with one column per PivotColumn."""
+        if values.empty or 'Value' not in values.columns:
+            return pd.DataFrame(columns=[c.name for c in self.columns], index=pd.MultiIndex.from_tuples([], names=self.index))
+        labels = _fold(values['Label'])
+        control_types = _fold(values['ControlType'])
+        service_types = values['IsServiceType'].fillna(0).astype(bool)
+        present = values['Value'].notna()
+        wide = []
+        for column in self.columns:
+            mask = pd.Series(True, index=values.index)
+            if column.label is not None:
+                mask &= labels == column.label.rstrip().lower()
+            if column.phase_id is not None:
+                mask &= values['PhaseId'] == column.phase_id
+            if column.control_type is not None:
+                mask &= control_types == column.control_type.lower()
+            if not column.service_types:
+                mask &= ~service_types
+            keys = [values.loc[mask, k] for k in self.index]
+            if column.agg == 'count':
+                aggregated = present[mask].groupby(keys).sum()
+            elif column.agg == 'count_true':
+                aggregated = (_fold(values.loc[mask, 'Value']) == 'true').groupby(keys).sum()
+            else:
+                kept = mask & present
+                aggregated = values.loc[kept, 'Value'].groupby([values.loc[kept, k] for k in self.index]).first()
+            wide.append(aggregated.rename(column.name))
+        return pd.concat(wide, axis=1)
+
+    def fetch(self, read, project_ids=None):
+        """Run the scan through read(sql, params) and pivot it.
+
+        project_ids narrows the scan to those projects when there are few of them.
+        """
+        if project_ids is not None and len(project_ids) > PIVOT_PROJECT_FILTER_LIMIT:
+            project_ids = None
+        if project_ids is not None and not len(project_ids):
+            return self.pivot(pd.DataFrame())
+        sql, params = self.sql(project_ids)
+        return self.pivot(read(sql, params))
+
+    def join(self, df, read, on=None):
+        """Left-join the pivoted columns onto df; `on` lists df's columns matching self.index."""
+        on = list(on or self.index)
+        if df.empty:
+            return df.reindex(columns=list(df.columns) + [c.name for c in self.columns])
+        project_ids = None
+        if len(df) <= PIVOT_PROJECT_FILTER_LIMIT:
+            project_ids = sorted({int(project_id) for project_id in df[on[0]].dropna()})
+        wide = self.fetch(read, project_ids)
+        if wide.empty:
+            return df.assign(**{c.name: None for c in self.columns})
+        wide = wide.reset_index()
+        wide.columns = on + [c.name for c in self.columns]
+        return df.merge(wide, how='left', on=on)
+
+
+def _whole(values):
+    """Integer column when nothing is missing, else floats with NaN, like read_sql returns."""
+    return values.astype('int64') if values.notna().all() else values.astype(float)
+
+
+def _percent(completed, selected):
+    # 100.0 * completed / selected rounded like MySQL's DECIMAL division and ROUND(x, 2)
+    if pd.isna(selected) or selected == 0:
+        return None
+    exact = Decimal(100) * Decimal(int(completed)) / Decimal(int(selected))
+    return exact.quantize(Decimal('0.00001'), ROUND_HALF_UP).quantize(Decimal('0.01'), ROUND_HALF_UP)
+
+
+def _usc(value):
+    folded = None if value is None or pd.isna(value) else str(value).rstrip().lower()
+    return {'true': 'True', 'false': 'False'}.get(folded, 'None')
+
+
+def service_progress(df):
+    """Derived service counts from ServiceSelectionCount / ServicesCompleted / ServicesStarted."""
+    selected = df['ServiceSelectionCount'].astype(float)
+    completed = df['ServicesCompleted'].astype(float).fillna(0)
+    started = df['ServicesStarted'].astype(float).fillna(0)
+    open_services = selected - completed
+    not_ready = open_services - (started - completed)
+    df['USC'] = df['USC'].map(_usc)
+    df['TotalServicesSelected'] = _whole(selected)
+    df['ServicesCompleted'] = completed.astype('int64')
+    df['ServicesInProgress'] = (started - completed).astype('int64')
+    df['OpenServices'] = _whole(open_services)
+    df['ServicesNotReady'] = _whole(not_ready.where(not_ready.isna() | (not_ready >= 0), 0))
+    df['PercentCompleted'] = [_percent(c, s) for c, s in zip(completed, selected)]
+    return df.drop(columns=['ServiceSelectionCount', 'ServicesStarted'])
+
+
+# Per-project service counts and milestone values for the summary dashboard
+SUMMARY_PIVOT = AttributePivot(16, [
+    PivotColumn('ServiceSelectionCount', 'count_true', phase_id=2, service_types=False),
+    PivotColumn('ServicesCompleted', 'count', label='complete', control_type='date', service_types=False),
+    PivotColumn('ServicesStarted', 'count', label='Service Start Date', control_type='date', service_types=False),
+    PivotColumn('USC', 'first', label='USC?'),
+    PivotColumn('SubmissionDate', 'first', label='Submission Date'),
+    PivotColumn('VettingCall', 'first', label='Vetting Call'),
+    PivotColumn('ConsultationCall', 'first', label='Consultation Call'),
+])
+
+# The GraphQL projectOverview counts, which don't leave out the TeasServiceType attributes
+PROJECT_OVERVIEW_PIVOT = AttributePivot(16, [
+    PivotColumn('ServiceSelectionCount', 'count_true', phase_id=2),
+    PivotColumn('ServicesCompleted', 'count', label='complete', control_type='date'),
+    PivotColumn('ServicesStarted', 'count', label='Service Start Date', control_type='date'),
+    PivotColumn('USC', 'first', label='USC?'),
+])
+
+# Milestone dates of each service phase, one row per project and phase
+SERVICE_DATES_PIVOT = AttributePivot(16, [
+    PivotColumn('ServiceStartDate', 'first', label='Service Start Date', control_type='date'),
+    PivotColumn('FollowUpDate', 'first', label='Follow Up', control_type='date'),
+    PivotColumn('CompleteDate', 'first', label='Complete', control_type='date'),
+], index=('ProjectId', 'PhaseId'))
+
+
+def service_status(df):
+    status = pd.Series('Backlog', index=df.index, dtype=object)
+    start, follow_up, complete = df['ServiceStartDate'].notna(), df['FollowUpDate'].notna(), df['CompleteDate'].notna()
+    status[start] = 'In Progress'
+    status[~follow_up & ~start] = 'Ready to Start'
+    status[follow_up & ~start] = 'Waiting on Customer'
+    status[complete] = 'Completed'
+    return status
+
+
+def build_summary(df, read):
+    return service_progress(SUMMARY_PIVOT.join(df, read))
+
+
+def build_project_service(df, read):
+    df = SERVICE_DATES_PIVOT.join(df, read, on=['ProjectId', 'ServicePhaseId'])
+    if not df.empty:
+        df['Status'] = service_status(df)
+    return df.drop(columns=['ServicePhaseId'], errors='ignore')
+
+
+# QUERIES entries whose SQL returns the base rows and whose attribute columns come from a pivot
+PIVOT_VIEWS = {
+    'summary': (build_summary, SUMMARY_PIVOT),
+    'project-service': (build_project_service, SERVICE_DATES_PIVOT),
+}
+
+
+def build_view(query_name, df, read):
+    build, _ = PIVOT_VIEWS[query_name]
+    return build(df, read)
+
+
+def view_tables(query_name):
+    """Tables a pivot view reads besides its base query (for result cache tags)."""
+    return PIVOT_VIEWS[query_name][1].tables if query_name in PIVOT_VIEWS else set()
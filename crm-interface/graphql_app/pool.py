@@ -0,0 +1,190 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pymysql
+from dotenv import load_dotenv
+from flask import g, has_app_context
+
+# Load environment variables from .env file
+load_dotenv(verbose=True, override=True)
+
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+POOL_RECYCLE = float(os.getenv('DB_POOL_RECYCLE', 1800))
+POOL_PING_AFTER = float(os.getenv('DB_POOL_PING_AFTER', 30))
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+class PooledConnection:
+    """Proxy around a raw pymysql connection that returns it to the pool on close()."""
+
+    def __init__(self, pool, raw, request_scoped=False):
+        self._pool = pool
+        self._raw = raw
+        self._request_scoped = request_scoped
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        # Request-scoped leases are shared by every helper in the request and
+        # are handed back by the teardown hook, so handlers closing them is a no-op.
+        if self._request_scoped:
+            return
+        self.release()
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._pool.release(self._raw)
+
+
+class ConnectionPool:
+    """Bounded pool of pymysql connections with health-checked checkout and idle recycling."""
+
+    def __init__(self, size=POOL_SIZE, timeout=POOL_TIMEOUT, recycle=POOL_RECYCLE, ping_after=POOL_PING_AFTER):
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+        self._idle = deque()  # (raw connection, last_used_at)
+        self._created_at = {}
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            'created': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'recycled': 0,
+            'failed_health_checks': 0,
+        }
+
+    def _connect(self):
+        raw = pymysql.connect(
+            host=os.getenv('HOST'),
+            user=os.getenv('USER'),
+            password=os.getenv('PASSWORD'),
+            database=os.getenv('DATABASE')
+        )
+        self._created_at[id(raw)] = time.monotonic()
+        return raw
+
+    def _discard(self, raw):
+        self._created_at.pop(id(raw), None)
+        try:
+            raw.close()
+        except Exception:
+            pass  # Ignore errors when closing an already-closed connection
+
+    def _is_healthy(self, raw, last_used_at):
+        """Recycle connections past their lifetime and ping ones that sat idle."""
+        now = time.monotonic()
+        if now - self._created_at.get(id(raw), now) > self.recycle:
+            self._stats['recycled'] += 1
+            return False
+        if now - last_used_at > self.ping_after:
+            try:
+                raw.ping(reconnect=False)
+            except Exception:
+                self._stats['failed_health_checks'] += 1
+                return False
+        return True
+
+    def acquire(self):
+        """Check out a healthy raw connection, opening a new one while under the size bound."""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                while self._idle:
+                    raw, last_used_at = self._idle.pop()
+                    if self._is_healthy(raw, last_used_at):
+                        self._in_use += 1
+                        self._stats['checkouts'] += 1
+                        return raw
+                    self._discard(raw)
+                if self._in_use < self.size:
+                    self._in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeout(f"No database connection available after {self.timeout}s")
+                self._stats['waits'] += 1
+                self._cond.wait(remaining)
+        # Open the new connection outside the lock so slow handshakes don't block releases
+        try:
+            raw = self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats['created'] += 1
+            self._stats['checkouts'] += 1
+        return raw
+
+    def release(self, raw):
+        """Return a connection to the pool, ending any open transaction first."""
+        try:
+            raw.rollback()
+            healthy = raw.open
+        except Exception:
+            healthy = False
+        with self._cond:
+            self._in_use -= 1
+            if healthy:
+                self._idle.append((raw, time.monotonic()))
+            else:
+                self._discard(raw)
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return dict(self._stats, size=self.size, in_use=self._in_use, idle=len(self._idle))
+
+
+pool = ConnectionPool()
+
+
+@contextmanager
+def connection():
+    """Check out a pooled connection for the duration of a with-block (safe in worker threads)."""
+    conn = PooledConnection(pool, pool.acquire())
+    try:
+        yield conn
+    finally:
+        conn.release()
+
+
+def get_request_connection():
+    """Return the connection bound to the current request, checking one out on first use.
+
+    Outside a Flask app context the caller gets its own lease, released on close().
+    """
+    if not has_app_context():
+        return PooledConnection(pool, pool.acquire())
+    conn = g.get('db_connection')
+    if conn is None:
+        conn = PooledConnection(pool, pool.acquire(), request_scoped=True)
+        g.db_connection = conn
+    return conn
+
+
+def release_request_connection(exception=None):
+    """Teardown hook: hand the request's connection back to the pool."""
+    conn = g.pop('db_connection', None)
+    if conn is not None:
+        conn.release()
+
+
+def pool_stats():
+    return pool.stats()
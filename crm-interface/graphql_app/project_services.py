@@ -0,0 +1,259 @@
+import logging
+import os
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+
+from .attribute_dates import attribute_dates_source
+from .database import fetch_data
+
+logger = logging.getLogger(__name__)
+
+PROJECT_SERVICES_TTL = float(os.getenv('PROJECT_SERVICES_TTL', 60))
+
+# One row per project and selectable service (the projectServices shape), plus the
+# columns the dashboard views filter and sort on. The Service Start Date join keeps
+# non-ISO values; ServiceStartIsoTimestamp tells them apart.
+PROJECT_SERVICES_QUERY = """SELECT
+            p.ProjectNumber,
+            p.ProjectId,
+            tst.PhaseId,
+            p.Name as 'ProjectName',
+            o.Name AS 'OrganizationName',
+            o.OrganizationId,
+            tst2.Name AS 'CoreName',
+            pa.Label AS 'ServiceName',
+            A.Value AS 'ServiceStartDate',
+            B.Value AS 'FollowUpDate',
+            C.Value AS 'CompleteDate',
+            COALESCE(activity.TotalDurationMins, 0) AS 'TotalDurationMins',
+            COALESCE(activity.LatestActivity, 'No recorded activity yet') as 'LatestActivity',
+            activity.CreatedAt,
+            COALESCE(ac.TotalRequired, 0) AS 'TotalRequired',
+            COALESCE(ac.FilledCount, 0) AS 'FilledCount',
+            pal.Value = 'True' AS 'Selected',
+            A.DateValue AS 'ServiceStartDateValue',
+            A.IsoTimestamp AS 'ServiceStartIsoTimestamp',
+            B.DateValue AS 'FollowUpDateValue',
+            pp.SortOrder AS 'PhaseSortOrder',
+            pa.SortOrder AS 'ServiceSortOrder'
+            FROM cleantranscrm.TeasSupportType tst
+            LEFT JOIN cleantranscrm.TeasServiceType tst2 ON CAST(tst2.TeasServiceTypeId AS UNSIGNED) = CAST(tst.TeasServiceTypeId AS UNSIGNED)
+            LEFT JOIN cleantranscrm.ProjectAttributeValue pal ON pal.ProgramAttributeId = CAST(tst.ProgramAttributeId AS UNSIGNED)
+            LEFT JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramAttributeId = pal.ProgramAttributeId
+            LEFT JOIN cleantranscrm.`Project` p ON p.ProjectId = pal.ProjectId
+            LEFT JOIN cleantranscrm.Organization o ON o.OrganizationId = p.OrganizationId 
+            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = pa.PhaseId AND pp.ProgramId = pa.ProgramId
+            LEFT JOIN cleantranscrm.SelectOption so ON pa.Source = so.SelectControlId
+            AND pa.ControlType = 'select'
+            AND CAST(pal.Value AS UNSIGNED) = so.OptionValue
+            LEFT JOIN (
+                SELECT 
+                    ad.ProjectId,
+                    tst.ProgramAttributeId,
+                    ad.Value,
+                    ad.DateValue,
+                    ad.IsoTimestamp
+                FROM cleantranscrm.ProgramAttribute pa
+                JOIN cleantranscrm.AttributeDate ad ON ad.ProgramAttributeId = pa.ProgramAttributeId
+                LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId
+                WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Service Start Date'
+                ) A ON A.projectid = pal.ProjectId AND A.programattributeid = tst.programattributeid
+            LEFT JOIN (
+                SELECT 
+                    ad.ProjectId,
+                    tst.ProgramAttributeId,
+                    ad.Value,
+                    ad.DateValue,
+                    ad.IsoTimestamp
+                FROM cleantranscrm.ProgramAttribute pa
+                JOIN cleantranscrm.AttributeDate ad ON ad.ProgramAttributeId = pa.ProgramAttributeId
+                LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId
+                WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Follow Up'
+                ) B ON B.projectid = pal.ProjectId AND B.programattributeid = tst.programattributeid
+            LEFT JOIN (
+                SELECT 
+                    ad.ProjectId,
+                    tst.ProgramAttributeId,
+                    ad.Value,
+                    ad.DateValue,
+                    ad.IsoTimestamp
+                FROM cleantranscrm.ProgramAttribute pa
+                JOIN cleantranscrm.AttributeDate ad ON ad.ProgramAttributeId = pa.ProgramAttributeId
+                LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId
+                WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Complete'
+                ) C ON C.projectid = pal.ProjectId AND C.programattributeid = tst.programattributeid
+            LEFT JOIN (
+            SELECT 
+                projectid,
+                phaseid,
+                MAX(a.ActivityId) as 'MaxId' ,
+                SUM(a.Duration) as 'TotalDurationMins',
+                MAX(a.`Text`) as 'LatestActivity',
+                MAX(a.CreatedAt) as 'CreatedAt'
+            FROM cleantranscrm.Activity a
+            GROUP BY projectid, phaseid
+            ) activity on activity.projectid = pal.ProjectId AND activity.phaseid = tst.PhaseId
+            LEFT JOIN
+        (SELECT p.ProjectNumber,
+                p.ProjectId,
+                pp.Name AS ServiceName,
+                COUNT(DISTINCT pal.ProgramAttributeId) AS TotalRequired,
+                SUM(CASE
+                        WHEN pal.Value IS NOT NULL THEN 1
+                        ELSE 0
+                    END) AS FilledCount
+        FROM cleantranscrm.Project p
+        INNER JOIN
+            (SELECT p.ProjectId,
+                    p.CurrentPhaseId AS CurrentProjectPhase,
+                    a.ProgramAttributeId,
+                    a.ProgramId,
+                    a.PhaseId,
+                    a.SortOrder,
+                    a.ControlName,
+                    a.ControlType,
+                    a.ValueType,
+                    a.ReadOnly,
+                    a.Source,
+                    a.Required,
+                    a.Label,
+                    a.Description,
+                    a.IsGatingItem,
+                    a.IsDocument,
+                    a.AssignedUserUserId,
+                    a.TableId,
+                    v.Value,
+                    v.UpdatedAt,
+                    v.UpdatedBy
+            FROM cleantranscrm.ProgramAttribute AS a
+            INNER JOIN cleantranscrm.Project AS p ON a.ProgramId = p.ProgramId
+            LEFT OUTER JOIN cleantranscrm.ProjectAttributeValue AS v ON v.ProgramAttributeId = a.ProgramAttributeId
+            AND v.ProjectId = p.ProjectId) pal ON pal.ProjectId = p.ProjectId
+        LEFT JOIN cleantranscrm.ProgramPhase pp ON pal.PhaseId = pp.PhaseId
+        AND pal.ProgramId = pp.ProgramId
+        WHERE pal.ProgramId = 16
+            AND p.Deleted = 0
+            AND pal.Required = 1
+        GROUP BY p.ProjectNumber,
+                    p.ProjectId,
+                    pp.Name) ac ON ac.projectid = pal.ProjectId
+        AND ac.ServiceName = pa.Label
+            WHERE
+            pal.ProjectId IN (SELECT ProjectId FROM cleantranscrm.`Project` WHERE ProgramId = 16)
+            AND pa.PhaseId = 2 AND pa.ProgramId = 16
+            GROUP BY p.ProjectNumber, tst2.Name, pa.Label
+            ORDER BY B.DateValue ASC"""
+
+
+def _after_today(values):
+    return values > pd.Timestamp(date.today())
+
+
+def _before_today(values):
+    return values < pd.Timestamp(date.today())
+
+
+def _iso_start_dates(df):
+    # The views that used to join only ISO service start dates show the rest as NULL
+    df['ServiceStartDate'] = df['ServiceStartDate'].where(df['ServiceStartIsoTimestamp'], None)
+    return df
+
+
+def all_services(df):
+    return _iso_start_dates(df.copy())
+
+
+def follow_up(df):
+    rows = df[df['Selected'] & _before_today(df['FollowUpDateValue']) & df['CompleteDate'].isna()]
+    return _iso_start_dates(rows.copy())
+
+
+def services_started(df):
+    waiting = _after_today(df['FollowUpDateValue']) | df['FollowUpDate'].isna()
+    rows = df[df['Selected'] & df['CompleteDate'].isna() & waiting & df['ServiceStartIsoTimestamp']]
+    return rows.sort_values('ServiceStartDateValue', kind='stable', na_position='first')
+
+
+def not_started(df):
+    waiting = df['FollowUpDate'].isna() | _after_today(df['FollowUpDateValue'])
+    rows = df[df['Selected'] & df['ServiceStartDate'].isna() & waiting]
+    return rows.sort_values(['ProjectNumber', 'PhaseSortOrder', 'ServiceSortOrder'], kind='stable', na_position='first')
+
+
+def completed(df):
+    return df[df['Selected'] & df['CompleteDate'].notna()].copy()
+
+
+# View name -> filter over the base frame; each returns a new DataFrame the caller may modify.
+# The base is ordered by FollowUpDateValue, so views with that order don't re-sort.
+PROJECT_SERVICE_VIEWS = {
+    'all': all_services,
+    'follow_up': follow_up,
+    'services_started': services_started,
+    'not_started': not_started,
+    'completed': completed,
+}
+
+
+class ProjectServicesCache:
+    """Process-wide copy of the PROJECT_SERVICES_QUERY result shared by the dashboard views.
+
+    The query runs at most once every `ttl` seconds (or after clear()); each view is a
+    pandas filter over the cached frame with the WHERE / ORDER BY its resolver used to
+    send to MySQL, compared against today's date at read time. Readers keep using the
+    previous frame while a reload runs.
+    """
+
+    def __init__(self, ttl=PROJECT_SERVICES_TTL):
+        self.ttl = ttl
+        self._frame = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def _fresh(self):
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def _load(self):
+        query = PROJECT_SERVICES_QUERY.replace("cleantranscrm.AttributeDate", attribute_dates_source())
+        df = fetch_data(query)
+        for column in ('ServiceStartDateValue', 'FollowUpDateValue'):
+            df[column] = pd.to_datetime(df[column])
+        for column in ('Selected', 'ServiceStartIsoTimestamp'):
+            df[column] = df[column].fillna(0).astype(bool)
+        return df
+
+    def frame(self):
+        """The base DataFrame, reloading it when older than ttl. Don't modify it."""
+        if self._fresh():
+            return self._frame
+        # The first load makes callers wait; later reloads are skipped while one runs
+        if not self._lock.acquire(blocking=self._frame is None):
+            return self._frame
+        try:
+            if not self._fresh():
+                try:
+                    self._frame = self._load()
+                except Exception as e:
+                    if self._frame is None:
+                        raise
+                    logger.exception("Error refreshing project services: %s", e)
+                self._loaded_at = time.monotonic()
+        finally:
+            self._lock.release()
+        return self._frame
+
+    def view(self, name):
+        return PROJECT_SERVICE_VIEWS[name](self.frame())
+
+    def clear(self):
+        self._loaded_at = None
+
+    def stats(self):
+        age = None if self._loaded_at is None else time.monotonic() - self._loaded_at
+        return {'rows': None if self._frame is None else len(self._frame), 'age_seconds': age, 'ttl': self.ttl}
+
+
+PROJECT_SERVICES = ProjectServicesCache()
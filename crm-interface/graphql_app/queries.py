@@ -1,6 +1,7 @@
 # SQL queries for dashboard data
 
-QUERY_SUMMARY = """SELECT 
+QUERY_SUMMARY = """-- Project rows only; service counts, USC and milestone dates are pivoted in by pivot.SUMMARY_PIVOT
+SELECT 
         p.ProjectNumber,
         p.ProjectId,
         p.Name as 'ProjectName',
@@ -12,70 +13,12 @@ QUERY_SUMMARY = """SELECT
             ELSE ps.LongName
         END as 'ProjectStatus',
         u.ProperName as 'ProjectLead',
-        CASE
-            WHEN D.USC = 'true' THEN 'True'
-            WHEN D.USC = 'false' THEN 'False'
-            ELSE 'None'
-        END AS 'USC',
-        F.SubmissionDate,
-        G.VettingCall,
-        H.ConsultationCall,
-        A.ServiceSelectionCount as 'TotalServicesSelected',
-        COALESCE(B.ServicesCompleted, 0) as 'ServicesCompleted',
-        COALESCE(C.ServicesStarted, 0) - COALESCE(B.ServicesCompleted, 0) as 'ServicesInProgress',
-        (A.ServiceSelectionCount - COALESCE(B.ServicesCompleted, 0)) as 'OpenServices',
-        CASE 
-            WHEN A.ServiceSelectionCount - COALESCE(B.ServicesCompleted, 0) - 
-                (COALESCE(C.ServicesStarted, 0) - COALESCE(B.ServicesCompleted, 0)) < 0 THEN 0
-            ELSE A.ServiceSelectionCount - COALESCE(B.ServicesCompleted, 0) - 
-                (COALESCE(C.ServicesStarted, 0) - COALESCE(B.ServicesCompleted, 0))
-        END AS 'ServicesNotReady',
-        CAST(ROUND((100.0 * (COALESCE(B.ServicesCompleted, 0))/A.ServiceSelectionCount),2) as DECIMAL(7,2)) as 'PercentCompleted',
         COALESCE(E.TotalDurationMins, 0) as 'TotalDurationMins'
     FROM cleantranscrm.Project p
     LEFT JOIN cleantranscrm.ProjectStatus ps ON ps.ProjectStatusId = p.Status
     LEFT JOIN cleantranscrm.ProjectRole pr ON pr.ProjectId = p.ProjectId
     LEFT JOIN cleantranscrm.`User` u ON pr.UserId = u.UserId
     LEFT JOIN cleantranscrm.Organization o ON o.OrganizationId = p.OrganizationId
-    LEFT JOIN (
-        SELECT 
-            pav.ProjectId,
-            COUNT(CASE WHEN pav.Value = 'True' THEN 1 END) AS 'ServiceSelectionCount'
-        FROM cleantranscrm.ProjectAttributeValue pav
-        LEFT JOIN cleantranscrm.ProgramAttribute pa ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        WHERE pa.ProgramId = 16 AND pa.PhaseId = 2 AND pav.ProgramAttributeId not in (select programattributeid from cleantranscrm.TeasServiceType)
-        GROUP BY pav.ProjectId
-    ) A ON A.ProjectId = p.ProjectId
-    LEFT JOIN (
-        SELECT 
-            pav.projectid,
-            COUNT(CASE WHEN pav.Value IS NOT NULL THEN 1 END) AS 'ServicesCompleted'
-        FROM cleantranscrm.ProgramAttribute pa
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'complete' AND pav.Value IS NOT NULL AND pav.ProgramAttributeId not in (select programattributeid from cleantranscrm.TeasServiceType)
-        GROUP BY pav.ProjectId
-    ) B ON B.ProjectId = p.ProjectId
-    LEFT JOIN (
-        SELECT 
-            pav.projectid,
-            COUNT(CASE WHEN pav.Value IS NOT NULL THEN 1 END) AS 'ServicesStarted'
-        FROM cleantranscrm.ProgramAttribute pa
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Service Start Date' AND pav.Value IS NOT NULL AND pav.ProgramAttributeId not in (select programattributeid from cleantranscrm.TeasServiceType)
-        GROUP BY pav.ProjectId
-    ) C ON C.ProjectId = p.ProjectId
-    LEFT JOIN (
-        SELECT 
-            pav.projectid,
-            pav.Value AS 'USC'
-        FROM cleantranscrm.ProgramAttribute pa
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        WHERE pa.ProgramId = 16 AND pa.label = 'USC?' AND pav.Value IS NOT NULL
-        GROUP BY pav.ProjectId
-    ) D ON D.ProjectId = p.ProjectId
     LEFT JOIN (
         SELECT 
             p.ProjectId,
@@ -86,36 +29,6 @@ QUERY_SUMMARY = """SELECT
         WHERE a.ActivityTypeId in (1,2,3,4,5,6)
         GROUP BY p.ProjectId
     ) E ON E.ProjectId = p.ProjectId
-    LEFT JOIN (
-        SELECT 
-            pav.projectid,
-            pav.Value AS 'SubmissionDate'
-        FROM cleantranscrm.ProgramAttribute pa
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        WHERE pa.ProgramId = 16 AND pa.label = 'Submission Date' AND pav.Value IS NOT NULL
-        GROUP BY pav.ProjectId
-    ) F ON F.ProjectId = p.ProjectId
-    LEFT JOIN (
-        SELECT 
-            pav.projectid,
-            pav.Value AS 'VettingCall'
-        FROM cleantranscrm.ProgramAttribute pa
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        WHERE pa.ProgramId = 16 AND pa.label = 'Vetting Call' AND pav.Value IS NOT NULL
-        GROUP BY pav.ProjectId
-    ) G ON G.ProjectId = p.ProjectId
-    LEFT JOIN (
-        SELECT 
-            pav.projectid,
-            pav.Value AS 'ConsultationCall'
-        FROM cleantranscrm.ProgramAttribute pa
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        WHERE pa.ProgramId = 16 AND pa.label = 'Consultation Call' AND pav.Value IS NOT NULL
-        GROUP BY pav.ProjectId
-    ) H ON H.ProjectId = p.ProjectId
     WHERE p.programid = 16 and p.projectid not in (3467,3197) and p.deleted = 0"""
 
 QUERY_DURATION = """SELECT 
@@ -137,312 +50,59 @@ QUERY_DURATION = """SELECT
     group by p.ProjectId, a.PhaseId 
     ORDER BY p.ProjectId asc;"""
 
-QUERY_PROJECTS = """-- Generate a series of dates for the past 30 days
-WITH RECURSIVE DateSeries AS (
-    SELECT CURDATE() AS Date
-    UNION ALL
-    SELECT Date - INTERVAL 1 DAY
-    FROM DateSeries
-    WHERE Date > CURDATE() - INTERVAL 29 DAY
-)
+QUERY_PROJECTS = """-- Projects created per day in [start, end); empty days are zero-filled in metrics.py
 SELECT 
-    ds.Date AS LogDate,
-    COALESCE(COUNT(DISTINCT p.ProjectId), 0) AS ProjectCount
-FROM DateSeries ds
-LEFT JOIN cleantranscrm.Project p ON DATE(p.CreatedAt) = ds.Date AND p.ProgramId = 16
-WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
-GROUP BY ds.Date
-ORDER BY ds.Date;"""
+    DATE(p.CreatedAt) AS LogDate,
+    COUNT(DISTINCT p.ProjectId) AS ProjectCount
+FROM cleantranscrm.Project p
+WHERE p.ProgramId = 16
+AND p.CreatedAt >= %(start)s AND p.CreatedAt < %(end)s
+GROUP BY DATE(p.CreatedAt)
+ORDER BY LogDate;"""
 
-QUERY_PROJECTS_TREND = """-- Generate a series of dates for the past 30 days
-WITH RECURSIVE DateSeries AS (
-    SELECT CURDATE() AS Date
-    UNION ALL
-    SELECT Date - INTERVAL 1 DAY
-    FROM DateSeries
-    WHERE Date > CURDATE() - INTERVAL 29 DAY
-),
--- Query to count projects each day
-ProjectCounts AS (
-    SELECT 
-        ds.Date AS LogDate,
-        COALESCE(COUNT(DISTINCT p.ProjectId), 0) AS ProjectCount
-    FROM DateSeries ds
-    LEFT JOIN cleantranscrm.Project p ON DATE(p.CreatedAt) = ds.Date AND p.ProgramId = 16
-    WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
-    GROUP BY ds.Date
-    ORDER BY ds.Date
-),
--- Calculate the average count for the first half of the 30-day period
-FirstHalf AS (
-    SELECT AVG(ProjectCount) AS AvgFirstHalf
-    FROM ProjectCounts
-    WHERE LogDate BETWEEN CURDATE() - INTERVAL 30 DAY AND CURDATE() - INTERVAL 16 DAY
-),
--- Calculate the average count for the second half of the 30-day period
-SecondHalf AS (
-    SELECT AVG(ProjectCount) AS AvgSecondHalf
-    FROM ProjectCounts
-    WHERE LogDate BETWEEN CURDATE() - INTERVAL 15 DAY AND CURDATE()
-)
--- Determine the trend based on the averages
-SELECT 
-    CASE 
-        WHEN sh.AvgSecondHalf > fh.AvgFirstHalf THEN 'up'
-        WHEN sh.AvgSecondHalf < fh.AvgFirstHalf THEN 'down'
-        ELSE 'neutral'
-    END AS Trend,
-    CASE 
-        WHEN fh.AvgFirstHalf = 0 THEN 0
-        ELSE ROUND(((sh.AvgSecondHalf - fh.AvgFirstHalf) / fh.AvgFirstHalf) * 100, 2)
-    END AS PercentageChange
-FROM FirstHalf fh, SecondHalf sh;"""
-
-QUERY_LOGGED_ACTIVITIES = """WITH RECURSIVE DateSeries AS (
-    SELECT CURDATE() AS Date
-    UNION ALL
-    SELECT Date - INTERVAL 1 DAY
-    FROM DateSeries
-    WHERE Date > CURDATE() - INTERVAL 29 DAY
-)
+QUERY_LOGGED_ACTIVITIES = """-- Activities logged per day in [start, end); empty days are zero-filled in metrics.py
 SELECT 
-    ds.Date AS LogDate,
+    DATE(a.CreatedAt) AS LogDate,
     COUNT(a.ActivityId) AS ActivityCount
-FROM DateSeries ds
-LEFT JOIN cleantranscrm.Activity a ON DATE(a.CreatedAt) = ds.Date AND a.ProjectId in (select projectid from cleantranscrm.Project p where ProgramId = 16) 
-LEFT JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId AND p.ProgramId = 16
-WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
-GROUP BY ds.Date
-ORDER BY ds.Date;"""
-
-QUERY_LOGGED_ACTIVITIES_TREND = """-- Generate a series of dates for the past 30 days
-WITH RECURSIVE DateSeries AS (
-    SELECT CURDATE() AS Date
-    UNION ALL
-    SELECT Date - INTERVAL 1 DAY
-    FROM DateSeries
-    WHERE Date > CURDATE() - INTERVAL 29 DAY
-),
--- Query to count activities logged each day
-ActivityCounts AS (
-    SELECT 
-        ds.Date AS LogDate,
-        COALESCE(COUNT(a.ActivityId), 0) AS ActivityCount
-    FROM DateSeries ds
-    LEFT JOIN cleantranscrm.Activity a ON DATE(a.CreatedAt) = ds.Date AND a.ProjectId in (select projectid from cleantranscrm.Project p where ProgramId = 16) 
-    LEFT JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId
-    WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
-    GROUP BY ds.Date
-    ORDER BY ds.Date
-),
--- Calculate the average count for the first half of the 30-day period
-FirstHalf AS (
-    SELECT AVG(ActivityCount) AS AvgFirstHalf
-    FROM ActivityCounts
-    WHERE LogDate BETWEEN CURDATE() - INTERVAL 30 DAY AND CURDATE() - INTERVAL 16 DAY
-),
--- Calculate the average count for the second half of the 30-day period
-SecondHalf AS (
-    SELECT AVG(ActivityCount) AS AvgSecondHalf
-    FROM ActivityCounts
-    WHERE LogDate BETWEEN CURDATE() - INTERVAL 15 DAY AND CURDATE()
-)
--- Determine the trend based on the averages
-SELECT 
-    CASE 
-        WHEN sh.AvgSecondHalf > fh.AvgFirstHalf THEN 'up'
-        WHEN sh.AvgSecondHalf < fh.AvgFirstHalf THEN 'down'
-        ELSE 'neutral'
-    END AS Trend,
-    CASE 
-        WHEN fh.AvgFirstHalf = 0 THEN 0
-        ELSE ROUND(((sh.AvgSecondHalf - fh.AvgFirstHalf) / fh.AvgFirstHalf) * 100, 2)
-    END AS PercentageChange
-FROM FirstHalf fh, SecondHalf sh;"""
+FROM cleantranscrm.Activity a
+JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId AND p.ProgramId = 16
+WHERE a.CreatedAt >= %(start)s AND a.CreatedAt < %(end)s
+GROUP BY DATE(a.CreatedAt)
+ORDER BY LogDate;"""
 
-QUERY_LOGGED_TIME = """WITH RECURSIVE DateSeries AS (
-    SELECT CURDATE() AS Date
-    UNION ALL
-    SELECT Date - INTERVAL 1 DAY
-    FROM DateSeries
-    WHERE Date > CURDATE() - INTERVAL 29 DAY
-)
+QUERY_LOGGED_TIME = """-- Time logged per day in [start, end); empty days are zero-filled in metrics.py
 SELECT 
-    ds.Date AS LogDate,
+    DATE(a.CreatedAt) AS LogDate,
     COALESCE(SUM(a.Duration), 0) AS DurationTotal
-FROM DateSeries ds
-LEFT JOIN cleantranscrm.Activity a ON DATE(a.CreatedAt) = ds.Date AND a.ProjectId in (select projectid from cleantranscrm.Project p where ProgramId = 16) 
-LEFT JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId AND p.ProgramId = 16
-WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
-GROUP BY ds.Date
-ORDER BY ds.Date;"""
-
-QUERY_LOGGED_TIME_TREND = """-- Generate a series of dates for the past 30 days
-WITH RECURSIVE DateSeries AS (
-    SELECT CURDATE() AS Date
-    UNION ALL
-    SELECT Date - INTERVAL 1 DAY
-    FROM DateSeries
-    WHERE Date > CURDATE() - INTERVAL 29 DAY
-),
--- Query to count activities logged each day
-DurationTotal AS (
-    SELECT 
-    ds.Date AS LogDate,
-    COALESCE(SUM(a.Duration),0) AS DurationTotal
-FROM DateSeries ds
-LEFT JOIN cleantranscrm.Activity a ON DATE(a.CreatedAt) = ds.Date AND a.ProjectId in (select projectid from cleantranscrm.Project p where ProgramId = 16) 
-LEFT JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId AND p.ProgramId = 16
-WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
-GROUP BY ds.Date
-ORDER BY ds.Date
-),
--- Calculate the average count for the first half of the 30-day period
-FirstHalf AS (
-    SELECT AVG(DurationTotal) AS AvgFirstHalf
-    FROM DurationTotal
-    WHERE LogDate BETWEEN CURDATE() - INTERVAL 30 DAY AND CURDATE() - INTERVAL 16 DAY
-),
--- Calculate the average count for the second half of the 30-day period
-SecondHalf AS (
-    SELECT AVG(DurationTotal) AS AvgSecondHalf
-    FROM DurationTotal
-    WHERE LogDate BETWEEN CURDATE() - INTERVAL 15 DAY AND CURDATE()
-)
--- Determine the trend based on the averages
-SELECT 
-    CASE 
-        WHEN sh.AvgSecondHalf > fh.AvgFirstHalf THEN 'up'
-        WHEN sh.AvgSecondHalf < fh.AvgFirstHalf THEN 'down'
-        ELSE 'neutral'
-    END AS Trend,
-    CASE 
-        WHEN fh.AvgFirstHalf = 0 THEN 0
-        ELSE ROUND(((sh.AvgSecondHalf - fh.AvgFirstHalf) / fh.AvgFirstHalf) * 100, 2)
-    END AS PercentageChange
-FROM FirstHalf fh, SecondHalf sh;"""
-
-QUERY_ATTRIBUTES_FILLED = """WITH RECURSIVE DateSeries AS (
-    SELECT CURDATE() AS Date
-    UNION ALL
-    SELECT Date - INTERVAL 1 DAY
-    FROM DateSeries
-    WHERE Date > CURDATE() - INTERVAL 29 DAY
-)
--- Query to count attributes filled in each day
-SELECT 
-    ds.Date AS CompletionDate,
-    COALESCE(COUNT(pav.Id), 0) AS FilledCount
-FROM DateSeries ds
-LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON DATE(pav.UpdatedAt) = ds.Date and pav.ProjectId in (select projectid from cleantranscrm.Project p where ProgramId = 16) 
-WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
-GROUP BY ds.Date
-ORDER BY ds.Date;"""
-
-QUERY_ATTRIBUTES_FILLED_TREND = """WITH RECURSIVE DateSeries AS (
-    SELECT CURDATE() AS Date
-    UNION ALL
-    SELECT Date - INTERVAL 1 DAY
-    FROM DateSeries
-    WHERE Date > CURDATE() - INTERVAL 29 DAY
-),
--- Query to count attributes filled in each day
-CompletedCounts AS (
-    SELECT 
-        ds.Date AS CompletionDate,
-        COALESCE(COUNT(pav.Id), 0) AS FilledCount
-    FROM DateSeries ds
-    LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON DATE(pav.UpdatedAt) = ds.Date and pav.ProjectId in (select projectid from cleantranscrm.Project p where ProgramId = 16) 
-    WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
-    GROUP BY ds.Date
-    ORDER BY ds.Date
-),
--- Calculate the average count for the first half of the 30-day period
-FirstHalf AS (
-    SELECT AVG(FilledCount) AS AvgFirstHalf
-    FROM CompletedCounts
-    WHERE CompletionDate BETWEEN CURDATE() - INTERVAL 30 DAY AND CURDATE() - INTERVAL 16 DAY
-),
--- Calculate the average count for the second half of the 30-day period
-SecondHalf AS (
-    SELECT AVG(FilledCount) AS AvgSecondHalf
-    FROM CompletedCounts
-    WHERE CompletionDate BETWEEN CURDATE() - INTERVAL 15 DAY AND CURDATE()
-)
--- Determine the trend based on the averages
-SELECT 
-    CASE 
-        WHEN sh.AvgSecondHalf > fh.AvgFirstHalf THEN 'up'
-        WHEN sh.AvgSecondHalf < fh.AvgFirstHalf THEN 'down'
-        ELSE 'neutral'
-    END AS Trend,
-    CASE 
-        WHEN fh.AvgFirstHalf = 0 THEN 0
-        ELSE ROUND(((sh.AvgSecondHalf - fh.AvgFirstHalf) / fh.AvgFirstHalf) * 100, 2)
-    END AS PercentageChange
-FROM FirstHalf fh, SecondHalf sh;"""
+FROM cleantranscrm.Activity a
+JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId AND p.ProgramId = 16
+WHERE a.CreatedAt >= %(start)s AND a.CreatedAt < %(end)s
+GROUP BY DATE(a.CreatedAt)
+ORDER BY LogDate;"""
 
-QUERY_SERVICES_COMPLETED = """WITH RECURSIVE DateSeries AS (
-    SELECT CURDATE() AS Date
-    UNION ALL
-    SELECT Date - INTERVAL 1 DAY
-    FROM DateSeries
-    WHERE Date > CURDATE() - INTERVAL 29 DAY
-)
+QUERY_ATTRIBUTES_FILLED = """-- Attribute values updated per day in [start, end); empty days are zero-filled in metrics.py
 SELECT 
-    ds.Date AS CompletionDate,
-    COALESCE(COUNT(DISTINCT CONCAT(pav.projectid, '-', pav.ProgramAttributeId)), 0) AS CompletedCount
-FROM DateSeries ds
-LEFT JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Complete'
-LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId AND DATE(pav.Value) = ds.Date AND pav.ProgramAttributeId not in (select programattributeid from cleantranscrm.TeasServiceType)
-WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
-GROUP BY ds.Date
-ORDER BY ds.Date;"""
+    DATE(pav.UpdatedAt) AS CompletionDate,
+    COUNT(pav.Id) AS FilledCount
+FROM cleantranscrm.ProjectAttributeValue pav
+JOIN cleantranscrm.Project p ON p.ProjectId = pav.ProjectId AND p.ProgramId = 16
+WHERE pav.UpdatedAt >= %(start)s AND pav.UpdatedAt < %(end)s
+GROUP BY DATE(pav.UpdatedAt)
+ORDER BY CompletionDate;"""
 
-QUERY_SERVICES_COMPLETED_TREND = """-- Generate a series of dates for the past 30 days
-WITH RECURSIVE DateSeries AS (
-    SELECT CURDATE() AS Date
-    UNION ALL
-    SELECT Date - INTERVAL 1 DAY
-    FROM DateSeries
-    WHERE Date > CURDATE() - INTERVAL 29 DAY
-),
--- Query to count completed services each day
-CompletedCounts AS (
-    SELECT 
-        ds.Date AS CompletionDate,
-        COALESCE(COUNT(DISTINCT CONCAT(pav.projectid, '-', pav.ProgramAttributeId)), 0) AS CompletedCount
-    FROM DateSeries ds
-    LEFT JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Complete'
-    LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId AND DATE(pav.Value) = ds.Date AND pav.ProgramAttributeId not in (select programattributeid from cleantranscrm.TeasServiceType)
-    WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
-    GROUP BY ds.Date
-    ORDER BY ds.Date
-),
--- Calculate the average count for the first half of the 30-day period
-FirstHalf AS (
-    SELECT AVG(CompletedCount) AS AvgFirstHalf
-    FROM CompletedCounts
-    WHERE CompletionDate BETWEEN CURDATE() - INTERVAL 30 DAY AND CURDATE() - INTERVAL 16 DAY
-),
--- Calculate the average count for the second half of the 30-day period
-SecondHalf AS (
-    SELECT AVG(CompletedCount) AS AvgSecondHalf
-    FROM CompletedCounts
-    WHERE CompletionDate BETWEEN CURDATE() - INTERVAL 15 DAY AND CURDATE()
-)
--- Determine the trend based on the averages and calculate the percentage change
+QUERY_SERVICES_COMPLETED = """-- Services completed per day in [start, end); empty days are zero-filled in metrics.py
+-- Value holds ISO date strings, so the string range selects the same rows as DATE(Value)
 SELECT 
-    CASE 
-        WHEN sh.AvgSecondHalf > fh.AvgFirstHalf THEN 'up'
-        WHEN sh.AvgSecondHalf < fh.AvgFirstHalf THEN 'down'
-        ELSE 'neutral'
-    END AS Trend,
-    CASE 
-        WHEN fh.AvgFirstHalf = 0 THEN 0
-        ELSE ROUND(((sh.AvgSecondHalf - fh.AvgFirstHalf) / fh.AvgFirstHalf) * 100, 2)
-    END AS PercentageChange
-FROM FirstHalf fh, SecondHalf sh;"""
+    DATE(pav.Value) AS CompletionDate,
+    COUNT(DISTINCT pav.ProjectId, pav.ProgramAttributeId) AS CompletedCount
+FROM cleantranscrm.ProgramAttribute pa
+JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
+WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Complete'
+AND pa.ProgramAttributeId NOT IN (SELECT ProgramAttributeId FROM cleantranscrm.TeasServiceType)
+AND pav.Value >= %(start)s AND pav.Value < %(end)s
+AND DATE(pav.Value) IS NOT NULL
+GROUP BY DATE(pav.Value)
+ORDER BY CompletionDate;"""
 
 QUERY_PROJECT_SERVICE_ATTRIBUTES = """SELECT 
         p.ProjectNumber,
@@ -570,10 +230,12 @@ QUERY_PROJECT_SERVICE_ATTRIBUTES = """SELECT
     ORDER BY
         p.ProjectId ASC, pal.SortOrder ASC;"""
 
-QUERY_PROJECT_SERVICE = """SELECT
+QUERY_PROJECT_SERVICE = """-- Selected services only; their milestone dates and Status come from pivot.SERVICE_DATES_PIVOT
+SELECT
         CONCAT(p.ProjectId , '-', pa.ProgramAttributeId) AS id,
 		p.ProjectNumber,
         p.ProjectId,
+        tst.PhaseId AS ServicePhaseId,
         tst2.Name as 'CoreName',
         pa.Label AS Name,
         CASE
@@ -581,16 +243,6 @@ QUERY_PROJECT_SERVICE = """SELECT
             WHEN pal.Value IS NULL THEN 'False'
             ELSE pal.Value
         END AS AttributeValue,
-        A.Value AS 'ServiceStartDate',
-        B.Value as 'FollowUpDate',
-        C.Value as 'CompleteDate',
-        CASE
-			WHEN C.Value IS NOT NULL THEN 'Completed'
-			WHEN B.Value IS NOT NULL and A.Value IS NULL THEN 'Waiting on Customer'
-			WHEN B.Value IS NULL and A.Value IS NULL THEN 'Ready to Start'
-			WHEN A.Value IS NOT NULL THEN 'In Progress'
-			ELSE 'Backlog'
-		END AS Status,
 		COALESCE(D.ActivityCount,0) as 'ActivityCount'
     FROM cleantranscrm.TeasSupportType tst
     LEFT JOIN cleantranscrm.TeasServiceType tst2 on CAST(tst2.TeasServiceTypeId AS UNSIGNED) = CAST(tst.TeasServiceTypeId AS UNSIGNED)
@@ -601,39 +253,6 @@ QUERY_PROJECT_SERVICE = """SELECT
     LEFT JOIN cleantranscrm.SelectOption so ON pa.Source = so.SelectControlId
         AND pa.ControlType = 'select'
         AND CAST(pal.Value AS UNSIGNED) = so.OptionValue
-    LEFT JOIN (		SELECT 
-            pav.projectid,
-            tst.ProgramAttributeId ,
-            pa.Label ,
-            pav.Value
-        FROM cleantranscrm.ProgramAttribute pa
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-        WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Service Start Date' AND pav.Value IS NOT NULL
-        ) A on A.projectid = pal.ProjectId and A.programattributeid = tst.programattributeid
-    LEFT JOIN (		SELECT 
-            pav.projectid,
-            tst.ProgramAttributeId ,
-            pa.Label ,
-            pav.Value
-        FROM cleantranscrm.ProgramAttribute pa
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-        WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Follow Up' AND pav.Value IS NOT NULL
-        ) B on B.projectid = pal.ProjectId and B.programattributeid = tst.programattributeid
-    LEFT JOIN (		SELECT 
-            pav.projectid,
-            tst.ProgramAttributeId ,
-            pa.Label ,
-            pav.Value
-        FROM cleantranscrm.ProgramAttribute pa
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-        WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Complete' AND pav.Value IS NOT NULL
-        ) C on C.projectid = pal.ProjectId and C.programattributeid = tst.programattributeid
     LEFT JOIN (
     		SELECT  
     			a.ProjectId,
@@ -749,20 +368,22 @@ QUERIES = {
     'summary': QUERY_SUMMARY,
     'duration': QUERY_DURATION,
     'projects': QUERY_PROJECTS,
-    'projects-trend': QUERY_PROJECTS_TREND,
     'logged-activities': QUERY_LOGGED_ACTIVITIES,
-    'logged-activities-trend': QUERY_LOGGED_ACTIVITIES_TREND,
     'attributes-filled': QUERY_ATTRIBUTES_FILLED,
-    'attributes-filled-trend': QUERY_ATTRIBUTES_FILLED_TREND,
     'services-completed': QUERY_SERVICES_COMPLETED,
-    'services-completed-trend': QUERY_SERVICES_COMPLETED_TREND,
     'project-service-attributes': QUERY_PROJECT_SERVICE_ATTRIBUTES,
     'project-service': QUERY_PROJECT_SERVICE,
     'project-timeline': QUERY_PROJECT_TIMELINE,
     'logged-time': QUERY_LOGGED_TIME,
-    'logged-time-trend': QUERY_LOGGED_TIME_TREND,
     'project-milestone-dates': QUERY_MILESTONE_DATES,
     'current-phase-attributes': QUERY_CURRENT_PHASE_ATTRIBUTES,
     'charger-products': QUERY_CHARGER_PRODUCTS,
     # ... add other queries with descriptive names
-}
\ No newline at end of file
+}
+# Result cache TTLs in seconds for /api/data/<query_name>; other queries use RESULT_CACHE_DEFAULT_TTL
+QUERY_TTLS = {
+    'summary': 600,
+    'project-service': 600,
+    'project-service-attributes': 600,
+    'charger-products': 3600,
+}
@@ -0,0 +1,194 @@
+import logging
+import os
+import threading
+import time
+
+from graphql import get_named_type, get_operation_ast, GraphQLError
+from graphql.execution.values import get_argument_values, get_variable_values
+from graphql.language import FieldNode, FragmentDefinitionNode, FragmentSpreadNode, InlineFragmentNode
+
+from .pool import connection
+
+logger = logging.getLogger(__name__)
+
+# Above the soft limit an operation resolves its root fields one at a time instead of
+# fanning them out over the pool; above the hard limit it is rejected.
+GRAPHQL_COST_SOFT_LIMIT = float(os.getenv('GRAPHQL_COST_SOFT_LIMIT', 50000))
+GRAPHQL_COST_HARD_LIMIT = float(os.getenv('GRAPHQL_COST_HARD_LIMIT', 250000))
+TABLE_STATS_TTL = float(os.getenv('TABLE_STATS_TTL', 300))
+# Row estimate for tables without statistics (e.g. before the first load succeeds)
+DEFAULT_TABLE_ROWS = 1000
+
+
+class TableStats:
+    """Approximate row counts of the cleantranscrm tables from information_schema,
+    plus the number of live projects per program.
+
+    Refreshed every TABLE_STATS_TTL seconds; readers keep the previous counts while a
+    refresh runs, and tables without a count estimate DEFAULT_TABLE_ROWS.
+    """
+
+    def __init__(self, ttl=TABLE_STATS_TTL):
+        self.ttl = ttl
+        self._rows = {}
+        self._program_projects = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def refresh_if_stale(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            with connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES
+                    WHERE TABLE_SCHEMA = 'cleantranscrm'
+                """)
+                self._rows = {name: int(rows or 0) for name, rows in cursor.fetchall()}
+                cursor.execute("""
+                    SELECT ProgramId, COUNT(*) FROM cleantranscrm.Project
+                    WHERE Deleted = 0
+                    GROUP BY ProgramId
+                """)
+                self._program_projects = {program_id: int(count) for program_id, count in cursor.fetchall()}
+                cursor.close()
+        except Exception as e:
+            logger.exception("Error loading table statistics: %s", e)
+        finally:
+            self._loaded_at = time.monotonic()
+            self._lock.release()
+
+    def rows(self, table):
+        self.refresh_if_stale()
+        return max(self._rows.get(table, DEFAULT_TABLE_ROWS), 1)
+
+    def program_projects(self, program_id):
+        """Projects in a program; an even share of the Project table when it isn't counted."""
+        self.refresh_if_stale()
+        count = self._program_projects.get(program_id)
+        if count is None:
+            return self.rows('Project') / self.rows('Program')
+        return max(count, 1)
+
+    def stats(self):
+        age = None if self._loaded_at is None else time.monotonic() - self._loaded_at
+        return {'tables': dict(self._rows), 'program_projects': dict(self._program_projects), 'age_seconds': age}
+
+
+class FieldCost:
+    """Cost of one list field: weight per row times rows(args, stats) rows per parent row."""
+
+    def __init__(self, weight, rows):
+        self.weight = weight
+        self.rows = rows
+
+
+def _per_project(table):
+    return lambda args, stats: stats.rows(table) / stats.rows('Project')
+
+
+def _project_overview(args, stats):
+    if args.get('projectId') or args.get('projectNumber'):
+        return 1
+    projects = stats.rows('Project')
+    rows = stats.program_projects(args['programId']) if args.get('programId') else projects
+    # The LIKE filters are taken to match about one status / organization's share
+    if args.get('projectStatus'):
+        rows /= stats.rows('ProjectStatus')
+    if args.get('organizationName'):
+        rows /= stats.rows('Organization')
+    return min(max(rows, 1), projects)
+
+
+def _project_services(args, stats):
+    return stats.rows('Project') * stats.rows('TeasSupportType')
+
+
+# Weights are relative SQL cost per returned row: 1 for rows read from MySQL per
+# request, less for rows filtered from an in-process cache. Fields not listed are free.
+FIELD_COSTS = {
+    'Query.projectOverview': FieldCost(1, _project_overview),
+    'Query.projectTimeline': FieldCost(1, lambda args, stats: stats.rows('ProjectAttributeValue') / (stats.rows('Project') if args.get('projectId') else 1)),
+    'Query.projectServices': FieldCost(0.05, _project_services),
+    'Query.projectsWithFollowUpDates': FieldCost(0.05, _project_services),
+    'Query.servicesStarted': FieldCost(0.05, _project_services),
+    'Query.projectsNotStarted': FieldCost(0.05, _project_services),
+    'Query.completedProjects': FieldCost(0.05, _project_services),
+    'Query.programList': FieldCost(0.1, lambda args, stats: stats.rows('Program')),
+    'Query.projectStatusList': FieldCost(0.1, lambda args, stats: stats.rows('ProjectStatus')),
+    'ProjectOverview.services': FieldCost(0.05, lambda args, stats: stats.rows('TeasSupportType')),
+    'ProjectOverview.timeline': FieldCost(1, _per_project('ProjectAttributeValue')),
+}
+
+
+class QueryTooExpensive(GraphQLError):
+    def __init__(self, cost, limit):
+        super().__init__(
+            f"Query cost {cost:.0f} exceeds the limit of {limit:.0f}",
+            extensions={'code': 'QUERY_TOO_EXPENSIVE', 'cost': round(cost), 'limit': limit},
+        )
+
+
+class CostAnalyzer:
+    """Static cost estimate of a GraphQL operation, computed before it executes.
+
+    Walks the selected fields (through fragments) and sums FIELD_COSTS, multiplying
+    nested list fields by their parent's estimated rows.
+    """
+
+    def __init__(self, schema, field_costs=FIELD_COSTS, stats=None,
+                 soft_limit=GRAPHQL_COST_SOFT_LIMIT, hard_limit=GRAPHQL_COST_HARD_LIMIT):
+        self.schema = schema
+        self.field_costs = field_costs
+        self.stats = stats or TableStats()
+        self.soft_limit = soft_limit
+        self.hard_limit = hard_limit
+
+    def cost(self, document, variables=None, operation_name=None):
+        operation = get_operation_ast(document, operation_name)
+        if operation is None or self.schema.query_type is None:
+            return 0
+        fragments = {d.name.value: d for d in document.definitions if isinstance(d, FragmentDefinitionNode)}
+        coerced = get_variable_values(self.schema, operation.variable_definitions or (), variables or {})
+        if isinstance(coerced, list):
+            # Invalid variables fail in execution; estimate with none
+            coerced = {}
+        return self._selection_cost(operation.selection_set, self.schema.query_type, 1, coerced, fragments)
+
+    def _fields(self, selection_set, fragments):
+        pending = [selection_set]
+        while pending:
+            for selection in pending.pop().selections:
+                if isinstance(selection, FieldNode):
+                    yield selection
+                elif isinstance(selection, InlineFragmentNode):
+                    pending.append(selection.selection_set)
+                elif isinstance(selection, FragmentSpreadNode) and selection.name.value in fragments:
+                    pending.append(fragments[selection.name.value].selection_set)
+
+    def _selection_cost(self, selection_set, parent_type, parent_rows, variables, fragments):
+        total = 0
+        for node in self._fields(selection_set, fragments):
+            field = getattr(parent_type, 'fields', {}).get(node.name.value)
+            field_cost = self.field_costs.get(f"{parent_type.name}.{node.name.value}")
+            if field is None or field_cost is None:
+                continue
+            try:
+                args = get_argument_values(field, node, variables)
+            except GraphQLError:
+                args = {}
+            rows = parent_rows * field_cost.rows(args, self.stats)
+            total += rows * field_cost.weight
+            if node.selection_set:
+                total += self._selection_cost(node.selection_set, get_named_type(field.type), rows, variables, fragments)
+        return total
+
+    def admit(self, document, variables=None, operation_name=None):
+        """Return (cost, downgrade); raises QueryTooExpensive over the hard limit."""
+        cost = self.cost(document, variables, operation_name)
+        if cost > self.hard_limit:
+            raise QueryTooExpensive(cost, self.hard_limit)
+        return cost, cost > self.soft_limit
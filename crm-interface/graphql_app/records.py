@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_datetime64_any_dtype, is_float_dtype, is_integer_dtype
+
+
+def plain_value(value):
+    """One value as plain_values converts it: missing becomes None, Decimal float, numpy scalars Python scalars."""
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return None
+    if type(value) is Decimal:
+        return float(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def plain_values(column):
+    """Column as an object Series of Python values: NaN / NaT / NA become None, Decimal becomes float."""
+    if is_integer_dtype(column) or is_bool_dtype(column):
+        # Nullable Int64 / boolean columns can still hold NA
+        return column.astype(object).where(column.notna(), None)
+    values = column.astype(object)
+    missing = column.isna()
+    if is_float_dtype(column) or is_datetime64_any_dtype(column):
+        return values.where(~missing, None)
+    # Object columns can mix Decimal (SUM / DECIMAL results) and numpy scalars with Python values
+    array = values.to_numpy()
+    odd = np.fromiter((type(value) is Decimal or isinstance(value, np.generic) for value in array), dtype=bool, count=len(array))
+    if odd.any():
+        array = array.copy()
+        array[odd] = [plain_value(value) for value in array[odd]]
+        values = pd.Series(array, index=column.index, dtype=object)
+    return values.where(~missing.to_numpy(), None)
+
+
+class FieldMap:
+    """Declarative mapping from result columns to the fields of one GraphQL type.
+
+    fields: {GraphQL field: DataFrame column}, in output order. records(df) converts
+    whole columns at once and zips them into dicts instead of building a Series per
+    row (zipping column lists is several times faster than DataFrame.to_dict here).
+    """
+
+    def __init__(self, fields):
+        self.fields = dict(fields)
+
+    def records(self, df):
+        """List of field dicts, one per row of df."""
+        if df.empty:
+            return []
+        fields = list(self.fields)
+        columns = [plain_values(df[column]).tolist() for column in self.fields.values()]
+        return [dict(zip(fields, row)) for row in zip(*columns)]
@@ -1,4 +1,160 @@
 from graphql_app.database import fetch_data, format_dates
+from graphql_app.project_services import PROJECT_SERVICES, all_services
+from graphql_app.pivot import PROJECT_OVERVIEW_PIVOT, service_progress
+from graphql_app.records import FieldMap
+from graphql_app.selection import requested_fields, report
+from graphql_app.loaders import load, prefetch
+
+# GraphQL field -> result column, one map per type in schema.py
+PROJECT_OVERVIEW_FIELDS = FieldMap({
+    'projectNumber': 'ProjectNumber',
+    'programId': 'ProgramId',
+    'projectId': 'ProjectId',
+    'projectName': 'ProjectName',
+    'organizationName': 'OrganizationName',
+    'organizationId': 'OrganizationId',
+    'projectStatus': 'ProjectStatus',
+    'projectLead': 'ProjectLead',
+    'usc': 'USC',
+    'totalServicesSelected': 'TotalServicesSelected',
+    'servicesCompleted': 'ServicesCompleted',
+    'servicesInProgress': 'ServicesInProgress',
+    'openServices': 'OpenServices',
+    'servicesNotReady': 'ServicesNotReady',
+    'percentCompleted': 'PercentCompleted',
+})
+
+PROJECT_DETAILS_FIELDS = FieldMap({
+    'projectNumber': 'ProjectNumber',
+    'projectId': 'ProjectId',
+    'phaseId': 'PhaseId',
+    'projectName': 'ProjectName',
+    'organizationName': 'OrganizationName',
+    'organizationId': 'OrganizationId',
+    'coreName': 'CoreName',
+    'serviceName': 'ServiceName',
+    'serviceStartDate': 'ServiceStartDate',
+    'followUpDate': 'FollowUpDate',
+    'completeDate': 'CompleteDate',
+    'totalDurationMins': 'TotalDurationMins',
+    'latestActivity': 'LatestActivity',
+    'createdAt': 'CreatedAt',
+    'totalRequired': 'TotalRequired',
+    'filledCount': 'FilledCount',
+})
+
+PROJECT_TIMELINE_FIELDS = FieldMap({
+    'id': 'Id',
+    'projectId': 'ProjectId',
+    'phaseName': 'PhaseName',
+    'programAttributeId': 'ProgramAttributeId',
+    'updatedAt': 'UpdatedAt',
+    'label': 'Label',
+    'updatedBy': 'UpdatedBy',
+    'phaseSortOrder': 'PhaseSortOrder',
+    'labelSortOrder': 'LabelSortOrder',
+})
+
+PROGRAM_FIELDS = FieldMap({
+    'programId': 'ProgramId',
+    'programName': 'Name',
+    'shortName': 'ShortName',
+})
+
+PROJECT_STATUS_FIELDS = FieldMap({
+    'projectStatusId': 'ProjectStatusId',
+    'projectStatusName': 'Name',
+    'projectStatusLongName': 'LongName',
+})
+
+
+# What each ProjectOverview field reads besides Project itself: a PROJECT_OVERVIEW_JOINS
+# entry or a PROJECT_OVERVIEW_PIVOT column. Unrequested ones are left out of the query.
+PROJECT_OVERVIEW_NEEDS = {
+    'organizationName': ('Organization',),
+    'organizationId': ('Organization',),
+    'projectStatus': ('ProjectStatus',),
+    'projectLead': ('User',),
+    'usc': ('USC',),
+    'totalServicesSelected': ('ServiceSelectionCount',),
+    'servicesCompleted': ('ServicesCompleted',),
+    'servicesInProgress': ('ServicesStarted', 'ServicesCompleted'),
+    'openServices': ('ServiceSelectionCount', 'ServicesCompleted'),
+    'servicesNotReady': ('ServiceSelectionCount', 'ServicesStarted', 'ServicesCompleted'),
+    'percentCompleted': ('ServiceSelectionCount', 'ServicesCompleted'),
+}
+
+# Optional projectOverview joins: name -> ((select expression, column), ...), JOIN clause.
+# ProjectRole is always joined since it decides how many rows a project gets.
+PROJECT_OVERVIEW_JOINS = {
+    'Organization': (
+        (("o.Name as 'OrganizationName'", 'OrganizationName'), ("o.OrganizationId", 'OrganizationId')),
+        "LEFT JOIN cleantranscrm.Organization o ON o.OrganizationId = p.OrganizationId",
+    ),
+    'ProjectStatus': (
+        (("""CASE
+                WHEN p.StatusReasonSecondaryId = 22 THEN 'Duplicate'
+                WHEN p.StatusReasonSecondaryId = 5 THEN 'Ineligible'
+                ELSE ps.LongName
+            END as 'ProjectStatus'""", 'ProjectStatus'),),
+        "LEFT JOIN cleantranscrm.ProjectStatus ps ON ps.ProjectStatusId = p.Status",
+    ),
+    'User': (
+        (("u.ProperName as 'ProjectLead'", 'ProjectLead'),),
+        "LEFT JOIN cleantranscrm.`User` u ON pr.UserId = u.UserId",
+    ),
+}
+
+
+def timeline_records(conditions, params):
+    """ProjectTimeline records for the date attribute values matching conditions."""
+    conditions = conditions + ["ptv.ProgramAttributeId IN (SELECT ProgramAttributeId FROM cleantranscrm.ProgramAttribute WHERE ControlType = 'date')"]
+    where_clause = " AND ".join(conditions)
+    where_clause = f"WHERE {where_clause}" if where_clause else ""
+
+    query = f"""SELECT ptv.Id, ptv.ProjectId, ptv.ProgramAttributeId, ptv.UpdatedAt, ptv.UpdatedBy, ptv.Value, 
+        pa.Label, 
+        pa.SortOrder AS 'LabelSortOrder', 
+        pp.Name AS 'PhaseName', 
+        pp.SortOrder AS 'PhaseSortOrder'
+    FROM cleantranscrm.ProjectAttributeValue ptv
+    LEFT JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramAttributeId = ptv.ProgramAttributeId
+    LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = pa.PhaseId AND pp.ProgramId = pa.ProgramId
+    {where_clause};
+    """
+
+    df = fetch_data(query, params)
+    date_columns = ['UpdatedAt']
+    df = format_dates(df, date_columns)
+    return PROJECT_TIMELINE_FIELDS.records(df)
+
+
+def _by_project(records, project_ids):
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record['projectId'], []).append(record)
+    return [grouped.get(project_id, []) for project_id in project_ids]
+
+
+def load_project_services(project_ids):
+    """ProjectOverview.services batch: ProjectDetails records per project, from the shared project services frame."""
+    df = PROJECT_SERVICES.frame()
+    df = all_services(df[df['ProjectId'].isin([p for p in project_ids if p is not None])])
+    date_columns = ['ServiceStartDate', 'FollowUpDate', 'CompleteDate', 'CreatedAt']
+    df = format_dates(df, date_columns)
+    return _by_project(PROJECT_DETAILS_FIELDS.records(df), project_ids)
+
+
+def load_project_timelines(project_ids):
+    """ProjectOverview.timeline batch: ProjectTimeline records per project from one IN (...) query."""
+    ids = sorted({int(p) for p in project_ids if p is not None})
+    if not ids:
+        return [[] for _ in project_ids]
+    placeholders = ', '.join(f"%(project_{i})s" for i in range(len(ids)))
+    params = {f"project_{i}": project_id for i, project_id in enumerate(ids)}
+    records = timeline_records([f"ptv.ProjectId IN ({placeholders})"], params)
+    return _by_project(records, project_ids)
+
 
 class Resolvers:
     @staticmethod
@@ -31,900 +187,101 @@ class Resolvers:
         where_clause = " AND ".join(conditions)
         where_clause = f"WHERE {where_clause}" if where_clause else ""
 
+        requested = requested_fields(info)
+        needs = set()
+        for field in requested:
+            needs.update(PROJECT_OVERVIEW_NEEDS.get(field, ()))
+        if projectStatus:
+            needs.add('ProjectStatus')
+        if organizationName:
+            needs.add('Organization')
+
+        columns, joins, skipped = [], [], []
+        for name, (selects, join) in PROJECT_OVERVIEW_JOINS.items():
+            if name in needs:
+                columns.extend(expression for expression, _ in selects)
+                joins.append(join)
+            else:
+                # Keep the column so the field map still finds it
+                columns.extend(f"NULL as '{alias}'" for _, alias in selects)
+                skipped.append(name)
+        pivot_columns = [c.name for c in PROJECT_OVERVIEW_PIVOT.columns if c.name in needs]
+        skipped.extend(c.name for c in PROJECT_OVERVIEW_PIVOT.columns if c.name not in needs)
+        report(info, 'skippedJoins', skipped)
+
+        select_list = ",\n            ".join(columns)
+        join_list = "\n        ".join(joins)
         query = f"""SELECT 
             p.ProjectNumber,
             p.ProgramId,
             p.ProjectId,
             p.Name as 'ProjectName',
-            o.Name as 'OrganizationName',
-            o.OrganizationId,
-            CASE
-                WHEN p.StatusReasonSecondaryId = 22 THEN 'Duplicate'
-                WHEN p.StatusReasonSecondaryId = 5 THEN 'Ineligible'
-                ELSE ps.LongName
-            END as 'ProjectStatus',
-            u.ProperName as 'ProjectLead',
-            CASE
-                WHEN D.USC = 'true' THEN 'True'
-                WHEN D.USC = 'false' THEN 'False'
-                ELSE 'None'
-            END AS 'USC',
-            A.ServiceSelectionCount as 'TotalServicesSelected',
-            COALESCE(B.ServicesCompleted, 0) as 'ServicesCompleted',
-            COALESCE(C.ServicesStarted, 0) - COALESCE(B.ServicesCompleted, 0) as 'ServicesInProgress',
-            (A.ServiceSelectionCount - COALESCE(B.ServicesCompleted, 0)) as 'OpenServices',
-            CASE 
-                WHEN A.ServiceSelectionCount - COALESCE(B.ServicesCompleted, 0) - 
-                    (COALESCE(C.ServicesStarted, 0) - COALESCE(B.ServicesCompleted, 0)) < 0 THEN 0
-                ELSE A.ServiceSelectionCount - COALESCE(B.ServicesCompleted, 0) - 
-                    (COALESCE(C.ServicesStarted, 0) - COALESCE(B.ServicesCompleted, 0))
-            END AS 'ServicesNotReady',
-            CAST(ROUND((100.0 * (COALESCE(B.ServicesCompleted, 0))/A.ServiceSelectionCount),2) as DECIMAL(7,2)) as 'PercentCompleted'
+            {select_list}
         FROM cleantranscrm.Project p
-        LEFT JOIN cleantranscrm.ProjectStatus ps ON ps.ProjectStatusId = p.Status
         LEFT JOIN cleantranscrm.ProjectRole pr ON pr.ProjectId = p.ProjectId
-        LEFT JOIN cleantranscrm.`User` u ON pr.UserId = u.UserId
-        LEFT JOIN cleantranscrm.Organization o ON o.OrganizationId = p.OrganizationId
-        LEFT JOIN (
-            SELECT 
-                pav.ProjectId,
-                COUNT(CASE WHEN pav.Value = 'True' THEN 1 END) AS 'ServiceSelectionCount'
-            FROM cleantranscrm.ProjectAttributeValue pav
-            LEFT JOIN cleantranscrm.ProgramAttribute pa ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            WHERE pa.ProgramId = 16 AND pa.PhaseId = 2
-            GROUP BY pav.ProjectId
-        ) A ON A.ProjectId = p.ProjectId
-        LEFT JOIN (
-            SELECT 
-                pav.projectid,
-                COUNT(CASE WHEN pav.Value IS NOT NULL THEN 1 END) AS 'ServicesCompleted'
-            FROM cleantranscrm.ProgramAttribute pa
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'complete' AND pav.Value IS NOT NULL
-            GROUP BY pav.ProjectId
-        ) B ON B.ProjectId = p.ProjectId
-        LEFT JOIN (
-            SELECT 
-                pav.projectid,
-                COUNT(CASE WHEN pav.Value IS NOT NULL THEN 1 END) AS 'ServicesStarted'
-            FROM cleantranscrm.ProgramAttribute pa
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Service Start Date' AND pav.Value IS NOT NULL
-            GROUP BY pav.ProjectId
-        ) C ON C.ProjectId = p.ProjectId
-            LEFT JOIN (
-            SELECT 
-                pav.projectid,
-                pav.Value AS 'USC'
-            FROM cleantranscrm.ProgramAttribute pa
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            WHERE pa.ProgramId = 16 AND pa.label = 'USC?' AND pav.Value IS NOT NULL
-            GROUP BY pav.ProjectId
-        ) D ON D.ProjectId = p.ProjectId
+        {join_list}
         {where_clause};
         """
 
         df = fetch_data(query, params)
-        result = []
-        for _, row in df.iterrows():
-            result.append({
-                'projectNumber': row['ProjectNumber'],
-                'programId': row['ProgramId'],
-                'projectId': row['ProjectId'],
-                'projectName': row['ProjectName'],
-                'organizationName': row['OrganizationName'],
-                'organizationId': row['OrganizationId'],
-                'projectStatus': row['ProjectStatus'],
-                'projectLead': row['ProjectLead'],
-                'usc': row['USC'],
-                'totalServicesSelected': row['TotalServicesSelected'],
-                'servicesCompleted': row['ServicesCompleted'],
-                'servicesInProgress': row['ServicesInProgress'],
-                'openServices': row['OpenServices'],
-                'servicesNotReady': row['ServicesNotReady'],
-                'percentCompleted': row['PercentCompleted']
-            })
-        return result
+        if pivot_columns:
+            # Service counts and USC come from one pivoted scan of the attribute values
+            df = PROJECT_OVERVIEW_PIVOT.select(pivot_columns).join(df, fetch_data)
+        df = service_progress(df.reindex(columns=list(df.columns) + [
+            c.name for c in PROJECT_OVERVIEW_PIVOT.columns if c.name not in df.columns]))
+        records = PROJECT_OVERVIEW_FIELDS.records(df)
+        # One batch per nested list for every returned project, on either execution path
+        project_ids = [record['projectId'] for record in records]
+        if 'services' in requested:
+            prefetch(info, load_project_services, project_ids)
+        if 'timeline' in requested:
+            prefetch(info, load_project_timelines, project_ids)
+        return records
     
     @staticmethod
-    def resolve_all_project_services(root, info, projectId=None):
-        conditions = []
-        params = {}
-
-        if projectId:
-            conditions.append("p.ProjectId = %(projectId)s")
-            params['projectId'] = projectId
+    def resolve_overview_services(project, info):
+        return load(info, load_project_services, project['projectId'])
 
-        conditions.append("p.projectid NOT IN (3467,3197)")
-        conditions.append("p.deleted = 0")
-
-        where_clause = " AND ".join(conditions)
-        where_clause = f"WHERE {where_clause}" if where_clause else ""
+    @staticmethod
+    def resolve_overview_timeline(project, info):
+        return load(info, load_project_timelines, project['projectId'])
 
-        query = """SELECT
-            p.ProjectNumber,
-            p.ProjectId,
-            tst.PhaseId,
-            p.Name as 'ProjectName',
-            o.Name AS 'OrganizationName',
-            o.OrganizationId,
-            tst2.Name AS 'CoreName',
-            pa.Label AS 'ServiceName',
-            A.Value AS 'ServiceStartDate',
-            B.Value AS 'FollowUpDate',
-            C.Value AS 'CompleteDate',
-            COALESCE(activity.TotalDurationMins, 0) AS 'TotalDurationMins',
-            COALESCE(activity.LatestActivity, 'No recorded activity yet') as 'LatestActivity',
-            activity.CreatedAt,
-            COALESCE(ac.TotalRequired, 0) AS 'TotalRequired',
-            COALESCE(ac.FilledCount, 0) AS 'FilledCount'
-            FROM cleantranscrm.TeasSupportType tst
-            LEFT JOIN cleantranscrm.TeasServiceType tst2 ON CAST(tst2.TeasServiceTypeId AS UNSIGNED) = CAST(tst.TeasServiceTypeId AS UNSIGNED)
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pal ON pal.ProgramAttributeId = CAST(tst.ProgramAttributeId AS UNSIGNED)
-            LEFT JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramAttributeId = pal.ProgramAttributeId
-            LEFT JOIN cleantranscrm.`Project` p ON p.ProjectId = pal.ProjectId
-            LEFT JOIN cleantranscrm.Organization o ON o.OrganizationId = p.OrganizationId 
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = pa.PhaseId AND pp.ProgramId = pa.ProgramId
-            LEFT JOIN cleantranscrm.SelectOption so ON pa.Source = so.SelectControlId
-            AND pa.ControlType = 'select'
-            AND CAST(pal.Value AS UNSIGNED) = so.OptionValue
-            LEFT JOIN (
-            SELECT 
-                pav.projectid,
-                tst.ProgramAttributeId,
-                pa.Label,
-                pav.Value
-            FROM cleantranscrm.ProgramAttribute pa
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-            WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Service Start Date' AND pav.Value IS NOT NULL AND pav.Value REGEXP '^[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}.[0-9]{3}Z$'
-            ) A ON A.projectid = pal.ProjectId AND A.programattributeid = tst.programattributeid
-            LEFT JOIN (
-            SELECT 
-                pav.projectid,
-                tst.ProgramAttributeId,
-                pa.Label,
-                pav.Value
-            FROM cleantranscrm.ProgramAttribute pa
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-            WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Follow Up' AND pav.Value IS NOT NULL
-            ) B ON B.projectid = pal.ProjectId AND B.programattributeid = tst.programattributeid
-            LEFT JOIN (
-            SELECT 
-                pav.projectid,
-                tst.ProgramAttributeId,
-                pa.Label,
-                pav.Value
-            FROM cleantranscrm.ProgramAttribute pa
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-            WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Complete' AND pav.Value IS NOT NULL
-            ) C ON C.projectid = pal.ProjectId AND C.programattributeid = tst.programattributeid
-            LEFT JOIN (
-            SELECT 
-                projectid,
-                phaseid,
-                MAX(a.ActivityId) as 'MaxId' ,
-                SUM(a.Duration) as 'TotalDurationMins',
-                MAX(a.`Text`) as 'LatestActivity',
-                MAX(a.CreatedAt) as 'CreatedAt'
-            FROM cleantranscrm.Activity a
-            GROUP BY projectid, phaseid
-            ) activity on activity.projectid = pal.ProjectId AND activity.phaseid = tst.PhaseId
-            LEFT JOIN
-        (SELECT p.ProjectNumber,
-                p.ProjectId,
-                pp.Name AS ServiceName,
-                COUNT(DISTINCT pal.ProgramAttributeId) AS TotalRequired,
-                SUM(CASE
-                        WHEN pal.Value IS NOT NULL THEN 1
-                        ELSE 0
-                    END) AS FilledCount
-        FROM cleantranscrm.Project p
-        INNER JOIN
-            (SELECT p.ProjectId,
-                    p.CurrentPhaseId AS CurrentProjectPhase,
-                    a.ProgramAttributeId,
-                    a.ProgramId,
-                    a.PhaseId,
-                    a.SortOrder,
-                    a.ControlName,
-                    a.ControlType,
-                    a.ValueType,
-                    a.ReadOnly,
-                    a.Source,
-                    a.Required,
-                    a.Label,
-                    a.Description,
-                    a.IsGatingItem,
-                    a.IsDocument,
-                    a.AssignedUserUserId,
-                    a.TableId,
-                    v.Value,
-                    v.UpdatedAt,
-                    v.UpdatedBy
-            FROM cleantranscrm.ProgramAttribute AS a
-            INNER JOIN cleantranscrm.Project AS p ON a.ProgramId = p.ProgramId
-            LEFT OUTER JOIN cleantranscrm.ProjectAttributeValue AS v ON v.ProgramAttributeId = a.ProgramAttributeId
-            AND v.ProjectId = p.ProjectId) pal ON pal.ProjectId = p.ProjectId
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pal.PhaseId = pp.PhaseId
-        AND pal.ProgramId = pp.ProgramId
-        WHERE pal.ProgramId = 16
-            AND p.Deleted = 0
-            AND pal.Required = 1
-        GROUP BY p.ProjectNumber,
-                    p.ProjectId,
-                    pp.Name) ac ON ac.projectid = pal.ProjectId
-        AND ac.ServiceName = pa.Label
-            WHERE
-            pal.ProjectId IN (SELECT ProjectId FROM cleantranscrm.`Project` WHERE ProgramId = 16)
-            AND pa.PhaseId = 2 AND pa.ProgramId = 16
-            GROUP BY p.ProjectNumber, tst2.Name, pa.Label
-            ORDER BY B.value ASC;"""
-        
-        df = fetch_data(query)
+    @staticmethod
+    def resolve_all_project_services(root, info, projectId=None):
+        df = PROJECT_SERVICES.view('all')
+        if projectId:
+            df = df[df['ProjectId'] == int(projectId)]
         date_columns = ['ServiceStartDate', 'FollowUpDate', 'CompleteDate', 'CreatedAt']
         df = format_dates(df, date_columns)
-        result = []
-        for _, row in df.iterrows():
-            result.append({
-            'projectNumber': row['ProjectNumber'],
-            'projectId': row['ProjectId'],
-            'phaseId': row['PhaseId'],
-            'projectName': row['ProjectName'],
-            'organizationName': row['OrganizationName'],
-            'organizationId': row['OrganizationId'],
-            'coreName': row['CoreName'],
-            'serviceName': row['ServiceName'],
-            'serviceStartDate': row['ServiceStartDate'],
-            'followUpDate': row['FollowUpDate'],
-            'completeDate': row['CompleteDate'],
-            'totalDurationMins': row['TotalDurationMins'],
-            'latestActivity': row['LatestActivity'],
-            'createdAt': row['CreatedAt'],
-            'totalRequired': row['TotalRequired'],
-            'filledCount': row['FilledCount']
-            })
-        return result
+        return PROJECT_DETAILS_FIELDS.records(df)
     
     @staticmethod
     def resolve_projects_with_follow_up_dates(root, info):
-        query = """SELECT
-            p.ProjectNumber,
-            p.ProjectId,
-            tst.PhaseId,
-            p.Name as 'ProjectName',
-            o.Name AS 'OrganizationName',
-            o.OrganizationId,
-            tst2.Name AS 'CoreName',
-            pa.Label AS 'ServiceName',
-            A.Value AS 'ServiceStartDate',
-            B.Value AS 'FollowUpDate',
-            C.Value AS 'CompleteDate',
-            COALESCE(activity.TotalDurationMins, 0) AS 'TotalDurationMins',
-            COALESCE(activity.LatestActivity, 'No recorded activity yet') as 'LatestActivity',
-            activity.CreatedAt,
-            COALESCE(ac.TotalRequired, 0) AS 'TotalRequired',
-            COALESCE(ac.FilledCount, 0) AS 'FilledCount'
-            FROM cleantranscrm.TeasSupportType tst
-            LEFT JOIN cleantranscrm.TeasServiceType tst2 ON CAST(tst2.TeasServiceTypeId AS UNSIGNED) = CAST(tst.TeasServiceTypeId AS UNSIGNED)
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pal ON pal.ProgramAttributeId = CAST(tst.ProgramAttributeId AS UNSIGNED)
-            LEFT JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramAttributeId = pal.ProgramAttributeId
-            LEFT JOIN cleantranscrm.`Project` p ON p.ProjectId = pal.ProjectId
-            LEFT JOIN cleantranscrm.Organization o ON o.OrganizationId = p.OrganizationId 
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = pa.PhaseId AND pp.ProgramId = pa.ProgramId
-            LEFT JOIN cleantranscrm.SelectOption so ON pa.Source = so.SelectControlId
-            AND pa.ControlType = 'select'
-            AND CAST(pal.Value AS UNSIGNED) = so.OptionValue
-            LEFT JOIN (
-            SELECT 
-                pav.projectid,
-                tst.ProgramAttributeId,
-                pa.Label,
-                pav.Value
-            FROM cleantranscrm.ProgramAttribute pa
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-            WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Service Start Date' AND pav.Value IS NOT NULL AND pav.Value REGEXP '^[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}.[0-9]{3}Z$'
-            ) A ON A.projectid = pal.ProjectId AND A.programattributeid = tst.programattributeid
-            LEFT JOIN (
-            SELECT 
-                pav.projectid,
-                tst.ProgramAttributeId,
-                pa.Label,
-                pav.Value
-            FROM cleantranscrm.ProgramAttribute pa
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-            WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Follow Up' AND pav.Value IS NOT NULL
-            ) B ON B.projectid = pal.ProjectId AND B.programattributeid = tst.programattributeid
-            LEFT JOIN (
-            SELECT 
-                pav.projectid,
-                tst.ProgramAttributeId,
-                pa.Label,
-                pav.Value
-            FROM cleantranscrm.ProgramAttribute pa
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-            WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Complete' AND pav.Value IS NOT NULL
-            ) C ON C.projectid = pal.ProjectId AND C.programattributeid = tst.programattributeid
-            LEFT JOIN (
-            SELECT 
-                projectid,
-                phaseid,
-                MAX(a.ActivityId) as 'MaxId' ,
-                SUM(a.Duration) as 'TotalDurationMins',
-                MAX(a.`Text`) as 'LatestActivity',
-                MAX(a.CreatedAt) as 'CreatedAt'
-            FROM cleantranscrm.Activity a
-            GROUP BY projectid, phaseid
-            ) activity on activity.projectid = pal.ProjectId AND activity.phaseid = tst.PhaseId
-            LEFT JOIN
-        (SELECT p.ProjectNumber,
-                p.ProjectId,
-                pp.Name AS ServiceName,
-                COUNT(DISTINCT pal.ProgramAttributeId) AS TotalRequired,
-                SUM(CASE
-                        WHEN pal.Value IS NOT NULL THEN 1
-                        ELSE 0
-                    END) AS FilledCount
-        FROM cleantranscrm.Project p
-        INNER JOIN
-            (SELECT p.ProjectId,
-                    p.CurrentPhaseId AS CurrentProjectPhase,
-                    a.ProgramAttributeId,
-                    a.ProgramId,
-                    a.PhaseId,
-                    a.SortOrder,
-                    a.ControlName,
-                    a.ControlType,
-                    a.ValueType,
-                    a.ReadOnly,
-                    a.Source,
-                    a.Required,
-                    a.Label,
-                    a.Description,
-                    a.IsGatingItem,
-                    a.IsDocument,
-                    a.AssignedUserUserId,
-                    a.TableId,
-                    v.Value,
-                    v.UpdatedAt,
-                    v.UpdatedBy
-            FROM cleantranscrm.ProgramAttribute AS a
-            INNER JOIN cleantranscrm.Project AS p ON a.ProgramId = p.ProgramId
-            LEFT OUTER JOIN cleantranscrm.ProjectAttributeValue AS v ON v.ProgramAttributeId = a.ProgramAttributeId
-            AND v.ProjectId = p.ProjectId) pal ON pal.ProjectId = p.ProjectId
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pal.PhaseId = pp.PhaseId
-        AND pal.ProgramId = pp.ProgramId
-        WHERE pal.ProgramId = 16
-            AND p.Deleted = 0
-            AND pal.Required = 1
-        GROUP BY p.ProjectNumber,
-                    p.ProjectId,
-                    pp.Name) ac ON ac.projectid = pal.ProjectId
-        AND ac.ServiceName = pa.Label
-            WHERE
-            pal.ProjectId IN (SELECT ProjectId FROM cleantranscrm.`Project` WHERE ProgramId = 16)
-            AND pa.PhaseId = 2 AND pa.ProgramId = 16
-            AND pal.Value = 'True'
-            AND B.Value != ''
-            AND (B.Value < CURDATE())
-            AND C.Value IS NULL
-            GROUP BY p.ProjectNumber, tst2.Name, pa.Label
-            ORDER BY B.value ASC;"""
-        
-        df = fetch_data(query)
+        df = PROJECT_SERVICES.view('follow_up')
         date_columns = ['ServiceStartDate', 'FollowUpDate', 'CompleteDate', 'CreatedAt']
         df = format_dates(df, date_columns)
-        result = []
-        for _, row in df.iterrows():
-            result.append({
-            'projectNumber': row['ProjectNumber'],
-            'projectId': row['ProjectId'],
-            'phaseId': row['PhaseId'],
-            'projectName': row['ProjectName'],
-            'organizationName': row['OrganizationName'],
-            'organizationId': row['OrganizationId'],
-            'coreName': row['CoreName'],
-            'serviceName': row['ServiceName'],
-            'serviceStartDate': row['ServiceStartDate'],
-            'followUpDate': row['FollowUpDate'],
-            'completeDate': row['CompleteDate'],
-            'totalDurationMins': row['TotalDurationMins'],
-            'latestActivity': row['LatestActivity'],
-            'createdAt': row['CreatedAt'],
-            'totalRequired': row['TotalRequired'],
-            'filledCount': row['FilledCount']
-            })
-        return result
+        return PROJECT_DETAILS_FIELDS.records(df)
 
     @staticmethod
     def resolve_services_started(root, info):
-        query = """SELECT
-            p.ProjectNumber,
-            p.ProjectId,
-            tst.PhaseId,
-            p.Name as 'ProjectName',
-            o.Name as 'OrganizationName',
-            o.OrganizationId,
-            tst2.Name as 'CoreName',
-            pa.Label AS ServiceName,
-            A.Value AS 'ServiceStartDate',
-            B.Value as 'FollowUpDate',
-            C.Value as 'CompleteDate',
-            COALESCE(activity.TotalDurationMins, 0) AS 'TotalDurationMins',
-            COALESCE(activity.LatestActivity, 'No recorded activity yet') AS 'LatestActivity',
-            activity.CreatedAt,
-            COALESCE(ac.TotalRequired, 0) AS 'TotalRequired',
-            COALESCE(ac.FilledCount, 0) AS 'FilledCount'
-            FROM cleantranscrm.TeasSupportType tst
-            LEFT JOIN cleantranscrm.TeasServiceType tst2 on CAST(tst2.TeasServiceTypeId AS UNSIGNED) = CAST(tst.TeasServiceTypeId AS UNSIGNED)
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pal ON pal.ProgramAttributeId = CAST(tst.ProgramAttributeId AS UNSIGNED)
-            LEFT JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramAttributeId = pal.ProgramAttributeId
-            LEFT JOIN cleantranscrm.`Project` p ON p.ProjectId = pal.ProjectId
-            LEFT JOIN cleantranscrm.Organization o on o.OrganizationId = p.OrganizationId 
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = pa.PhaseId AND pp.ProgramId = pa.ProgramId
-            LEFT JOIN cleantranscrm.SelectOption so ON pa.Source = so.SelectControlId
-            AND pa.ControlType = 'select'
-            AND CAST(pal.Value AS UNSIGNED) = so.OptionValue
-            LEFT JOIN (		SELECT 
-                pav.projectid,
-                tst.ProgramAttributeId ,
-                pa.Label ,
-                pav.Value
-            FROM cleantranscrm.ProgramAttribute pa
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-            WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Service Start Date' AND pav.Value IS NOT NULL
-            ) A on A.projectid = pal.ProjectId and A.programattributeid = tst.programattributeid
-            LEFT JOIN (		SELECT 
-                pav.projectid,
-                tst.ProgramAttributeId ,
-                pa.Label ,
-                pav.Value
-            FROM cleantranscrm.ProgramAttribute pa
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-            WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Follow Up' AND pav.Value IS NOT NULL
-            ) B on B.projectid = pal.ProjectId and B.programattributeid = tst.programattributeid
-            LEFT JOIN (		SELECT 
-                pav.projectid,
-                tst.ProgramAttributeId ,
-                pa.Label ,
-                pav.Value
-            FROM cleantranscrm.ProgramAttribute pa
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-            LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-            WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Complete' AND pav.Value IS NOT NULL
-            ) C on C.projectid = pal.ProjectId and C.programattributeid = tst.programattributeid
-            LEFT JOIN (
-            SELECT 
-                projectid,
-                phaseid,
-                MAX(a.ActivityId) as 'MaxId' ,
-                SUM(a.Duration) as 'TotalDurationMins',
-                MAX(a.`Text`) as 'LatestActivity',
-                MAX(a.CreatedAt) as 'CreatedAt'
-            FROM cleantranscrm.Activity a
-            GROUP BY projectid, phaseid
-            ) activity on activity.projectid = pal.ProjectId AND activity.phaseid = tst.PhaseId
-            LEFT JOIN
-        (SELECT p.ProjectNumber,
-                p.ProjectId,
-                pp.Name AS ServiceName,
-                COUNT(DISTINCT pal.ProgramAttributeId) AS TotalRequired,
-                SUM(CASE
-                        WHEN pal.Value IS NOT NULL THEN 1
-                        ELSE 0
-                    END) AS FilledCount
-        FROM cleantranscrm.Project p
-        INNER JOIN
-            (SELECT p.ProjectId,
-                    p.CurrentPhaseId AS CurrentProjectPhase,
-                    a.ProgramAttributeId,
-                    a.ProgramId,
-                    a.PhaseId,
-                    a.SortOrder,
-                    a.ControlName,
-                    a.ControlType,
-                    a.ValueType,
-                    a.ReadOnly,
-                    a.Source,
-                    a.Required,
-                    a.Label,
-                    a.Description,
-                    a.IsGatingItem,
-                    a.IsDocument,
-                    a.AssignedUserUserId,
-                    a.TableId,
-                    v.Value,
-                    v.UpdatedAt,
-                    v.UpdatedBy
-            FROM cleantranscrm.ProgramAttribute AS a
-            INNER JOIN cleantranscrm.Project AS p ON a.ProgramId = p.ProgramId
-            LEFT OUTER JOIN cleantranscrm.ProjectAttributeValue AS v ON v.ProgramAttributeId = a.ProgramAttributeId
-            AND v.ProjectId = p.ProjectId) pal ON pal.ProjectId = p.ProjectId
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pal.PhaseId = pp.PhaseId
-        AND pal.ProgramId = pp.ProgramId
-        WHERE pal.ProgramId = 16
-            AND p.Deleted = 0
-            AND pal.Required = 1
-        GROUP BY p.ProjectNumber,
-                    p.ProjectId,
-                    pp.Name) ac ON ac.projectid = pal.ProjectId
-        AND ac.ServiceName = pa.Label
-            WHERE
-            pal.ProjectId IN (SELECT ProjectId FROM cleantranscrm.`Project` WHERE ProgramId = 16)
-            AND pa.PhaseId = 2 AND pa.ProgramId = 16 AND pal.Value='True'
-            AND C.Value IS NULL
-            AND (B.Value > CURDATE() OR B.Value IS NULL)
-            AND A.Value REGEXP '^[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}.[0-9]{3}Z$'
-            GROUP BY p.ProjectNumber, tst2.Name, pa.Label
-            ORDER BY
-            A.Value ASC;"""
-        
-        df = fetch_data(query)
+        df = PROJECT_SERVICES.view('services_started')
         date_columns = ['ServiceStartDate', 'FollowUpDate', 'CompleteDate', 'CreatedAt']
         df = format_dates(df, date_columns)
-        result = []
-        for _, row in df.iterrows():
-            result.append({
-            'projectNumber': row['ProjectNumber'],
-            'projectId': row['ProjectId'],
-            'phaseId': row['PhaseId'],
-            'projectName': row['ProjectName'],
-            'organizationName': row['OrganizationName'],
-            'organizationId': row['OrganizationId'],
-            'coreName': row['CoreName'],
-            'serviceName': row['ServiceName'],
-            'serviceStartDate': row['ServiceStartDate'],
-            'followUpDate': row['FollowUpDate'],
-            'completeDate': row['CompleteDate'],
-            'totalDurationMins': row['TotalDurationMins'],
-            'latestActivity': row['LatestActivity'],
-            'createdAt': row['CreatedAt'],
-            'totalRequired': row['TotalRequired'],
-            'filledCount': row['FilledCount']
-            })
-        return result
+        return PROJECT_DETAILS_FIELDS.records(df)
 
     @staticmethod
     def resolve_projects_not_started(root, info):
-        query = """SELECT * FROM (
-            SELECT
-                p.ProjectNumber,
-                p.ProjectId, 
-                tst.PhaseId,
-                p.Name as 'ProjectName',
-                o.Name AS 'OrganizationName',
-                o.OrganizationId,
-                tst2.Name AS 'CoreName',
-                pa.Label AS 'ServiceName',
-                A.Value AS 'ServiceStartDate',
-                B.Value as 'FollowUpDate',
-                C.Value as 'CompleteDate',
-                COALESCE(activity.TotalDurationMins, 0) AS 'TotalDurationMins',
-                COALESCE(activity.LatestActivity, 'No recorded activity yet') AS 'LatestActivity',
-                activity.CreatedAt,
-                COALESCE(ac.TotalRequired, 0) AS 'TotalRequired',
-                COALESCE(ac.FilledCount, 0) AS 'FilledCount'
-            FROM cleantranscrm.TeasSupportType tst
-            LEFT JOIN cleantranscrm.TeasServiceType tst2 on CAST(tst2.TeasServiceTypeId AS UNSIGNED) = CAST(tst.TeasServiceTypeId AS UNSIGNED)
-            LEFT JOIN cleantranscrm.ProjectAttributeValue pal ON pal.ProgramAttributeId = CAST(tst.ProgramAttributeId AS UNSIGNED)
-            LEFT JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramAttributeId = pal.ProgramAttributeId
-            LEFT JOIN cleantranscrm.`Project` p ON p.ProjectId = pal.ProjectId
-            LEFT JOIN cleantranscrm.Organization o ON o.OrganizationId = p.OrganizationId 
-            LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = pa.PhaseId AND pp.ProgramId = pa.ProgramId
-            LEFT JOIN cleantranscrm.SelectOption so ON pa.Source = so.SelectControlId
-                AND pa.ControlType = 'select'
-                AND CAST(pal.Value AS UNSIGNED) = so.OptionValue
-            LEFT JOIN (		SELECT 
-                    pav.projectid,
-                    tst.ProgramAttributeId ,
-                    pa.Label ,
-                    pav.Value
-                FROM cleantranscrm.ProgramAttribute pa
-                LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-                LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-                LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-                WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Service Start Date' AND pav.Value IS NOT NULL
-                ) A on A.projectid = pal.ProjectId and A.programattributeid = tst.programattributeid
-            LEFT JOIN (		SELECT 
-                    pav.projectid,
-                    tst.ProgramAttributeId ,
-                    pa.Label ,
-                    pav.Value
-                FROM cleantranscrm.ProgramAttribute pa
-                LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-                LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-                LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-                WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Follow Up' AND pav.Value IS NOT NULL
-                ) B on B.projectid = pal.ProjectId and B.programattributeid = tst.programattributeid
-            LEFT JOIN (		SELECT 
-                    pav.projectid,
-                    tst.ProgramAttributeId ,
-                    pa.Label ,
-                    pav.Value
-                FROM cleantranscrm.ProgramAttribute pa
-                LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId AND pa.PhaseId = pp.PhaseId
-                LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-                LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId 
-                WHERE pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Complete' AND pav.Value IS NOT NULL
-                ) C on C.projectid = pal.ProjectId and C.programattributeid = tst.programattributeid
-            LEFT JOIN (
-                SELECT 
-                    projectid,
-                    phaseid,
-                    MAX(a.ActivityId) as 'MaxId' ,
-                    SUM(a.Duration) as 'TotalDurationMins',
-                    MAX(a.`Text`) as 'LatestActivity',
-                    MAX(a.CreatedAt) as 'CreatedAt'
-                FROM cleantranscrm.Activity a
-                GROUP BY projectid, phaseid
-            ) activity on activity.projectid = pal.ProjectId AND activity.phaseid = tst.PhaseId
-            LEFT JOIN
-        (SELECT p.ProjectNumber,
-                p.ProjectId,
-                pp.Name AS ServiceName,
-                COUNT(DISTINCT pal.ProgramAttributeId) AS TotalRequired,
-                SUM(CASE
-                        WHEN pal.Value IS NOT NULL THEN 1
-                        ELSE 0
-                    END) AS FilledCount
-        FROM cleantranscrm.Project p
-        INNER JOIN
-            (SELECT p.ProjectId,
-                    p.CurrentPhaseId AS CurrentProjectPhase,
-                    a.ProgramAttributeId,
-                    a.ProgramId,
-                    a.PhaseId,
-                    a.SortOrder,
-                    a.ControlName,
-                    a.ControlType,
-                    a.ValueType,
-                    a.ReadOnly,
-                    a.Source,
-                    a.Required,
-                    a.Label,
-                    a.Description,
-                    a.IsGatingItem,
-                    a.IsDocument,
-                    a.AssignedUserUserId,
-                    a.TableId,
-                    v.Value,
-                    v.UpdatedAt,
-                    v.UpdatedBy
-            FROM cleantranscrm.ProgramAttribute AS a
-            INNER JOIN cleantranscrm.Project AS p ON a.ProgramId = p.ProgramId
-            LEFT OUTER JOIN cleantranscrm.ProjectAttributeValue AS v ON v.ProgramAttributeId = a.ProgramAttributeId
-            AND v.ProjectId = p.ProjectId) pal ON pal.ProjectId = p.ProjectId
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pal.PhaseId = pp.PhaseId
-        AND pal.ProgramId = pp.ProgramId
-        WHERE pal.ProgramId = 16
-            AND p.Deleted = 0
-            AND pal.Required = 1
-        GROUP BY p.ProjectNumber,
-                    p.ProjectId,
-                    pp.Name) ac ON ac.projectid = pal.ProjectId
-        AND ac.ServiceName = pa.Label
-            WHERE
-                pal.ProjectId IN (SELECT ProjectId FROM cleantranscrm.`Project` WHERE ProgramId = 16)
-                AND pa.PhaseId = 2 AND pa.ProgramId = 16 AND pal.Value='True'
-            GROUP BY p.ProjectNumber, tst2.Name, pa.Label
-            ORDER BY
-                p.ProjectNumber ASC, pp.SortOrder ASC, pa.SortOrder ASC
-            ) CTE_A
-            WHERE CTE_A.ServiceStartDate IS NULL AND (CTE_A.FollowUpDate IS NULL OR CTE_A.FollowUpDate > CURDATE())
-            ORDER BY 
-            CTE_A.ProjectNumber ASC"""
-        
-        df = fetch_data(query)
+        df = PROJECT_SERVICES.view('not_started')
         date_columns = ['ServiceStartDate', 'FollowUpDate', 'CompleteDate', 'CreatedAt']
         df = format_dates(df, date_columns)
-        result = []
-        for _, row in df.iterrows():
-            result.append({
-            'projectNumber': row['ProjectNumber'],
-            'projectId': row['ProjectId'],
-            'phaseId': row['PhaseId'],
-            'projectName': row['ProjectName'],
-            'organizationName': row['OrganizationName'],
-            'organizationId': row['OrganizationId'],
-            'coreName': row['CoreName'],
-            'serviceName': row['ServiceName'],
-            'serviceStartDate': row['ServiceStartDate'],
-            'followUpDate': row['FollowUpDate'],
-            'completeDate': row['CompleteDate'],
-            'totalDurationMins': row['TotalDurationMins'],
-            'latestActivity': row['LatestActivity'],
-            'createdAt': row['CreatedAt'],
-            'totalRequired': row['TotalRequired'],
-            'filledCount': row['FilledCount']
-            })
-        return result
+        return PROJECT_DETAILS_FIELDS.records(df)
 
     @staticmethod
     def resolve_completed_projects(root, info):
-        query = """SELECT p.ProjectNumber,
-            p.ProjectId,
-            tst.PhaseId,
-            p.Name as 'ProjectName',
-            o.Name AS 'OrganizationName',
-            o.OrganizationId,
-            tst2.Name AS 'CoreName',
-            pa.Label AS 'ServiceName',
-            A.Value AS 'ServiceStartDate',
-            B.Value AS 'FollowUpDate',
-            C.Value AS 'CompleteDate',
-            COALESCE(activity.TotalDurationMins, 0) AS 'TotalDurationMins',
-            COALESCE(activity.LatestActivity, 'No recorded activity yet') AS 'LatestActivity',
-            activity.CreatedAt,
-            COALESCE(ac.TotalRequired, 0) AS 'TotalRequired',
-            COALESCE(ac.FilledCount, 0) AS 'FilledCount'
-        FROM cleantranscrm.TeasSupportType tst
-        LEFT JOIN cleantranscrm.TeasServiceType tst2 ON CAST(tst2.TeasServiceTypeId AS UNSIGNED) = CAST(tst.TeasServiceTypeId AS UNSIGNED)
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pal ON pal.ProgramAttributeId = CAST(tst.ProgramAttributeId AS UNSIGNED)
-        LEFT JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramAttributeId = pal.ProgramAttributeId
-        LEFT JOIN cleantranscrm.`Project` p ON p.ProjectId = pal.ProjectId
-        LEFT JOIN cleantranscrm.Organization o ON o.OrganizationId = p.OrganizationId
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = pa.PhaseId
-        AND pp.ProgramId = pa.ProgramId
-        LEFT JOIN cleantranscrm.SelectOption so ON pa.Source = so.SelectControlId
-        AND pa.ControlType = 'select'
-        AND CAST(pal.Value AS UNSIGNED) = so.OptionValue
-        LEFT JOIN
-        (SELECT pav.projectid,
-                tst.ProgramAttributeId,
-                pa.Label,
-                pav.Value
-        FROM cleantranscrm.ProgramAttribute pa
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId
-        AND pa.PhaseId = pp.PhaseId
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId
-        WHERE pa.ProgramId = 16
-            AND pa.ControlType = 'date'
-            AND pa.label = 'Service Start Date'
-            AND pav.Value IS NOT NULL) A ON A.projectid = pal.ProjectId
-        AND A.programattributeid = tst.programattributeid
-        LEFT JOIN
-        (SELECT pav.projectid,
-                tst.ProgramAttributeId,
-                pa.Label,
-                pav.Value
-        FROM cleantranscrm.ProgramAttribute pa
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId
-        AND pa.PhaseId = pp.PhaseId
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId
-        WHERE pa.ProgramId = 16
-            AND pa.ControlType = 'date'
-            AND pa.label = 'Follow Up'
-            AND pav.Value IS NOT NULL) B ON B.projectid = pal.ProjectId
-        AND B.programattributeid = tst.programattributeid
-        LEFT JOIN
-        (SELECT pav.projectid,
-                tst.ProgramAttributeId,
-                pa.Label,
-                pav.Value
-        FROM cleantranscrm.ProgramAttribute pa
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.ProgramId = pa.ProgramId
-        AND pa.PhaseId = pp.PhaseId
-        LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId
-        LEFT JOIN cleantranscrm.TeasSupportType tst ON tst.PhaseId = pa.PhaseId
-        WHERE pa.ProgramId = 16
-            AND pa.ControlType = 'date'
-            AND pa.label = 'Complete'
-            AND pav.Value IS NOT NULL) C ON C.projectid = pal.ProjectId
-        AND C.programattributeid = tst.programattributeid
-        LEFT JOIN
-        (SELECT projectid,
-                phaseid,
-                MAX(a.ActivityId) AS 'MaxId',
-                SUM(a.Duration) AS 'TotalDurationMins',
-                MAX(a.`Text`) AS 'LatestActivity',
-                MAX(a.CreatedAt) AS 'CreatedAt'
-        FROM cleantranscrm.Activity a
-        GROUP BY projectid,
-                    phaseid) activity ON activity.projectid = pal.ProjectId
-        AND activity.phaseid = tst.PhaseId
-        LEFT JOIN
-        (SELECT p.ProjectNumber,
-                p.ProjectId,
-                pp.Name AS ServiceName,
-                COUNT(DISTINCT pal.ProgramAttributeId) AS TotalRequired,
-                SUM(CASE
-                        WHEN pal.Value IS NOT NULL THEN 1
-                        ELSE 0
-                    END) AS FilledCount
-        FROM cleantranscrm.Project p
-        INNER JOIN
-            (SELECT p.ProjectId,
-                    p.CurrentPhaseId AS CurrentProjectPhase,
-                    a.ProgramAttributeId,
-                    a.ProgramId,
-                    a.PhaseId,
-                    a.SortOrder,
-                    a.ControlName,
-                    a.ControlType,
-                    a.ValueType,
-                    a.ReadOnly,
-                    a.Source,
-                    a.Required,
-                    a.Label,
-                    a.Description,
-                    a.IsGatingItem,
-                    a.IsDocument,
-                    a.AssignedUserUserId,
-                    a.TableId,
-                    v.Value,
-                    v.UpdatedAt,
-                    v.UpdatedBy
-            FROM cleantranscrm.ProgramAttribute AS a
-            INNER JOIN cleantranscrm.Project AS p ON a.ProgramId = p.ProgramId
-            LEFT OUTER JOIN cleantranscrm.ProjectAttributeValue AS v ON v.ProgramAttributeId = a.ProgramAttributeId
-            AND v.ProjectId = p.ProjectId) pal ON pal.ProjectId = p.ProjectId
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pal.PhaseId = pp.PhaseId
-        AND pal.ProgramId = pp.ProgramId
-        WHERE pal.ProgramId = 16
-            AND p.Deleted = 0
-            AND pal.Required = 1
-        GROUP BY p.ProjectNumber,
-                    p.ProjectId,
-                    pp.Name) ac ON ac.projectid = pal.ProjectId
-        AND ac.ServiceName = pa.Label
-        WHERE pal.ProjectId IN
-            (SELECT ProjectId
-            FROM cleantranscrm.`Project`
-            WHERE ProgramId = 16)
-        AND pa.PhaseId = 2
-        AND pa.ProgramId = 16
-        AND pal.Value = 'True'
-        AND C.Value IS NOT NULL
-        GROUP BY p.ProjectNumber,
-                tst2.Name,
-                pa.Label
-        ORDER BY B.value ASC;"""
-        
-        df = fetch_data(query)
+        df = PROJECT_SERVICES.view('completed')
         date_columns = ['ServiceStartDate', 'FollowUpDate', 'CompleteDate', 'CreatedAt']
         df = format_dates(df, date_columns)
-        result = []
-        for _, row in df.iterrows():
-            result.append({
-            'projectNumber': row['ProjectNumber'],
-            'projectId': row['ProjectId'],
-            'phaseId': row['PhaseId'],
-            'projectName': row['ProjectName'],
-            'organizationName': row['OrganizationName'],
-            'organizationId': row['OrganizationId'],
-            'coreName': row['CoreName'],
-            'serviceName': row['ServiceName'],
-            'serviceStartDate': row['ServiceStartDate'],
-            'followUpDate': row['FollowUpDate'],
-            'completeDate': row['CompleteDate'],
-            'totalDurationMins': row['TotalDurationMins'],
-            'latestActivity': row['LatestActivity'],
-            'createdAt': row['CreatedAt'],
-            'totalRequired': row['TotalRequired'],
-            'filledCount': row['FilledCount']
-            })
-        return result
+        return PROJECT_DETAILS_FIELDS.records(df)
     
     @staticmethod
     def resolve_project_timeline(root, info, projectId=None):
@@ -935,64 +292,18 @@ class Resolvers:
             conditions.append("ptv.ProjectId = %(projectId)s")
             params['projectId'] = projectId
 
-        conditions.append("ptv.ProgramAttributeId IN (SELECT ProgramAttributeId FROM cleantranscrm.ProgramAttribute WHERE ControlType = 'date')")
-
-        where_clause = " AND ".join(conditions)
-        where_clause = f"WHERE {where_clause}" if where_clause else ""
-
-        query = f"""SELECT ptv.Id, ptv.ProjectId, ptv.ProgramAttributeId, ptv.UpdatedAt, ptv.UpdatedBy, ptv.Value, 
-            pa.Label, 
-            pa.SortOrder AS 'LabelSortOrder', 
-            pp.Name AS 'PhaseName', 
-            pp.SortOrder AS 'PhaseSortOrder'
-        FROM cleantranscrm.ProjectAttributeValue ptv
-        LEFT JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramAttributeId = ptv.ProgramAttributeId
-        LEFT JOIN cleantranscrm.ProgramPhase pp ON pp.PhaseId = pa.PhaseId AND pp.ProgramId = pa.ProgramId
-        {where_clause};
-        """
-        
-        df = fetch_data(query, params)
-        date_columns = ['UpdatedAt']
-        df = format_dates(df, date_columns)
-        result = []
-        for _, row in df.iterrows():
-            result.append({
-            'id': row['Id'],
-            'projectId': row['ProjectId'],
-            'phaseName': row['PhaseName'],
-            'programAttributeId': row['ProgramAttributeId'],
-            'updatedAt': row['UpdatedAt'],
-            'label': row['Label'],
-            'updatedBy': row['UpdatedBy'],
-            'phaseSortOrder': row['PhaseSortOrder'],
-            'labelSortOrder': row['LabelSortOrder'],
-            })
-        return result
+        return timeline_records(conditions, params)
     
     @staticmethod
     def resolve_program_list(root, info):
         query = f"""SELECT * FROM cleantranscrm.Program p;"""
         
         df = fetch_data(query)
-        result = []
-        for _, row in df.iterrows():
-            result.append({
-            'programId': row['ProgramId'],
-            'programName': row['Name'],
-            'shortName': row['ShortName'],
-            })
-        return result
+        return PROGRAM_FIELDS.records(df)
     
     @staticmethod
     def resolve_project_status(root, info):
         query = f"""SELECT * FROM cleantranscrm.ProjectStatus ps;"""
         
         df = fetch_data(query)
-        result = []
-        for _, row in df.iterrows():
-            result.append({
-            'projectStatusId': row['ProjectStatusId'],
-            'projectStatusName': row['Name'],
-            'projectStatusLongName': row['LongName'],
-            })
-        return result
\ No newline at end of file
+        return PROJECT_STATUS_FIELDS.records(df)
\ No newline at end of file
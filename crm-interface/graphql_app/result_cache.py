@@ -0,0 +1,96 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+RESULT_CACHE_MAX_BYTES = int(os.getenv('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+RESULT_CACHE_DEFAULT_TTL = float(os.getenv('RESULT_CACHE_DEFAULT_TTL', 300))
+
+_TABLE_PATTERN = re.compile(r'cleantranscrm\.`?(\w+)`?')
+
+
+def tables_in(sql):
+    """Return the set of cleantranscrm tables a query reads."""
+    return set(_TABLE_PATTERN.findall(sql))
+
+
+class ResultCache:
+    """In-process LRU of serialized query results, bounded by total payload bytes.
+
+    Entries are keyed by (query name, params) and tagged with the tables they were
+    read from. Writers call invalidate(tables) after committing; that drops every
+    entry reading those tables and bumps a per-table generation so a load that
+    started before the write cannot put its now-stale result back.
+    """
+
+    def __init__(self, max_bytes=RESULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (payload, expires_at, tables)
+        self._bytes = 0
+        self._generations = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0, 'stale_puts': 0}
+
+    def generation(self, tables):
+        """Snapshot of the write generations for tables; pass it back to put()."""
+        with self._lock:
+            return tuple(self._generations.get(table, 0) for table in sorted(tables))
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    self._remove(key)
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[0]
+
+    def put(self, key, payload, ttl, tables, generation):
+        """Store payload (bytes) unless one of its tables was written since generation was taken."""
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation != tuple(self._generations.get(table, 0) for table in sorted(tables)):
+                self._stats['stale_puts'] += 1
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (payload, time.monotonic() + ttl, frozenset(tables))
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, tables):
+        """Drop every entry that reads any of tables."""
+        tables = set(tables)
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [key for key, entry in self._entries.items() if entry[2] & tables]
+            for key in stale:
+                self._remove(key)
+            self._stats['invalidations'] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._bytes, max_bytes=self.max_bytes)
+
+    def _remove(self, key):
+        payload, _, _ = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+
+RESULT_CACHE = ResultCache()
@@ -0,0 +1,261 @@
+import hashlib
+from collections import Counter
+from datetime import date
+
+from .db_logic import fetch_data
+from .derived import DerivedStore, after_watermark, watermark_params, REFRESH_BATCH_SIZE
+
+ROLLUP_DDL = """
+    CREATE TABLE IF NOT EXISTS cleantranscrm.DailyRollup (
+        Metric VARCHAR(32) NOT NULL,
+        Day DATE NOT NULL,
+        ProgramId INT NOT NULL,
+        UserId INT NOT NULL,
+        Value DECIMAL(18, 2) NOT NULL,
+        PRIMARY KEY (Metric, ProgramId, Day, UserId),
+        KEY IX_DailyRollup_User (Metric, UserId, Day)
+    )
+"""
+
+# Last day each ProjectAttributeValue row was counted on, so re-edits move it between days
+ATTRIBUTE_STATE_DDL = """
+    CREATE TABLE IF NOT EXISTS cleantranscrm.DailyRollupAttributeState (
+        Id INT NOT NULL PRIMARY KEY,
+        ProgramId INT NOT NULL,
+        UserId INT NOT NULL,
+        UpdatedDay DATE NOT NULL,
+        CompletedDay DATE NULL
+    )
+"""
+
+
+def _apply(cursor, deltas):
+    """Add {(metric, day, program_id, user_id): delta} onto DailyRollup."""
+    rows = [(metric, day, program_id, user_id, delta)
+            for (metric, day, program_id, user_id), delta in deltas.items() if delta]
+    if rows:
+        cursor.executemany("""
+            INSERT INTO cleantranscrm.DailyRollup (Metric, Day, ProgramId, UserId, Value)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE Value = Value + VALUES(Value)
+        """, rows)
+
+
+def _delete_metrics(conn, metrics):
+    cursor = conn.cursor()
+    placeholders = ', '.join(['%s'] * len(metrics))
+    cursor.execute(f"DELETE FROM cleantranscrm.DailyRollup WHERE Metric IN ({placeholders})", tuple(metrics))
+    cursor.close()
+
+
+def _parse_day(value):
+    """Day of an ISO date string stored in ProjectAttributeValue.Value, like DATE(Value) in MySQL."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+class ProjectRollup(DerivedStore):
+    """'projects': projects created per day and program."""
+
+    name = 'DailyRollupProject'
+    ddl = [ROLLUP_DDL]
+    metrics = ('projects',)
+
+    def reset(self, conn):
+        _delete_metrics(conn, self.metrics)
+
+    def sync(self, conn, last_created_at, last_id):
+        watermark = None
+        cursor = conn.cursor()
+        while True:
+            cursor.execute(f"""
+                SELECT p.ProjectId, p.CreatedAt, p.ProgramId
+                FROM cleantranscrm.Project p
+                WHERE {after_watermark('p.CreatedAt', 'p.ProjectId')}
+                ORDER BY p.CreatedAt, p.ProjectId
+                LIMIT %s
+            """, watermark_params(last_created_at, last_id) + (REFRESH_BATCH_SIZE,))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            deltas = Counter()
+            for project_id, created_at, program_id in rows:
+                if program_id is not None:
+                    deltas[('projects', created_at.date(), program_id, 0)] += 1
+            _apply(cursor, deltas)
+            last_id, last_created_at = rows[-1][0], rows[-1][1]
+            watermark = (last_created_at, last_id)
+            if len(rows) < REFRESH_BATCH_SIZE:
+                break
+        cursor.close()
+        return watermark
+
+
+class ActivityRollup(DerivedStore):
+    """'logged-activities' and 'logged-time': activity count and Duration per day, program and user.
+
+    Later edits to an existing activity's Duration are not tracked.
+    """
+
+    name = 'DailyRollupActivity'
+    ddl = [ROLLUP_DDL]
+    metrics = ('logged-activities', 'logged-time')
+
+    def reset(self, conn):
+        _delete_metrics(conn, self.metrics)
+
+    def sync(self, conn, last_created_at, last_id):
+        watermark = None
+        cursor = conn.cursor()
+        while True:
+            cursor.execute(f"""
+                SELECT a.ActivityId, a.CreatedAt, p.ProgramId, COALESCE(a.UserId, 0), a.Duration
+                FROM cleantranscrm.Activity a
+                JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId
+                WHERE {after_watermark('a.CreatedAt', 'a.ActivityId')}
+                ORDER BY a.CreatedAt, a.ActivityId
+                LIMIT %s
+            """, watermark_params(last_created_at, last_id) + (REFRESH_BATCH_SIZE,))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            deltas = Counter()
+            for activity_id, created_at, program_id, user_id, duration in rows:
+                day = created_at.date()
+                deltas[('logged-activities', day, program_id, user_id)] += 1
+                if duration:
+                    deltas[('logged-time', day, program_id, user_id)] += duration
+            _apply(cursor, deltas)
+            last_id, last_created_at = rows[-1][0], rows[-1][1]
+            watermark = (last_created_at, last_id)
+            if len(rows) < REFRESH_BATCH_SIZE:
+                break
+        cursor.close()
+        return watermark
+
+
+class AttributeRollup(DerivedStore):
+    """'attributes-filled' and 'services-completed' per day, program and editing user.
+
+    Rows are read from an (UpdatedAt, Id) watermark. DailyRollupAttributeState remembers
+    where each value was last counted, so an edited value is moved to its new day
+    instead of being counted twice. A value counts as a completed service when its
+    attribute is a 'Complete' date outside TeasServiceType; changing that set rebuilds
+    the rollup. Deleted values are not tracked.
+    """
+
+    name = 'DailyRollupAttribute'
+    ddl = [ROLLUP_DDL, ATTRIBUTE_STATE_DDL]
+    metrics = ('attributes-filled', 'services-completed')
+
+    def _completion_attributes(self, conn):
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT pa.ProgramAttributeId
+            FROM cleantranscrm.ProgramAttribute pa
+            WHERE pa.ControlType = 'date' AND pa.label = 'Complete'
+            AND pa.ProgramAttributeId NOT IN (SELECT ProgramAttributeId FROM cleantranscrm.TeasServiceType)
+            ORDER BY pa.ProgramAttributeId
+        """)
+        attribute_ids = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        return attribute_ids
+
+    def version(self, conn):
+        ids = ','.join(str(i) for i in self._completion_attributes(conn))
+        return hashlib.sha1(ids.encode('utf-8')).hexdigest()
+
+    def reset(self, conn):
+        _delete_metrics(conn, self.metrics)
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM cleantranscrm.DailyRollupAttributeState")
+        cursor.close()
+
+    def sync(self, conn, last_created_at, last_id):
+        completion_attributes = set(self._completion_attributes(conn))
+        watermark = None
+        cursor = conn.cursor()
+        while True:
+            cursor.execute(f"""
+                SELECT pav.Id, pav.UpdatedAt, p.ProgramId, COALESCE(u.UserId, 0), pav.ProgramAttributeId, pav.Value
+                FROM cleantranscrm.ProjectAttributeValue pav
+                JOIN cleantranscrm.Project p ON p.ProjectId = pav.ProjectId
+                LEFT JOIN (
+                    SELECT ProperName, MIN(UserId) AS UserId FROM cleantranscrm.`User` GROUP BY ProperName
+                ) u ON u.ProperName = pav.UpdatedBy
+                WHERE {after_watermark('pav.UpdatedAt', 'pav.Id')}
+                ORDER BY pav.UpdatedAt, pav.Id
+                LIMIT %s
+            """, watermark_params(last_created_at, last_id) + (REFRESH_BATCH_SIZE,))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+
+            placeholders = ', '.join(['%s'] * len(rows))
+            cursor.execute(f"""
+                SELECT Id, ProgramId, UserId, UpdatedDay, CompletedDay
+                FROM cleantranscrm.DailyRollupAttributeState
+                WHERE Id IN ({placeholders})
+            """, tuple(row[0] for row in rows))
+            previous = {row[0]: row[1:] for row in cursor.fetchall()}
+
+            deltas = Counter()
+            states = {}
+            for value_id, updated_at, program_id, user_id, attribute_id, value in rows:
+                prior = states.get(value_id) or previous.get(value_id)
+                if prior:
+                    prior_program, prior_user, prior_updated, prior_completed = prior
+                    deltas[('attributes-filled', prior_updated, prior_program, prior_user)] -= 1
+                    if prior_completed:
+                        deltas[('services-completed', prior_completed, prior_program, prior_user)] -= 1
+                updated_day = updated_at.date()
+                completed_day = _parse_day(value) if attribute_id in completion_attributes else None
+                deltas[('attributes-filled', updated_day, program_id, user_id)] += 1
+                if completed_day:
+                    deltas[('services-completed', completed_day, program_id, user_id)] += 1
+                states[value_id] = (program_id, user_id, updated_day, completed_day)
+
+            _apply(cursor, deltas)
+            cursor.executemany("""
+                INSERT INTO cleantranscrm.DailyRollupAttributeState (Id, ProgramId, UserId, UpdatedDay, CompletedDay)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE ProgramId = VALUES(ProgramId), UserId = VALUES(UserId),
+                    UpdatedDay = VALUES(UpdatedDay), CompletedDay = VALUES(CompletedDay)
+            """, [(value_id,) + state for value_id, state in states.items()])
+            last_id, last_created_at = rows[-1][0], rows[-1][1]
+            watermark = (last_created_at, last_id)
+            if len(rows) < REFRESH_BATCH_SIZE:
+                break
+        cursor.close()
+        return watermark
+
+
+PROJECT_ROLLUP = ProjectRollup()
+ACTIVITY_ROLLUP = ActivityRollup()
+ATTRIBUTE_ROLLUP = AttributeRollup()
+
+# Metric name (same as the QUERIES series name) -> store maintaining it
+ROLLUP_STORES = {
+    metric: store
+    for store in (PROJECT_ROLLUP, ACTIVITY_ROLLUP, ATTRIBUTE_ROLLUP)
+    for metric in store.metrics
+}
+
+
+def read_rollup(metric, connection, start, end, program_id=16, user_id=None):
+    """Daily totals (Day, Value) for metric over [start, end), or None if the rollup isn't usable."""
+    if not ROLLUP_STORES[metric].refresh_if_stale():
+        return None
+    return fetch_data("""
+        SELECT Day, SUM(Value) AS Value
+        FROM cleantranscrm.DailyRollup
+        WHERE Metric = %(metric)s AND ProgramId = %(program_id)s
+        AND (%(user_id)s IS NULL OR UserId = %(user_id)s)
+        AND Day >= %(start)s AND Day < %(end)s
+        GROUP BY Day
+        ORDER BY Day
+    """, connection, params={'metric': metric, 'program_id': program_id, 'user_id': user_id, 'start': start, 'end': end})
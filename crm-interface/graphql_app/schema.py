@@ -15,6 +15,8 @@ type_defs = """
         openServices: Int
         servicesNotReady: Int
         percentCompleted: Float
+        services: [ProjectDetails]
+        timeline: [ProjectTimeline]
     }
 
     type ProjectDetails {
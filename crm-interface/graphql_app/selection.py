@@ -0,0 +1,31 @@
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
+
+
+def requested_fields(info):
+    """Names of the sub-fields the client selected on the field being resolved.
+
+    Follows fragment spreads and inline fragments; @skip / @include are ignored, so
+    the result can only over-report.
+    """
+    names = set()
+    pending = [node.selection_set for node in info.field_nodes if node.selection_set]
+    while pending:
+        for selection in pending.pop().selections:
+            if isinstance(selection, FieldNode):
+                names.add(selection.name.value)
+            elif isinstance(selection, InlineFragmentNode):
+                pending.append(selection.selection_set)
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = info.fragments.get(selection.name.value)
+                if fragment:
+                    pending.append(fragment.selection_set)
+    return names
+
+
+def report(info, section, value):
+    """Record value under extensions[section][response key] when the request asked for debug output."""
+    context = info.context if isinstance(info.context, dict) else {}
+    extensions = context.get('extensions')
+    if extensions is None:
+        return
+    extensions.setdefault(section, {})[info.path.key] = value
@@ -0,0 +1,76 @@
+import os
+import threading
+from collections import Counter
+
+# How long a caller waits on someone else's in-flight call before giving up
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv('SINGLE_FLIGHT_TIMEOUT', 30))
+
+
+class SingleFlightTimeout(Exception):
+    """Raised to a caller whose shared in-flight call didn't finish within its timeout."""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution.
+
+    The first caller for a key (the leader) runs the function; callers arriving
+    while it is in flight wait for it and receive the same result or exception.
+    Nothing is kept once the call finishes, so this only dedupes overlapping work;
+    caching is left to the callers. Keys are tuples whose first item names the
+    layer ('data', 'aggregate') and counters are kept per layer. Callers that must
+    not see results from before a write put a write generation in the key.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._executions = Counter()
+        self._shared = Counter()
+
+    def do(self, key, fn, timeout=SINGLE_FLIGHT_TIMEOUT):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executions[key[0]] += 1
+            else:
+                self._shared[key[0]] += 1
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        elif not call.done.wait(timeout):
+            raise SingleFlightTimeout(f"Shared {key[0]} call did not finish within {timeout:g}s")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self):
+        """Per layer: executions run and executions saved by sharing an in-flight call."""
+        with self._lock:
+            layers = set(self._executions) | set(self._shared)
+            return {
+                layer: {
+                    'executions': self._executions[layer],
+                    'saved': self._shared[layer],
+                    'in_flight': sum(1 for key in self._calls if key[0] == layer),
+                }
+                for layer in layers
+            }
+
+
+SINGLE_FLIGHT = SingleFlight()
+
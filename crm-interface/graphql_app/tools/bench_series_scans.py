@@ -0,0 +1,237 @@
+"""Benchmark the dashboard series queries before and after the range-bounded rewrite.
+
+Seeds a scratch schema with synthetic Project / Activity / ProjectAttributeValue rows,
+then runs each series query in its old form (recursive DateSeries joined on
+DATE(col) = ds.Date) and its current form (col >= start AND col < end GROUP BY day)
+and reports rows read by the storage engine (Handler_read_* deltas) and wall time.
+No results have been recorded yet; run it against a MySQL server before relying on
+the rewrite being faster.
+
+Usage (uses the HOST / USER / PASSWORD settings from .env):
+    python -m graphql_app.tools.bench_series_scans --projects 2000 --activities 200000
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+import pymysql
+from dotenv import load_dotenv
+
+from graphql_app.metrics import SERIES_METRICS, series_bounds
+from graphql_app.queries import QUERIES
+
+load_dotenv(verbose=True, override=True)
+
+# The series SQL as it was before the rewrite
+OLD_QUERIES = {
+    'projects': """-- Generate a series of dates for the past 30 days
+WITH RECURSIVE DateSeries AS (
+    SELECT CURDATE() AS Date
+    UNION ALL
+    SELECT Date - INTERVAL 1 DAY
+    FROM DateSeries
+    WHERE Date > CURDATE() - INTERVAL 29 DAY
+)
+SELECT 
+    ds.Date AS LogDate,
+    COALESCE(COUNT(DISTINCT p.ProjectId), 0) AS ProjectCount
+FROM DateSeries ds
+LEFT JOIN cleantranscrm.Project p ON DATE(p.CreatedAt) = ds.Date AND p.ProgramId = 16
+WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
+GROUP BY ds.Date
+ORDER BY ds.Date;""",
+    'logged-activities': """WITH RECURSIVE DateSeries AS (
+    SELECT CURDATE() AS Date
+    UNION ALL
+    SELECT Date - INTERVAL 1 DAY
+    FROM DateSeries
+    WHERE Date > CURDATE() - INTERVAL 29 DAY
+)
+SELECT 
+    ds.Date AS LogDate,
+    COUNT(a.ActivityId) AS ActivityCount
+FROM DateSeries ds
+LEFT JOIN cleantranscrm.Activity a ON DATE(a.CreatedAt) = ds.Date AND a.ProjectId in (select projectid from cleantranscrm.Project p where ProgramId = 16) 
+LEFT JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId AND p.ProgramId = 16
+WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
+GROUP BY ds.Date
+ORDER BY ds.Date;""",
+    'logged-time': """WITH RECURSIVE DateSeries AS (
+    SELECT CURDATE() AS Date
+    UNION ALL
+    SELECT Date - INTERVAL 1 DAY
+    FROM DateSeries
+    WHERE Date > CURDATE() - INTERVAL 29 DAY
+)
+SELECT 
+    ds.Date AS LogDate,
+    COALESCE(SUM(a.Duration), 0) AS DurationTotal
+FROM DateSeries ds
+LEFT JOIN cleantranscrm.Activity a ON DATE(a.CreatedAt) = ds.Date AND a.ProjectId in (select projectid from cleantranscrm.Project p where ProgramId = 16) 
+LEFT JOIN cleantranscrm.Project p ON p.ProjectId = a.ProjectId AND p.ProgramId = 16
+WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
+GROUP BY ds.Date
+ORDER BY ds.Date;""",
+    'attributes-filled': """WITH RECURSIVE DateSeries AS (
+    SELECT CURDATE() AS Date
+    UNION ALL
+    SELECT Date - INTERVAL 1 DAY
+    FROM DateSeries
+    WHERE Date > CURDATE() - INTERVAL 29 DAY
+)
+-- Query to count attributes filled in each day
+SELECT 
+    ds.Date AS CompletionDate,
+    COALESCE(COUNT(pav.Id), 0) AS FilledCount
+FROM DateSeries ds
+LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON DATE(pav.UpdatedAt) = ds.Date and pav.ProjectId in (select projectid from cleantranscrm.Project p where ProgramId = 16) 
+WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
+GROUP BY ds.Date
+ORDER BY ds.Date;""",
+    'services-completed': """WITH RECURSIVE DateSeries AS (
+    SELECT CURDATE() AS Date
+    UNION ALL
+    SELECT Date - INTERVAL 1 DAY
+    FROM DateSeries
+    WHERE Date > CURDATE() - INTERVAL 29 DAY
+)
+SELECT 
+    ds.Date AS CompletionDate,
+    COALESCE(COUNT(DISTINCT CONCAT(pav.projectid, '-', pav.ProgramAttributeId)), 0) AS CompletedCount
+FROM DateSeries ds
+LEFT JOIN cleantranscrm.ProgramAttribute pa ON pa.ProgramId = 16 AND pa.ControlType = 'date' AND pa.label = 'Complete'
+LEFT JOIN cleantranscrm.ProjectAttributeValue pav ON pav.ProgramAttributeId = pa.ProgramAttributeId AND DATE(pav.Value) = ds.Date AND pav.ProgramAttributeId not in (select programattributeid from cleantranscrm.TeasServiceType)
+WHERE ds.Date >= CURDATE() - INTERVAL 30 DAY
+GROUP BY ds.Date
+ORDER BY ds.Date;""",
+}
+
+SCHEMA_DDL = [
+    """CREATE TABLE Project (
+        ProjectId INT NOT NULL PRIMARY KEY,
+        ProgramId INT NOT NULL,
+        CreatedAt DATETIME NOT NULL,
+        KEY IX_Project_ProgramId (ProgramId),
+        KEY IX_Project_CreatedAt (CreatedAt)
+    )""",
+    """CREATE TABLE Activity (
+        ActivityId INT NOT NULL PRIMARY KEY,
+        ProjectId INT NOT NULL,
+        CreatedAt DATETIME NOT NULL,
+        Duration DECIMAL(10, 2) NULL,
+        KEY IX_Activity_ProjectId (ProjectId),
+        KEY IX_Activity_CreatedAt (CreatedAt)
+    )""",
+    """CREATE TABLE ProgramAttribute (
+        ProgramAttributeId INT NOT NULL PRIMARY KEY,
+        ProgramId INT NOT NULL,
+        ControlType VARCHAR(32) NOT NULL,
+        Label VARCHAR(255) NOT NULL
+    )""",
+    """CREATE TABLE ProjectAttributeValue (
+        Id INT NOT NULL PRIMARY KEY,
+        ProjectId INT NOT NULL,
+        ProgramAttributeId INT NOT NULL,
+        Value VARCHAR(255) NULL,
+        UpdatedAt DATETIME NOT NULL,
+        KEY IX_PAV_ProjectId (ProjectId),
+        KEY IX_PAV_UpdatedAt (UpdatedAt),
+        KEY IX_PAV_Attribute_Value (ProgramAttributeId, Value)
+    )""",
+    """CREATE TABLE TeasServiceType (
+        TeasServiceTypeId INT NOT NULL PRIMARY KEY,
+        ProgramAttributeId INT NOT NULL
+    )""",
+]
+
+
+def random_time(rng, days):
+    return datetime.now() - timedelta(seconds=rng.randint(0, days * 86400))
+
+
+def seed(conn, schema, projects, activities, values, days, rng):
+    cursor = conn.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{schema}`")
+    cursor.execute(f"CREATE DATABASE `{schema}`")
+    cursor.execute(f"USE `{schema}`")
+    for statement in SCHEMA_DDL:
+        cursor.execute(statement)
+
+    attributes = [(i, 16, 'date', 'Complete' if i % 3 == 0 else 'Follow Up') for i in range(1, 31)]
+    cursor.executemany("INSERT INTO ProgramAttribute VALUES (%s, %s, %s, %s)", attributes)
+    cursor.executemany("INSERT INTO TeasServiceType VALUES (%s, %s)", [(1, 30)])
+    cursor.executemany(
+        "INSERT INTO Project VALUES (%s, %s, %s)",
+        [(i, 16 if rng.random() < 0.7 else 1, random_time(rng, days)) for i in range(1, projects + 1)]
+    )
+    batch = 10000
+    for start in range(1, activities + 1, batch):
+        cursor.executemany("INSERT INTO Activity VALUES (%s, %s, %s, %s)", [
+            (i, rng.randint(1, projects), random_time(rng, days), rng.choice([None, 0.25, 0.5, 1, 2]))
+            for i in range(start, min(start + batch, activities + 1))
+        ])
+    for start in range(1, values + 1, batch):
+        cursor.executemany("INSERT INTO ProjectAttributeValue VALUES (%s, %s, %s, %s, %s)", [
+            (i, rng.randint(1, projects), rng.randint(1, 30),
+             random_time(rng, days).strftime('%Y-%m-%dT%H:%M:%S.000Z'), random_time(rng, days))
+            for i in range(start, min(start + batch, values + 1))
+        ])
+    conn.commit()
+    cursor.execute("ANALYZE TABLE Project, Activity, ProgramAttribute, ProjectAttributeValue, TeasServiceType")
+    cursor.fetchall()
+    cursor.close()
+
+
+def measure(conn, sql, params=None):
+    """Return (rows read by the handler, result rows, seconds) for one execution."""
+    cursor = conn.cursor()
+    cursor.execute("FLUSH STATUS")
+    started = time.perf_counter()
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
+    elapsed = time.perf_counter() - started
+    cursor.execute("SHOW SESSION STATUS LIKE 'Handler_read%%'")
+    handler_reads = sum(int(value) for _, value in cursor.fetchall())
+    cursor.close()
+    return handler_reads, len(rows), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--schema', default=os.getenv('BENCH_SCHEMA', 'cleantranscrm_bench'))
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--activities', type=int, default=200000)
+    parser.add_argument('--values', type=int, default=200000)
+    parser.add_argument('--days', type=int, default=3 * 365, help='spread of seeded timestamps')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--keep', action='store_true', help='keep the scratch schema afterwards')
+    args = parser.parse_args()
+
+    conn = pymysql.connect(host=os.getenv('HOST'), user=os.getenv('USER'), password=os.getenv('PASSWORD'))
+    try:
+        print(f"Seeding {args.schema}: {args.projects} projects, {args.activities} activities, {args.values} attribute values")
+        seed(conn, args.schema, args.projects, args.activities, args.values, args.days, random.Random(args.seed))
+
+        start, end = series_bounds()
+        params = {'start': start, 'end': end}
+        print(f"{'query':<20} {'rows read before':>17} {'rows read after':>16} {'ms before':>10} {'ms after':>9}")
+        for name in SERIES_METRICS:
+            before_sql = OLD_QUERIES[name].replace('cleantranscrm.', f'{args.schema}.')
+            after_sql = QUERIES[name].replace('cleantranscrm.', f'{args.schema}.')
+            before = [measure(conn, before_sql) for _ in range(args.repeat)]
+            after = [measure(conn, after_sql, params) for _ in range(args.repeat)]
+            print(f"{name:<20} {before[-1][0]:>17} {after[-1][0]:>16} "
+                  f"{min(b[2] for b in before) * 1000:>10.1f} {min(a[2] for a in after) * 1000:>9.1f}")
+    finally:
+        if not args.keep:
+            cursor = conn.cursor()
+            cursor.execute(f"DROP DATABASE IF EXISTS `{args.schema}`")
+            cursor.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
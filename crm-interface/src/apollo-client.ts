@@ -1,8 +1,20 @@
-import { ApolloClient, InMemoryCache } from '@apollo/client';
+import { ApolloClient, HttpLink, InMemoryCache } from '@apollo/client';
+import { createPersistedQueryLink } from '@apollo/client/link/persisted-queries';
 
+// Send the SHA-256 of each query instead of the text once the server has seen it
+async function sha256(query: string): Promise<string> {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(query));
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, '0'))
+    .join('');
+}
+
+const httpLink = new HttpLink({ uri: 'http://127.0.0.1:5000/graphql' });
+
+// crypto.subtle only exists in secure contexts (HTTPS or localhost); elsewhere send full queries
 const client = new ApolloClient({
-  uri: 'http://127.0.0.1:5000/graphql',
+  link: globalThis.crypto?.subtle ? createPersistedQueryLink({ sha256 }).concat(httpLink) : httpLink,
   cache: new InMemoryCache(),
 });
 
-export default client;
\ No newline at end of file
+export default client;
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from graphql_app.phase_stats import PhaseDurations
+
+
+def durations(rows):
+    return pd.DataFrame(rows, columns=['PhaseId', 'PhaseName', 'SortOrder', 'ProjectId', 'DaysInPhase'])
+
+
+def test_phase_shared_across_programs_is_one_sorted_slice():
+    # PhaseId 2 sits at SortOrder 1 in one program and SortOrder 2 in another
+    rows = durations([
+        (2, 'Vetting', 1, 10, 50),
+        (2, 'Vetting', 1, 11, 60),
+        (2, 'Vetting', 2, 12, 1),
+        (2, 'Vetting', 2, 13, 2),
+        (3, 'Consult', 0, 10, 7),
+    ])
+    summary = PhaseDurations(rows).summary(percentiles=())
+
+    assert [phase['PhaseId'] for phase in summary] == [3, 2]
+    phase = summary[1]
+    assert phase['SortOrder'] == 1
+    assert phase['TransitionCount'] == 4
+    assert phase['ProjectCount'] == 4
+    assert (phase['MinDaysInPhase'], phase['MaxDaysInPhase'], phase['MedDaysInPhase']) == (1, 60, 2)
+    assert phase['AvgDaysInPhase'] == 28.25
+    assert summary[0]['AvgDaysInPhase'] == 7.0
+
+
+def test_median_is_lower_middle_row():
+    rows = durations([(1, 'Intake', 1, p, days) for p, days in enumerate([4, 1, 3, 2])])
+    phase, = PhaseDurations(rows).summary(percentiles=(50,))
+
+    assert phase['MedDaysInPhase'] == 2
+    assert phase['P50DaysInPhase'] == 2.5
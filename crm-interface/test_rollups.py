@@ -0,0 +1,152 @@
+import contextlib
+import threading
+import time
+from datetime import datetime
+
+import pymysql
+import pytest
+
+from graphql_app import derived
+from graphql_app.derived import ER_LOCK_NOWAIT
+from graphql_app.rollups import ProjectRollup
+
+
+class FakeDatabase:
+    """The DerivedWatermark / DailyRollup / Project statements ProjectRollup.refresh issues.
+
+    FOR UPDATE takes a lock on the watermark row that is held until commit or
+    rollback, like InnoDB; writes are applied when the transaction commits.
+    """
+
+    def __init__(self, projects):
+        self.projects = projects  # (ProjectId, CreatedAt, ProgramId)
+        self.watermarks = {}
+        self.rollup = {}
+        self.row_lock = threading.Lock()
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    def execute(self, statement, params=()):
+        db = self.conn.db
+        sql = ' '.join(statement.split())
+        self.rows = []
+        if sql.startswith('CREATE TABLE'):
+            return
+        if 'FROM cleantranscrm.DerivedWatermark' in sql:
+            if 'FOR UPDATE' in sql and not self.conn.holds_lock:
+                if not db.row_lock.acquire(blocking='NOWAIT' not in sql):
+                    raise pymysql.err.OperationalError(ER_LOCK_NOWAIT, 'locked')
+                self.conn.holds_lock = True
+            watermark = self.conn.pending_watermark or db.watermarks.get(params[0])
+            self.rows = [watermark] if watermark else []
+        elif sql.startswith('INSERT IGNORE INTO cleantranscrm.DerivedWatermark'):
+            self.conn.pending_watermark = self.conn.pending_watermark or (None, None, None)
+        elif sql.startswith('INSERT INTO cleantranscrm.DerivedWatermark'):
+            self.conn.pending_watermark = (params[1], params[2], params[3])
+        elif 'FROM cleantranscrm.Project p' in sql:
+            after = params[0] if isinstance(params[0], datetime) else datetime.fromisoformat(params[0])
+            last_id, limit = params[2], params[3]
+            rows = sorted(p for p in db.projects if (p[1], p[0]) > (after, last_id))
+            self.rows = [(project_id, created_at, program_id) for project_id, created_at, program_id in rows][:limit]
+            time.sleep(0.05)  # Leave room for a second refresh to start from the same watermark
+        else:
+            raise AssertionError(f"Unexpected statement: {sql}")
+
+    def executemany(self, statement, rows):
+        assert 'INTO cleantranscrm.DailyRollup' in statement
+        self.conn.pending_rollup.extend(rows)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+        self.holds_lock = False
+        self.pending_watermark = None
+        self.pending_rollup = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        if self.pending_watermark:
+            self.db.watermarks[self.name] = self.pending_watermark
+        for metric, day, program_id, user_id, delta in self.pending_rollup:
+            key = (metric, day, program_id, user_id)
+            self.db.rollup[key] = self.db.rollup.get(key, 0) + delta
+        self.rollback()
+
+    def rollback(self):
+        self.pending_watermark = None
+        self.pending_rollup = []
+        if self.holds_lock:
+            self.holds_lock = False
+            self.db.row_lock.release()
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeDatabase([
+        (1, datetime(2024, 5, 1, 9), 16),
+        (2, datetime(2024, 5, 1, 10), 16),
+        (3, datetime(2024, 5, 2, 9), 16),
+        (4, datetime(2024, 5, 2, 9), 7),
+    ])
+
+    @contextlib.contextmanager
+    def connection():
+        conn = FakeConnection(db, ProjectRollup.name)
+        try:
+            yield conn
+        finally:
+            conn.rollback()  # The pool ends any open transaction on release
+
+    monkeypatch.setattr(derived, 'connection', connection)
+    return db
+
+
+def totals(db):
+    return {(day.isoformat(), program_id): value for (_, day, program_id, _), value in db.rollup.items()}
+
+
+EXPECTED = {('2024-05-01', 16): 2, ('2024-05-02', 16): 1, ('2024-05-02', 7): 1}
+
+
+def test_refresh_twice_over_same_rows_keeps_totals(db):
+    rollup = ProjectRollup()
+    assert rollup.refresh()
+    assert rollup.refresh()
+    assert totals(db) == EXPECTED
+
+
+def test_refreshes_in_two_processes_count_rows_once(db):
+    # Separate store instances stand in for two worker processes: no shared in-process lock
+    stores = [ProjectRollup(), ProjectRollup()]
+    threads = [threading.Thread(target=store.refresh) for store in stores]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert totals(db) == EXPECTED
+
+
+def test_non_blocking_refresh_skips_while_another_process_holds_the_watermark(db):
+    db.row_lock.acquire()
+    try:
+        assert not ProjectRollup().refresh(blocking=False)
+    finally:
+        db.row_lock.release()
+    assert totals(db) == {}